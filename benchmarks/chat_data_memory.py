@@ -0,0 +1,146 @@
+"""Memory and serialized size of chat_data per active conversation.
+
+Usage:
+    python benchmarks/chat_data_memory.py --chats 10000 --participants 8 --listing 50
+
+Each chat is in the middle of editing a custom-split expense opened from /view,
+the heaviest ManageBills state. The same content is built twice: as the dict
+layout chat_data used before ChatData (parallel bool/float lists, a duplicated
+selected_participants list and the /view listing rows), and as ChatData, which
+keeps only the /view page number since rows are paged from the repo. Memory is measured
+with tracemalloc over the whole population; serialized size compares pickle of
+the dict with ChatData.to_bytes.
+"""
+
+import argparse
+import pickle
+import random
+import sys
+import tracemalloc
+from array import array
+from collections.abc import Callable
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.bot.chat_data import ChatData  # noqa: E402
+from src.lib.splizy_repo.model import ExpenseListingRow  # noqa: E402
+
+SEED = 1234
+
+
+def _listing(rng: random.Random, usernames: list[str], rows: int):
+    return [
+        ExpenseListingRow(
+            id=f"{index:08x}-0000-4000-8000-{rng.getrandbits(48):012x}",
+            title=f"Expense {index}",
+            amount=round(rng.uniform(5, 500), 2),
+            paid_by=rng.choice(usernames),
+            currency="SGD",
+            created_at=f"2025-01-01T00:00:{index % 60:02d}+00:00",
+        )
+        for index in range(rows)
+    ]
+
+
+def build_legacy(rng: random.Random, participants: int, rows: int) -> dict[str, Any]:
+    usernames = [f"user{index:03d}" for index in range(participants)]
+    selections = [rng.random() < 0.8 for _ in usernames]
+    amounts = [round(rng.uniform(5, 50), 2) for _ in usernames]
+    return {
+        "expenses": _listing(rng, usernames, rows),
+        "viewall_page": 0,
+        "viewall_is_collapsed": False,
+        "all_participants": usernames,
+        "participant_selections": selections,
+        "selected_participants": [
+            user for user, selected in zip(usernames, selections) if selected
+        ],
+        "is_equal_split": False,
+        "split_type": "custom",
+        "custom_amounts": amounts,
+        "has_mult": True,
+        "mult_val": 1.19,
+        "expense_id": f"{rng.getrandbits(32):08x}-0000-4000-8000-000000000000",
+        "expense_name": "Hotpot dinner",
+        "amount": Decimal(str(round(sum(amounts) * 1.19, 2))),
+        "paid_by": usernames[0],
+        "currency": "SGD",
+        "receipt": None,
+        "receipt_allocation": None,
+        "receipt_detail_message_ids": [],
+    }
+
+
+def build_chat_data(rng: random.Random, participants: int, rows: int) -> ChatData:
+    legacy = build_legacy(rng, participants, rows)
+    chat_data = ChatData()
+    state = chat_data.manage_bills
+    for key in (
+        "all_participants",
+        "split_type",
+        "has_mult",
+        "expense_id",
+        "expense_name",
+        "amount",
+        "paid_by",
+        "currency",
+    ):
+        setattr(state, key, legacy[key])
+    state.participant_selections = sum(
+        1 << index
+        for index, selected in enumerate(legacy["participant_selections"])
+        if selected
+    )
+    state.custom_amounts = array("d", legacy["custom_amounts"])
+    state.mult_val = Decimal("1.19")
+    return chat_data
+
+
+def measure(build: Callable[[random.Random], Any], chats: int) -> tuple[int, list]:
+    rng = random.Random(SEED)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    population = [build(rng) for _ in range(chats)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, population
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chats", type=int, default=10_000)
+    parser.add_argument("--participants", type=int, default=8)
+    parser.add_argument(
+        "--listing", type=int, default=50, help="/view rows held per chat (dict)"
+    )
+    args = parser.parse_args()
+
+    legacy_bytes, legacy = measure(
+        lambda rng: build_legacy(rng, args.participants, args.listing), args.chats
+    )
+    slotted_bytes, slotted = measure(
+        lambda rng: build_chat_data(rng, args.participants, args.listing), args.chats
+    )
+    legacy_blob = sum(len(pickle.dumps(data)) for data in legacy) / args.chats
+    slotted_blob = sum(len(data.to_bytes()) for data in slotted) / args.chats
+
+    # Round trip check, so the benchmark fails loudly if the codec drifts
+    restored = ChatData.from_bytes(slotted[0].to_bytes())
+    assert restored.manage_bills == slotted[0].manage_bills
+
+    print(
+        f"{args.chats} chats, {args.participants} participants, "
+        f"{args.listing} listing rows"
+    )
+    print(f"{'layout':<12}{'bytes/chat':>14}{'serialized/chat':>18}")
+    print(f"{'dict':<12}{legacy_bytes / args.chats:>14.0f}{legacy_blob:>18.0f}")
+    print(f"{'ChatData':<12}{slotted_bytes / args.chats:>14.0f}{slotted_blob:>18.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""Measure bot startup import time with `python -X importtime`.
+
+Usage:
+    python benchmarks/import_time.py --budget-ms 800 [--module main] [--top 15]
+
+Exits with status 1 when the cumulative import time of the target module
+exceeds the budget, so it can be run in CI or before a deploy.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+
+def measure_imports(module: str) -> list[tuple[str, int, int]]:
+    """Return (module, self_us, cumulative_us) for every import in a fresh process."""
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing '{module}' failed:\n{result.stderr}")
+
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        timings.append((name.strip(), int(self_us), int(cumulative_us)))
+    return timings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--budget-ms", type=float, default=1000.0)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    timings = measure_imports(args.module)
+    total_us = next(
+        (cumulative for name, _, cumulative in timings if name == args.module), 0
+    )
+
+    print(f"Slowest imports under '{args.module}' (cumulative):")
+    for name, self_us, cumulative_us in sorted(
+        timings, key=lambda timing: timing[2], reverse=True
+    )[: args.top]:
+        print(
+            f"  {cumulative_us / 1000:8.1f} ms  (self {self_us / 1000:6.1f} ms)  {name}"
+        )
+
+    total_ms = total_us / 1000
+    print(f"\nTotal: {total_ms:.1f} ms (budget {args.budget_ms:.1f} ms)")
+    if total_ms > args.budget_ms:
+        print("Import time budget exceeded.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,429 @@
+"""Replay synthetic Telegram updates against the bot, fully offline.
+
+Usage:
+    python benchmarks/load_test.py --chats 50 --rounds 10 [--telegram-latency-ms 40]
+
+The application comes from `initialise_telebot()` with a bot whose requests are
+answered by a fake Bot API, an in-memory SQLite repo and the mock receipt parser.
+Each group chat runs its own user session (/add, /view paging, /settleup,
+/settleup_report, /add_receipt) and waits for every update to be handled before
+sending the next.
+Reports throughput, p50/p95/p99 per command step and event-loop lag.
+
+Updates are processed one at a time like production (concurrent_updates(False)),
+so step latencies include time queued behind other chats; pass --concurrent to
+drop that constraint.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from collections import defaultdict
+from itertools import count
+from pathlib import Path
+from typing import Any
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+BOT_USER = {
+    "id": 1,
+    "is_bot": True,
+    "first_name": "Splizy",
+    "username": "splizy_bot",
+    "can_join_groups": True,
+    "can_read_all_group_messages": False,
+    "supports_inline_queries": False,
+}
+MEMBERS = ("alice", "bob", "carol", "dave")
+HEARTBEAT_INTERVAL = 0.01
+
+
+def _configure_environment() -> None:
+    # Must run before config is imported; explicit env vars still win.
+    os.environ.setdefault("TELEBOT_TOKEN", "123456:load-test")
+    os.environ.setdefault("REPO_BACKEND", "sqlite")
+    os.environ.setdefault("SQLITE_DB_PATH", ":memory:")
+    os.environ.setdefault("USE_MOCK_RECEIPT_PARSER", "true")
+    os.environ.setdefault("EXCHANGE_RATES_AUTO_REFRESH", "false")
+    os.environ.setdefault("REPO_SLOW_QUERY_MS", "1000")
+    sys.path.insert(0, str(ROOT_DIR))
+
+
+def _build_fake_request(latency: float):
+    from telegram.request import BaseRequest
+
+    class FakeBotApiRequest(BaseRequest):
+        """Answers Bot API calls with canned JSON after a simulated round trip."""
+
+        def __init__(self) -> None:
+            self.calls: dict[str, int] = defaultdict(int)
+            self._message_ids = count(1_000_000)
+
+        @property
+        def read_timeout(self) -> float | None:
+            return None
+
+        async def initialize(self) -> None:
+            return
+
+        async def shutdown(self) -> None:
+            return
+
+        def _message(self, params: dict[str, Any]) -> dict[str, Any]:
+            chat_id = int(params.get("chat_id") or 0)
+            return {
+                "message_id": params.get("message_id") or next(self._message_ids),
+                "date": int(time.time()),
+                "chat": {"id": chat_id, "type": "group", "title": "Load test"},
+                "from": BOT_USER,
+                "text": params.get("text") or "",
+            }
+
+        def _result(self, method: str, params: dict[str, Any]) -> Any:
+            if method == "getMe":
+                return BOT_USER
+            if method == "getFile":
+                return {
+                    "file_id": params.get("file_id"),
+                    "file_unique_id": "receipt",
+                    "file_size": 4,
+                    "file_path": "photos/receipt.jpg",
+                }
+            if method == "getChatAdministrators":
+                return [
+                    {
+                        "status": "creator",
+                        "is_anonymous": False,
+                        "user": {
+                            "id": 10 + index,
+                            "is_bot": False,
+                            "first_name": username,
+                            "username": username,
+                        },
+                    }
+                    for index, username in enumerate(MEMBERS)
+                ]
+            if method == "sendMediaGroup":
+                return [self._message(params) for _ in params.get("media") or []]
+            if method.startswith(("send", "edit")):
+                return self._message(params)
+            return True
+
+        async def do_request(
+            self, url: str, method: str, request_data=None, *args, **kwargs
+        ) -> tuple[int, bytes]:
+            # Yields to the event loop even without latency, as a real request
+            # would, so the lag monitor keeps sampling
+            await asyncio.sleep(latency)
+            if "/file/bot" in url:
+                return 200, b"\xff\xd8\xff\xd9"
+
+            api_method = url.rsplit("/", 1)[-1]
+            self.calls[api_method] += 1
+            params = request_data.parameters if request_data else {}
+            payload = {"ok": True, "result": self._result(api_method, params)}
+            return 200, json.dumps(payload).encode("utf-8")
+
+    return FakeBotApiRequest()
+
+
+class UpdateFactory:
+    def __init__(self, bot) -> None:
+        self._bot = bot
+        self._update_ids = count(1)
+        self._message_ids = count(1)
+
+    @staticmethod
+    def _chat(chat_id: int) -> dict[str, Any]:
+        return {"id": chat_id, "type": "group", "title": f"Load test {chat_id}"}
+
+    @staticmethod
+    def _user(username: str) -> dict[str, Any]:
+        return {
+            "id": 10 + MEMBERS.index(username),
+            "is_bot": False,
+            "first_name": username,
+            "username": username,
+        }
+
+    def _build(self, payload: dict[str, Any]):
+        from telegram import Update
+
+        return Update.de_json(
+            {"update_id": next(self._update_ids), **payload}, self._bot
+        )
+
+    def message(self, chat_id: int, text: str, username: str = MEMBERS[0]):
+        message: dict[str, Any] = {
+            "message_id": next(self._message_ids),
+            "date": int(time.time()),
+            "chat": self._chat(chat_id),
+            "from": self._user(username),
+            "text": text,
+        }
+        if text.startswith("/"):
+            command = text.split()[0]
+            message["entities"] = [
+                {"type": "bot_command", "offset": 0, "length": len(command)}
+            ]
+        return self._build({"message": message})
+
+    def photo(self, chat_id: int, username: str = MEMBERS[0]):
+        return self._build(
+            {
+                "message": {
+                    "message_id": next(self._message_ids),
+                    "date": int(time.time()),
+                    "chat": self._chat(chat_id),
+                    "from": self._user(username),
+                    "photo": [
+                        {
+                            "file_id": "receipt-photo",
+                            "file_unique_id": "receipt",
+                            "width": 1280,
+                            "height": 960,
+                            "file_size": 4,
+                        }
+                    ],
+                }
+            }
+        )
+
+    def callback(self, chat_id: int, data: str, username: str = MEMBERS[0]):
+        return self._build(
+            {
+                "callback_query": {
+                    "id": str(next(self._update_ids)),
+                    "from": self._user(username),
+                    "chat_instance": str(chat_id),
+                    "data": data,
+                    "message": {
+                        "message_id": next(self._message_ids),
+                        "date": int(time.time()),
+                        "chat": self._chat(chat_id),
+                        "from": BOT_USER,
+                        "text": "",
+                    },
+                }
+            }
+        )
+
+
+def _is_due(round_index: int, rounds: int, chat_index: int, period: int) -> bool:
+    # Every `period` rounds, at an offset per chat, so even runs with fewer
+    # rounds than the period reach the step in some chat
+    return round_index % period == chat_index % min(period, rounds)
+
+
+def _session_steps(
+    factory: UpdateFactory, chat_id: int, chat_index: int, round_index: int, rounds: int
+):
+    """
+    (label, update) pairs for one round of a chat's workload. Updates that depend
+    on earlier steps (eg. the id of a saved expense) are given as callables.
+    /add and /view run every round; /settleup, /settleup_report and /add_receipt
+    every few rounds, at least once per chat.
+    """
+    from src.bot.convo_handlers.ManageBills.callbacks import (
+        GO_BACK,
+        VIEW_PAGE_NEXT,
+        VIEW_PAGE_PREV,
+        VIEW_SELECT,
+        VIEW_TOGGLE_SHOW,
+    )
+    from src.lib.splizy_repo.repo import repo
+
+    def select_first_expense():
+        expense = repo.list_expenses(chat_id, fields="listing")[0]
+        return factory.callback(chat_id, VIEW_SELECT(expense.id))
+
+    add = [
+        ("/add", factory.message(chat_id, "/add")),
+        ("add:name", factory.message(chat_id, f"Dinner {round_index}")),
+        ("add:amount", factory.message(chat_id, f"{20 + round_index % 50}.40")),
+        ("add:paid_by", factory.callback(chat_id, MEMBERS[round_index % len(MEMBERS)])),
+        ("add:split_type", factory.callback(chat_id, "split_equal_some")),
+        ("add:toggle", factory.callback(chat_id, "1")),
+        ("add:participants", factory.callback(chat_id, "participants_done")),
+        ("add:submit", factory.callback(chat_id, "submit_form")),
+    ]
+    view = [
+        ("/view", factory.message(chat_id, "/view")),
+        ("view:show", factory.callback(chat_id, VIEW_TOGGLE_SHOW())),
+        ("/view filter", factory.message(chat_id, f"/view @{MEMBERS[1]} >10")),
+        ("view:show", factory.callback(chat_id, VIEW_TOGGLE_SHOW())),
+        ("view:next_page", factory.callback(chat_id, VIEW_PAGE_NEXT())),
+        ("view:prev_page", factory.callback(chat_id, VIEW_PAGE_PREV())),
+        ("view:select", select_first_expense),
+        ("view:go_back", factory.callback(chat_id, GO_BACK())),
+    ]
+    settleup = [("/settleup", factory.message(chat_id, "/settleup"))]
+    report = [("/settleup_report", factory.message(chat_id, "/settleup_report"))]
+    receipt = [
+        ("/add_receipt", factory.message(chat_id, "/add_receipt")),
+        ("receipt:upload", factory.photo(chat_id)),
+        ("/cancel", factory.message(chat_id, "/cancel")),
+    ]
+    steps = [*add, *view]
+    if _is_due(round_index, rounds, chat_index, 5):
+        steps += settleup
+    if _is_due(round_index, rounds, chat_index + 3, 10):
+        steps += report
+    if _is_due(round_index, rounds, chat_index + 7, 10):
+        steps += receipt
+    return steps
+
+
+def _seed_groups(chat_ids: list[int]) -> None:
+    from src.lib.splizy_repo.repo import repo
+
+    for chat_id in chat_ids:
+        repo.ensure_group_exists({"id": chat_id, "expense_currency": "SGD"})
+        repo.insert_group_users(
+            [{"group_id": chat_id, "username": username} for username in MEMBERS]
+        )
+
+
+async def _monitor_loop_lag(histogram, stop: asyncio.Event) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + HEARTBEAT_INTERVAL
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+        histogram.record(max(0.0, loop.time() - expected))
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    from telegram.ext import ExtBot
+
+    from src.bot.telebot import initialise_telebot
+    from src.lib.metrics import LogLinearHistogram
+
+    request = _build_fake_request(args.telegram_latency_ms / 1000)
+    bot = ExtBot(token=os.environ["TELEBOT_TOKEN"], request=request)
+    app = initialise_telebot(bot=bot)
+
+    errors: list[BaseException] = []
+
+    async def on_error(update, context) -> None:
+        errors.append(context.error)
+
+    app.add_error_handler(on_error)
+
+    chat_ids = [-(1_000_000 + index) for index in range(args.chats)]
+    _seed_groups(chat_ids)
+    factory = UpdateFactory(bot)
+
+    latencies: dict[str, LogLinearHistogram] = defaultdict(LogLinearHistogram)
+    loop_lag = LogLinearHistogram()
+    # Production runs with concurrent_updates(False): one update at a time
+    process_lock = asyncio.Lock() if not args.concurrent else None
+
+    async def run_chat(chat_index: int, chat_id: int) -> int:
+        handled = 0
+        for round_index in range(args.rounds):
+            steps = _session_steps(
+                factory, chat_id, chat_index, round_index, args.rounds
+            )
+            for label, update in steps:
+                if callable(update):
+                    update = update()
+                start = time.perf_counter()
+                if process_lock is None:
+                    await app.process_update(update)
+                else:
+                    async with process_lock:
+                        await app.process_update(update)
+                latencies[label].record(time.perf_counter() - start)
+                handled += 1
+        return handled
+
+    stop = asyncio.Event()
+    async with app:
+        monitor = asyncio.create_task(_monitor_loop_lag(loop_lag, stop))
+        start = time.perf_counter()
+        handled = sum(
+            await asyncio.gather(*(run_chat(i, c) for i, c in enumerate(chat_ids)))
+        )
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await monitor
+
+    def summary(histogram: LogLinearHistogram) -> dict[str, float]:
+        return {
+            "count": histogram.count,
+            "p50_ms": histogram.percentile(50) * 1000,
+            "p95_ms": histogram.percentile(95) * 1000,
+            "p99_ms": histogram.percentile(99) * 1000,
+        }
+
+    return {
+        "chats": args.chats,
+        "rounds": args.rounds,
+        "concurrent": args.concurrent,
+        "telegram_latency_ms": args.telegram_latency_ms,
+        "updates": handled,
+        "errors": len(errors),
+        "first_error": repr(errors[0]) if errors else None,
+        "elapsed_s": elapsed,
+        "throughput_per_s": handled / elapsed if elapsed else 0.0,
+        "steps": {label: summary(h) for label, h in sorted(latencies.items())},
+        "loop_lag": {**summary(loop_lag), "max_ms": loop_lag.percentile(100) * 1000},
+        "bot_api_calls": dict(sorted(request.calls.items())),
+    }
+
+
+def _print_report(report: dict[str, Any]) -> None:
+    print(
+        f"{report['updates']} updates across {report['chats']} chats in "
+        f"{report['elapsed_s']:.2f}s -> {report['throughput_per_s']:.1f} updates/s "
+        f"({report['errors']} handler errors)"
+    )
+    if report["first_error"]:
+        print(f"First error: {report['first_error']}")
+    print(f"\n{'step':<20}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for label, stats in report["steps"].items():
+        print(
+            f"{label:<20}{stats['count']:>8}{stats['p50_ms']:>10.2f}"
+            f"{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}"
+        )
+    lag = report["loop_lag"]
+    print(
+        f"\nEvent-loop lag over {lag['count']} samples: p50 {lag['p50_ms']:.2f} ms, "
+        f"p99 {lag['p99_ms']:.2f} ms, max {lag['max_ms']:.2f} ms"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chats", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument(
+        "--telegram-latency-ms",
+        type=float,
+        default=0.0,
+        help="Simulated Bot API round trip per request",
+    )
+    parser.add_argument(
+        "--concurrent",
+        action="store_true",
+        help="Process updates concurrently instead of one at a time",
+    )
+    parser.add_argument("--json", type=Path, help="Also write the report as JSON")
+    args = parser.parse_args()
+
+    _configure_environment()
+    # Per-update INFO logs (receipt dumps, traces) would dominate the timings
+    logging.disable(logging.INFO)
+    report = asyncio.run(run(args))
+    _print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,278 @@
+"""Micro-benchmarks for the settle-up engine, reports and bill summaries.
+
+Usage:
+    python benchmarks/settleup_bench.py --users 2,20,200 --expenses 10,1000,100000 \\
+        --currencies SGD,USD,JPY --receipt-density 0.2 --output results.json
+    python benchmarks/settleup_bench.py --baseline results.json --threshold 0.15
+
+Synthetic trip histories are generated from a fixed seed, so runs on the same
+machine are comparable. Every benchmark reports the median and min of --repeat
+runs. With --baseline, medians are compared against a saved results file and the
+script exits non-zero when any benchmark is slower by more than --threshold.
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from src.bot.convo_handlers.ManageBills.context import ManageBillsChatData  # noqa: E402
+from src.bot.convo_handlers.ManageBills.utils.renderers.bill_summary import (  # noqa: E402
+    get_bill_summary_with_receipt,
+)
+from src.bot.convo_handlers.Settleup.utils.general import (  # noqa: E402
+    get_settleup_details,
+)
+from src.bot.convo_handlers.Settleup.utils.renderers import (  # noqa: E402
+    _build_stats_table_image,
+)
+from src.bot.convo_handlers.Settleup.utils.reports import (  # noqa: E402
+    build_settleup_csv,
+    build_settleup_pdf,
+)
+from src.lib.splizy_repo.model import ExpenseSettleupRow, PayeeShare  # noqa: E402
+
+SEED = 1234
+SETTLEUP_CURRENCY = "SGD"
+REPORT_GENERATED_AT = datetime(2025, 1, 1, tzinfo=timezone.utc)
+ITEM_NAMES = ("Milk Tea", "Char Siew Bao", "Hor Fun", "Egg Tart", "Dumplings")
+
+
+def generate_expenses(
+    users: int, expenses: int, currencies: list[str], seed: int = SEED
+) -> list[ExpenseSettleupRow]:
+    """A trip history where each expense is split among a random subset of users."""
+    rng = random.Random(seed)
+    usernames = [f"user{index:03d}" for index in range(users)]
+    rows = []
+    for index in range(expenses):
+        amount = round(rng.uniform(5, 500), 2)
+        payees = rng.sample(usernames, rng.randint(1, min(users, 8)))
+        share = round(amount / len(payees), 2)
+        rows.append(
+            ExpenseSettleupRow(
+                id=f"expense-{index}",
+                title=f"Expense {index}",
+                amount=amount,
+                paid_by=rng.choice(usernames),
+                currency=rng.choice(currencies),
+                payees=tuple(PayeeShare(user, share) for user in payees),
+                created_at=f"2025-01-01T00:00:{index % 60:02d}+00:00",
+            )
+        )
+    return rows
+
+
+def generate_receipt_bills(
+    users: int, count: int, density: float, seed: int = SEED
+) -> list[ManageBillsChatData]:
+    """
+    Chat data for receipt-backed bills. `density` is the share of item quantity
+    assigned to individuals; the rest is shared among 2+ users.
+    """
+    rng = random.Random(seed)
+    usernames = [f"user{index:03d}" for index in range(users)]
+    bills = []
+    for index in range(count):
+        items = []
+        for item_index in range(rng.randint(5, 40)):
+            quantity = rng.randint(1, 4)
+            indiv_qty = sum(rng.random() < density for _ in range(quantity))
+            indiv = [
+                {"username": rng.choice(usernames), "quantity": 1}
+                for _ in range(indiv_qty)
+            ]
+            shared = rng.sample(usernames, min(users, rng.randint(2, 4)))
+            items.append(
+                {
+                    "name": f"{rng.choice(ITEM_NAMES)} {item_index}",
+                    "quantity": quantity,
+                    "subtotal": round(rng.uniform(2, 30) * quantity, 2),
+                    "indiv": indiv,
+                    "shared": shared,
+                }
+            )
+        subtotal = round(sum(item["subtotal"] for item in items), 2)
+        total = round(subtotal * 1.199, 2)
+        bills.append(
+            ManageBillsChatData(
+                expense_name=f"Receipt {index}",
+                paid_by=rng.choice(usernames),
+                amount=Decimal(str(total)),
+                currency=SETTLEUP_CURRENCY,
+                all_participants=usernames,
+                receipt={"items": items, "subtotal": subtotal, "total": total},
+            )
+        )
+    return bills
+
+
+def time_runs(func: Callable[[], Any], repeat: int) -> dict[str, Any]:
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return {
+        "median_s": statistics.median(durations),
+        "min_s": min(durations),
+        "runs": repeat,
+    }
+
+
+def run_suite(args: argparse.Namespace) -> list[dict[str, Any]]:
+    results = []
+
+    def record(name: str, params: dict[str, Any], func: Callable[[], Any]) -> None:
+        timing = time_runs(func, args.repeat)
+        results.append({"benchmark": name, "params": params, **timing})
+        print(
+            f"{name:<32}{json.dumps(params):<64}"
+            f"median {timing['median_s'] * 1000:10.2f} ms"
+        )
+
+    for users in args.users:
+        for expense_count in args.expenses:
+            params = {
+                "users": users,
+                "expenses": expense_count,
+                "currencies": len(args.currencies),
+            }
+            expenses = generate_expenses(users, expense_count, args.currencies)
+            stats, _ = get_settleup_details(expenses, SETTLEUP_CURRENCY)
+
+            record(
+                "get_settleup_details",
+                params,
+                lambda: get_settleup_details(expenses, SETTLEUP_CURRENCY),
+            )
+            # Reports hold one cell per user per expense
+            if users * expense_count <= args.max_report_cells:
+                record(
+                    "build_settleup_csv",
+                    params,
+                    lambda: build_settleup_csv(
+                        expenses, SETTLEUP_CURRENCY, REPORT_GENERATED_AT
+                    ),
+                )
+                record(
+                    "build_settleup_pdf",
+                    params,
+                    lambda: build_settleup_pdf(
+                        expenses, SETTLEUP_CURRENCY, REPORT_GENERATED_AT
+                    ),
+                )
+            if users <= args.max_render_rows:
+                record(
+                    "_build_stats_table_image",
+                    params,
+                    lambda: _build_stats_table_image(stats),
+                )
+
+            receipt_count = min(
+                round(expense_count * args.receipt_density), args.max_receipts
+            )
+            if receipt_count:
+                bills = generate_receipt_bills(
+                    users, receipt_count, args.receipt_density
+                )
+                record(
+                    "get_bill_summary_with_receipt",
+                    {**params, "receipts": receipt_count},
+                    lambda: [get_bill_summary_with_receipt(bill) for bill in bills],
+                )
+    return results
+
+
+def _result_key(result: dict[str, Any]) -> str:
+    return f"{result['benchmark']} {json.dumps(result['params'], sort_keys=True)}"
+
+
+def compare(
+    results: list[dict[str, Any]], baseline: dict[str, Any], threshold: float
+) -> bool:
+    """Print current vs baseline medians; return True if anything regressed."""
+    baseline_medians = {
+        _result_key(result): result["median_s"] for result in baseline["results"]
+    }
+    regressed = False
+    print(f"\n{'benchmark':<80}{'baseline':>12}{'current':>12}{'change':>10}")
+    for result in results:
+        key = _result_key(result)
+        if key not in baseline_medians:
+            continue
+        before = baseline_medians[key]
+        after = result["median_s"]
+        change = (after - before) / before if before else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressed = True
+        print(
+            f"{key:<80}{before * 1000:>10.2f}ms{after * 1000:>10.2f}ms"
+            f"{change:>+10.1%}{flag}"
+        )
+    return regressed
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(part) for part in value.split(",") if part]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=_int_list, default=[4, 20, 200])
+    parser.add_argument("--expenses", type=_int_list, default=[100, 1000, 10000])
+    parser.add_argument(
+        "--currencies",
+        type=lambda value: value.split(","),
+        default=["SGD", "USD", "JPY"],
+    )
+    parser.add_argument(
+        "--receipt-density",
+        type=float,
+        default=0.2,
+        help="Share of expenses with receipts, and of receipt items split individually",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-report-cells", type=int, default=2_000_000)
+    parser.add_argument("--max-render-rows", type=int, default=1000)
+    parser.add_argument("--max-receipts", type=int, default=500)
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="Compare with saved results")
+    parser.add_argument("--threshold", type=float, default=0.15)
+    args = parser.parse_args()
+
+    results = run_suite(args)
+    if args.output:
+        payload = {
+            "meta": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "seed": SEED,
+            },
+            "results": results,
+        }
+        args.output.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
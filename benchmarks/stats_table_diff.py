@@ -0,0 +1,228 @@
+"""Pixel diff of the /settleup stats table against the matplotlib renderer.
+
+Usage:
+    python benchmarks/stats_table_diff.py --users 2,4,9,30 --diff-dir /tmp/diffs
+    python benchmarks/stats_table_diff.py --tolerance 64 --max-changed 0.04
+
+Each table is rendered by render_stats_table and by the matplotlib table it
+replaced, kept below as the reference. The script prints both render times, the
+mean absolute channel difference and the share of pixels where any channel
+differs by more than --tolerance, and exits non-zero when an image differs in
+size or its share of changed pixels goes over --max-changed.
+
+Some difference is expected. Glyph edges are hinted and antialiased a little
+differently, and there is no kerning. matplotlib also leaves diagonal seams in
+the fill of header and edge cells, where the new renderer fills them solid;
+these differ from the background by at most 54 per channel, under the default
+--tolerance, but do count towards the mean difference.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from collections.abc import Callable, Sequence
+from io import BytesIO
+from pathlib import Path
+
+from PIL import Image, ImageChops
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from settleup_bench import SETTLEUP_CURRENCY, generate_expenses  # noqa: E402
+
+from src.bot.convo_handlers.Settleup.utils.general import (  # noqa: E402
+    get_settleup_details,
+)
+from src.bot.convo_handlers.Settleup.utils.plotting import get_pyplot  # noqa: E402
+from src.bot.convo_handlers.Settleup.utils.renderers import (  # noqa: E402
+    _build_stats_table_rows,
+)
+from src.bot.convo_handlers.Settleup.utils.stats_table import (  # noqa: E402
+    TABLE_BODY_FONT_SIZE,
+    TABLE_FONT_FAMILY,
+    TABLE_HEADER_FONT_SIZE,
+    TABLE_HEADERS,
+    render_stats_table,
+)
+
+EXPENSES_PER_USER = 25
+CURRENCIES = ["SGD", "USD", "JPY"]
+
+
+def render_reference(rows: Sequence[Sequence[str]]) -> bytes:
+    """The stats table as drawn with a matplotlib figure before."""
+    plt = get_pyplot()
+    fig_h = max(4.2, 1.7 + 0.62 * (len(rows) + 1))
+    fig, ax = plt.subplots(figsize=(10.5, fig_h), facecolor="#05070C")
+    ax.axis("off")
+
+    table = ax.table(
+        cellText=rows,
+        colLabels=TABLE_HEADERS,
+        loc="center",
+        cellLoc="left",
+        colLoc="center",
+        colWidths=[0.25, 0.25, 0.25, 0.25],
+        bbox=[0.04, 0.04, 0.92, 0.92],
+    )
+    table.auto_set_font_size(False)
+    table.set_fontsize(TABLE_BODY_FONT_SIZE)
+
+    cell_keys = list(table.get_celld().keys())
+    max_row = max(r for r, _ in cell_keys)
+    max_col = max(c for _, c in cell_keys)
+
+    for (row, col), cell in table.get_celld().items():
+        edges = "BRTL"
+        if row == 0:
+            edges = edges.replace("T", "")
+        if row == max_row:
+            edges = edges.replace("B", "")
+        if col == 0:
+            edges = edges.replace("L", "")
+        if col == max_col:
+            edges = edges.replace("R", "")
+        cell.visible_edges = edges if edges else "open"
+
+        cell.set_edgecolor("#00FFFF")
+        cell.set_linewidth(1.45)
+        if row == 0:
+            cell.set_facecolor("#1B2742")
+            cell.set_height(0.215)
+            cell.set_alpha(1.0)
+            if col < 3:
+                cell.set_antialiased(False)
+            cell.get_text().set_color("#F2FCFF")
+            cell.get_text().set_fontsize(TABLE_HEADER_FONT_SIZE)
+            cell.get_text().set_fontweight("bold")
+            cell.get_text().set_fontfamily(TABLE_FONT_FAMILY)
+            cell.get_text().set_ha("center")
+            cell.get_text().set_va("center")
+            cell.get_text().set_linespacing(1.25)
+        else:
+            cell.set_facecolor("#090D17" if row % 2 else "#0C1120")
+            cell.set_height(0.12)
+            cell.set_alpha(1.0)
+            text = cell.get_text().get_text()
+            cell.get_text().set_fontfamily(TABLE_FONT_FAMILY)
+            cell.get_text().set_fontsize(TABLE_BODY_FONT_SIZE)
+            if row == max_row:
+                cell.set_facecolor("#131A2C")
+                cell.get_text().set_fontweight("bold")
+            if col in (1, 2) and text == "-":
+                cell.get_text().set_color("#FFFFFF")
+            elif col in (1, 2) and text.startswith("-"):
+                cell.get_text().set_color("#FF768E")
+            elif col in (1, 2) and text.startswith("+"):
+                cell.get_text().set_color("#57FFA3")
+            elif col == 3:
+                cell.get_text().set_color("#00FFFF")
+                cell.get_text().set_fontweight("bold")
+            else:
+                cell.get_text().set_color("#EAF3FF")
+
+    image = BytesIO()
+    fig.savefig(
+        image, format="png", dpi=180, bbox_inches="tight", facecolor=fig.get_facecolor()
+    )
+    plt.close(fig)
+    return image.getvalue()
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(item) for item in value.split(",") if item]
+
+
+def _time_ms(render: Callable[[], bytes], repeat: int) -> tuple[float, bytes]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        png = render()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000, png
+
+
+def compare(
+    reference: Image.Image, current: Image.Image, tolerance: int
+) -> tuple[float, float, Image.Image]:
+    """Mean absolute channel difference, share of changed pixels, diff image."""
+    diff = ImageChops.difference(reference, current)
+    histogram = diff.histogram()
+    channels = len(diff.getbands())
+    pixels = diff.width * diff.height
+    mean = (
+        sum(value * (index % 256) for index, value in enumerate(histogram))
+        / pixels
+        / channels
+    )
+    # A pixel changed when its largest channel difference is over the tolerance
+    red, green, blue = diff.split()
+    changed_mask = ImageChops.lighter(ImageChops.lighter(red, green), blue)
+    changed = sum(changed_mask.histogram()[tolerance + 1 :]) / pixels
+    return mean, changed, diff
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=_int_list, default=[2, 4, 9, 30])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tolerance", type=int, default=64)
+    parser.add_argument("--max-changed", type=float, default=0.04)
+    parser.add_argument(
+        "--diff-dir", type=Path, help="Write reference, current and diff images"
+    )
+    args = parser.parse_args()
+
+    if args.diff_dir:
+        args.diff_dir.mkdir(parents=True, exist_ok=True)
+
+    failed = False
+    print(
+        f"{'users':>6}{'size':>12}{'matplotlib':>14}{'template':>12}"
+        f"{'mean diff':>12}{'changed':>10}"
+    )
+    for users in args.users:
+        expenses = generate_expenses(users, users * EXPENSES_PER_USER, CURRENCIES)
+        stats, _ = get_settleup_details(expenses, SETTLEUP_CURRENCY)
+        rows = _build_stats_table_rows(stats)
+
+        reference_ms, reference_png = _time_ms(
+            lambda: render_reference(rows), args.repeat
+        )
+        current_ms, current_png = _time_ms(
+            lambda: render_stats_table(rows), args.repeat
+        )
+        reference = Image.open(BytesIO(reference_png)).convert("RGB")
+        current = Image.open(BytesIO(current_png)).convert("RGB")
+
+        size = f"{current.width}x{current.height}"
+        if reference.size != current.size:
+            print(
+                f"{users:>6}{size:>12}  size differs from the reference "
+                f"{reference.width}x{reference.height}"
+            )
+            failed = True
+            continue
+
+        mean, changed, diff = compare(reference, current, args.tolerance)
+        flag = ""
+        if changed > args.max_changed:
+            flag = "  OVER"
+            failed = True
+        print(
+            f"{users:>6}{size:>12}{reference_ms:>11.1f} ms{current_ms:>9.1f} ms"
+            f"{mean:>12.2f}{changed:>10.2%}{flag}"
+        )
+        if args.diff_dir:
+            reference.save(args.diff_dir / f"reference_{users}.png")
+            current.save(args.diff_dir / f"current_{users}.png")
+            diff.point(lambda value: min(255, value * 4)).save(
+                args.diff_dir / f"diff_{users}.png"
+            )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
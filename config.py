@@ -8,8 +8,62 @@ WEBHOOK_URL = os.environ.get("WEBHOOK_URL")
 TELEBOT_TOKEN = os.environ.get("TELEBOT_TOKEN")
 SECRET_TOKEN = os.environ.get("SECRET_TOKEN")
 PORT = int(os.environ.get("PORT", "8000"))
+# Webhook mode only: >1 shards chats across this many worker processes
+WORKER_PROCESSES = int(os.environ.get("WORKER_PROCESSES", "1"))
+# Webhook mode: received updates are stored here before the ACK, deduplicated on
+# update_id for UPDATE_STORE_RETENTION_HOURS, and replayed after a crash
+UPDATE_STORE_PATH = os.environ.get("UPDATE_STORE_PATH", "updates.db")
+UPDATE_STORE_RETENTION_HOURS = float(
+    os.environ.get("UPDATE_STORE_RETENTION_HOURS", "24")
+)
+# Webhook mode: an update whose handling was cut short (the worker died) this many
+# times is dropped instead of replayed again
+UPDATE_MAX_ATTEMPTS = int(os.environ.get("UPDATE_MAX_ATTEMPTS", "3"))
+# Logging: level for all loggers, per-module overrides ("httpx=WARNING,src.lib=DEBUG"),
+# and output format ("text" or "json", one object per line)
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+LOG_LEVELS = os.environ.get("LOG_LEVELS", "")
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "text").lower()
+# Outbound Bot API rate limiting (Telegram flood limits), retrying 429s after retry_after
+TELEGRAM_RATE_LIMITER = (
+    os.environ.get("TELEGRAM_RATE_LIMITER", "true").lower() == "true"
+)
+TELEGRAM_MAX_RETRIES = int(os.environ.get("TELEGRAM_MAX_RETRIES", "3"))
+# Prometheus /metrics endpoint, served next to the bot; 0 disables it
+METRICS_PORT = int(os.environ.get("METRICS_PORT", "0"))
+# Event-loop watchdog: logs the stack of any callback blocking the loop too long
+LOOP_WATCHDOG_ENABLED = (
+    os.environ.get("LOOP_WATCHDOG_ENABLED", "false").lower() == "true"
+)
+LOOP_WATCHDOG_THRESHOLD_MS = float(os.environ.get("LOOP_WATCHDOG_THRESHOLD_MS", "200"))
+LOOP_WATCHDOG_INTERVAL_MS = float(os.environ.get("LOOP_WATCHDOG_INTERVAL_MS", "50"))
+# Idle conversations end after CONVERSATION_IDLE_TTL_SEC (0 disables), swept in bulk
+# every SESSION_SWEEP_INTERVAL_SEC along with the chat_data of chats left with none
+CONVERSATION_IDLE_TTL_SEC = float(os.environ.get("CONVERSATION_IDLE_TTL_SEC", "1800"))
+SESSION_SWEEP_INTERVAL_SEC = float(os.environ.get("SESSION_SWEEP_INTERVAL_SEC", "60"))
+SESSION_EXPIRED_NOTICE = (
+    os.environ.get("SESSION_EXPIRED_NOTICE", "false").lower() == "true"
+)
+# Telegram usernames allowed to run admin commands such as /profile
+ADMIN_USERNAMES = {
+    username.strip().lstrip("@")
+    for username in os.environ.get("ADMIN_USERNAMES", "").split(",")
+    if username.strip()
+}
+# Sampling profiler: collapsed-stack files per profiled update
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "profiles")
+PROFILE_INTERVAL_MS = float(os.environ.get("PROFILE_INTERVAL_MS", "5"))
+# Profile from startup, same syntax as /profile, eg. "command=settleup_report updates=5"
+PROFILE_ON_START = os.environ.get("PROFILE_ON_START", "")
 SUPABASE_URL = os.environ.get("SUPABASE_URL")
 SUPABASE_KEY = os.environ.get("SUPABASE_KEY")
+# Persistence backend: "supabase" (hosted) or "sqlite" (embedded, single host)
+REPO_BACKEND = os.environ.get("REPO_BACKEND", "supabase").lower()
+SQLITE_DB_PATH = os.environ.get("SQLITE_DB_PATH", "splizy.db")
+# Query tracing: log every repo round trip, or only those slower than the threshold
+REPO_TRACE_QUERIES = os.environ.get("REPO_TRACE_QUERIES", "false").lower() == "true"
+REPO_SLOW_QUERY_MS = float(os.environ.get("REPO_SLOW_QUERY_MS", "300"))
+REPO_N_PLUS_ONE_THRESHOLD = int(os.environ.get("REPO_N_PLUS_ONE_THRESHOLD", "3"))
 MINIAPP_URL = os.environ.get("MINIAPP_URL", "http://localhost:3000").rstrip("/")
 USE_MOCK_RECEIPT_PARSER = (
     os.environ.get("USE_MOCK_RECEIPT_PARSER", "false").lower() == "true"
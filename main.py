@@ -1,25 +1,43 @@
-from config import PORT, SECRET_TOKEN, WEBHOOK_URL
+from config import (
+    METRICS_PORT,
+    PORT,
+    SECRET_TOKEN,
+    TELEBOT_TOKEN,
+    UPDATE_STORE_PATH,
+    UPDATE_STORE_RETENTION_HOURS,
+    WEBHOOK_URL,
+    WORKER_PROCESSES,
+)
+from src.bot.sharding import run_sharded_webhook
 from src.bot.telebot import initialise_telebot
 from src.lib.logger import get_logger
+from src.lib.metrics import start_metrics_server
 
 logger = get_logger(__name__)
 
 
 def main() -> None:
-    telebot = initialise_telebot()
-    # Set the webhook
     if WEBHOOK_URL:
-        logger.info(f"Running as a webhook on port {PORT}")
-        telebot.run_webhook(
-            listen="0.0.0.0",
-            port=PORT,
-            webhook_url=WEBHOOK_URL,
+        # Updates are stored and ACKed by the front, then handled by worker
+        # processes; each worker serves its own metrics (src/bot/sharding)
+        logger.info("Running as a webhook on port %d", PORT)
+        run_sharded_webhook(
+            TELEBOT_TOKEN,
+            WEBHOOK_URL,
+            PORT,
+            WORKER_PROCESSES,
+            UPDATE_STORE_PATH,
             secret_token=SECRET_TOKEN,
+            retention_sec=UPDATE_STORE_RETENTION_HOURS * 3600,
         )
-    else:
-        # Fallback to polling
-        logger.info(f"Polling on port {PORT}")
-        telebot.run_polling()
+        return
+
+    telebot = initialise_telebot()
+    if METRICS_PORT:
+        start_metrics_server(METRICS_PORT)
+    # Fallback to polling
+    logger.info("Polling on port %d", PORT)
+    telebot.run_polling()
 
 
 if __name__ == "__main__":
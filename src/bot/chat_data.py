@@ -0,0 +1,128 @@
+"""
+Per-chat conversation state, used as the application's chat_data type (see
+ContextTypes in telebot.py). Each conversation keeps its own slotted state object,
+created on first access, and the whole thing serializes to a compact msgpack
+blob for persistence.
+"""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import fields
+from decimal import Decimal
+from typing import Any
+
+import msgpack
+
+from src.bot.convo_handlers.ManageBills.context import ManageBillsChatData
+from src.bot.convo_handlers.RegisterUsers import RegisterUsersChatData
+from src.bot.convo_handlers.SetCurrency.context import SetCurrencyChatData
+
+# Bump whenever a state class gains, loses or reorders fields: states are packed
+# positionally, and blobs from another version are dropped rather than misread.
+CHAT_DATA_VERSION = 4
+
+_EXT_DECIMAL = 1
+# 2 held /view listing rows, up to version 1
+_EXT_BIG_INT = 3
+_EXT_FLOAT_ARRAY = 4
+
+_INT64_BITS = 63
+
+
+class ChatData:
+    __slots__ = ("_manage_bills", "_set_currency", "_register_users")
+
+    def __init__(self) -> None:
+        self._manage_bills: ManageBillsChatData | None = None
+        self._set_currency: SetCurrencyChatData | None = None
+        self._register_users: RegisterUsersChatData | None = None
+
+    @property
+    def manage_bills(self) -> ManageBillsChatData:
+        if self._manage_bills is None:
+            self._manage_bills = ManageBillsChatData()
+        return self._manage_bills
+
+    @property
+    def set_currency(self) -> SetCurrencyChatData:
+        if self._set_currency is None:
+            self._set_currency = SetCurrencyChatData()
+        return self._set_currency
+
+    @property
+    def register_users(self) -> RegisterUsersChatData:
+        if self._register_users is None:
+            self._register_users = RegisterUsersChatData()
+        return self._register_users
+
+    def clear(self) -> None:
+        self._manage_bills = None
+        self._set_currency = None
+        self._register_users = None
+
+    def to_bytes(self) -> bytes:
+        return msgpack.packb(
+            [
+                CHAT_DATA_VERSION,
+                _pack_state(self._manage_bills),
+                _pack_state(self._set_currency),
+                _pack_state(self._register_users),
+            ],
+            default=_pack_value,
+        )
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> ChatData:
+        """Restore state; a blob from another CHAT_DATA_VERSION gives empty state."""
+        chat_data = cls()
+        version, *states = msgpack.unpackb(raw, ext_hook=_unpack_ext)
+        if version != CHAT_DATA_VERSION:
+            return chat_data
+        manage_bills, set_currency, register_users = states
+        chat_data._manage_bills = _unpack_state(ManageBillsChatData, manage_bills)
+        chat_data._set_currency = _unpack_state(SetCurrencyChatData, set_currency)
+        chat_data._register_users = _unpack_state(RegisterUsersChatData, register_users)
+        return chat_data
+
+
+def _pack_state(state: Any) -> list[Any] | None:
+    if state is None:
+        return None
+    # Field values in declaration order, without names
+    values = []
+    for item in fields(state):
+        value = getattr(state, item.name)
+        # Bitsets over more than 63 participants don't fit a msgpack int
+        if (
+            isinstance(value, int)
+            and not isinstance(value, bool)
+            and value.bit_length() > _INT64_BITS
+        ):
+            value = msgpack.ExtType(
+                _EXT_BIG_INT, value.to_bytes((value.bit_length() + 7) // 8, "big")
+            )
+        values.append(value)
+    return values
+
+
+def _unpack_state(state_class: type, values: list[Any] | None) -> Any:
+    return None if values is None else state_class(*values)
+
+
+def _pack_value(value: Any) -> msgpack.ExtType:
+    if isinstance(value, Decimal):
+        return msgpack.ExtType(_EXT_DECIMAL, str(value).encode("ascii"))
+    if isinstance(value, array) and value.typecode == "d":
+        return msgpack.ExtType(_EXT_FLOAT_ARRAY, value.tobytes())
+    raise TypeError(f"Cannot serialize {type(value).__name__} in chat_data")
+
+
+def _unpack_ext(code: int, data: bytes) -> Any:
+    if code == _EXT_DECIMAL:
+        return Decimal(data.decode("ascii"))
+    if code == _EXT_BIG_INT:
+        return int.from_bytes(data, "big")
+    if code == _EXT_FLOAT_ARRAY:
+        return array("d", data)
+    return msgpack.ExtType(code, data)
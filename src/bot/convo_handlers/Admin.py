@@ -0,0 +1,51 @@
+from telegram import Update
+from telegram.ext import CommandHandler, ContextTypes, ConversationHandler
+
+import config
+from src.bot.convo_handlers.Base import BaseConversation
+from src.bot.convo_utils.profiling import (
+    PROFILE_USAGE,
+    clear_profiles,
+    parse_profile_args,
+    pending_profiles,
+    schedule_profile,
+)
+from src.bot.convo_utils.wrappers import admin_only
+
+
+class Admin(BaseConversation):
+    def setup_handlers(self):
+        self.entry_points = [CommandHandler("profile", profile_command)]
+        self.states = {}
+
+
+@admin_only
+async def profile_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    args = context.args or []
+    if args == ["off"]:
+        cleared = clear_profiles()
+        await update.message.reply_text(f"Cleared {cleared} pending profile(s).")
+        return ConversationHandler.END
+    if args == ["status"]:
+        pending = pending_profiles()
+        lines = [request.describe() for request in pending] or ["None"]
+        await update.message.reply_text(
+            "Pending profiles:\n" + "\n".join(f"- {line}" for line in lines)
+        )
+        return ConversationHandler.END
+
+    # Defaults to the current group; in a private chat, profile any chat
+    chat = update.effective_chat
+    current_chat_id = chat.id if chat.type in ["group", "supergroup"] else None
+    try:
+        request = parse_profile_args(args, current_chat_id)
+    except ValueError as e:
+        await update.message.reply_text(f"{e}\n\n{PROFILE_USAGE}")
+        return ConversationHandler.END
+
+    schedule_profile(request)
+    await update.message.reply_text(
+        f"Profiling the next {request.describe()}.\n"
+        f"Collapsed stacks are written to {config.PROFILE_DIR}/ on the bot host."
+    )
+    return ConversationHandler.END
@@ -11,19 +11,30 @@ from src.bot.convo_utils.base_commands import (
     help_command,
     start_command,
 )
+from src.bot.convo_utils.instrumentation import instrument_handler
 
-base_command_handlers = [
-    CommandHandler("start", start_command),
-    CommandHandler("help", help_command),
-    CommandHandler("cancel", cancel_command),
-]
+
+def get_base_command_handlers() -> list[CommandHandler]:
+    # Fresh instances per conversation, so handler metrics are labelled by the
+    # conversation that handled the command
+    return [
+        CommandHandler("start", start_command),
+        CommandHandler("help", help_command),
+        CommandHandler("cancel", cancel_command),
+    ]
 
 
 class BaseConversation(ABC):
+    # Class holding the state constants, used to label handler metrics
+    state_class: type | None = None
+    # Seconds idle before the session sweeper ends the conversation; None uses
+    # CONVERSATION_IDLE_TTL_SEC
+    idle_ttl_sec: float | None = None
+
     def __init__(self):
         self.entry_points = []
         self.states = {}
-        self.fallbacks = base_command_handlers
+        self.fallbacks = get_base_command_handlers()
 
     @abstractmethod
     def setup_handlers(self):
@@ -97,9 +108,33 @@ class BaseConversation(ABC):
             setattr(wrapped, "_splizy_entry_wrapped", True)
             entry.callback = wrapped
 
+    def _state_label(self, state: object) -> str:
+        for owner in (self.state_class, type(self)):
+            if owner is None:
+                continue
+            for name in dir(owner):
+                if name.isupper() and getattr(owner, name) == state:
+                    return name
+        return str(state)
+
+    def _instrument_handlers(self) -> None:
+        name = self.__class__.__name__
+        groups = [
+            ("entry", self.entry_points),
+            *(
+                (self._state_label(state), handlers)
+                for state, handlers in self.states.items()
+            ),
+            ("fallback", self.fallbacks),
+        ]
+        for state, handlers in groups:
+            for handler in handlers:
+                handler.callback = instrument_handler(handler.callback, name, state)
+
     def get_convo_handler(self):
         self.setup_handlers()
         self._wrap_entry_points()
+        self._instrument_handlers()
         return ConversationHandler(
             name=self.__class__.__name__,
             entry_points=self.entry_points,
@@ -111,4 +146,4 @@ class BaseConversation(ABC):
 
 class BaseCommands(BaseConversation):
     def setup_handlers(self):
-        self.entry_points = base_command_handlers
+        self.entry_points = get_base_command_handlers()
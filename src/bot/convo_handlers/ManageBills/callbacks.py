@@ -2,26 +2,37 @@ from __future__ import annotations
 
 from typing import Final
 
-EDIT_EXPENSE: Final = "edit_expense"
-DELETE_EXPENSE: Final = "delete_expense"
-GO_BACK: Final = "go_back"
-SHOW_RECEIPT: Final = "show_receipt"
-HIDE_RECEIPT: Final = "hide_receipt"
-
-VIEW_SELECT_PREFIX: Final = "view_select:"
-VIEW_PAGE_PREV: Final = "view_page_prev"
-VIEW_PAGE_NEXT: Final = "view_page_next"
-VIEW_TOGGLE_HIDE: Final = "view_toggle_hide"
-VIEW_TOGGLE_SHOW: Final = "view_toggle_show"
-VIEW_ALL_ENTRIES: Final = "view_all_entries"
+from src.bot.convo_utils.callback_data import U16, UUID, CallbackOp
+
+# Expense view, carrying the expense's id so a stale keyboard acts on the
+# expense it shows rather than whatever is in chat_data now
+EDIT_EXPENSE: Final = CallbackOp("G", "edit_expense", UUID)
+DELETE_EXPENSE: Final = CallbackOp("H", "delete_expense", UUID)
+GO_BACK: Final = CallbackOp("I", "go_back")
+SHOW_RECEIPT: Final = CallbackOp("J", "show_receipt", UUID)
+HIDE_RECEIPT: Final = CallbackOp("K", "hide_receipt", UUID)
+
+# View all
+VIEW_ALL_ENTRIES: Final = CallbackOp("A", "view_all_entries")
+VIEW_SELECT: Final = CallbackOp("B", "view_select", UUID)
+VIEW_PAGE_PREV: Final = CallbackOp("C", "view_page_prev")
+VIEW_PAGE_NEXT: Final = CallbackOp("D", "view_page_next")
+VIEW_TOGGLE_HIDE: Final = CallbackOp("E", "view_toggle_hide")
+VIEW_TOGGLE_SHOW: Final = CallbackOp("F", "view_toggle_show")
+
+# Custom split, by participant index
+CUSTOM_TOGGLE: Final = CallbackOp("L", "custom_toggle", U16)
+CUSTOM_AMOUNT: Final = CallbackOp("M", "custom_amount", U16)
+MULT_TOGGLE: Final = CallbackOp("N", "mult_toggle")
+MULT_AMOUNT: Final = CallbackOp("O", "mult_amount")
+CUSTOM_DONE: Final = CallbackOp("P", "custom_done")
 
 CANCEL_DELETE: Final = "cancel_delete"
 CONFIRM_DELETE: Final = "confirm_delete"
 
-VIEW_EXPENSE_PATTERN: Final = (
-    r"^(view_select:\d+|view_page_prev|view_page_next|view_toggle_hide|view_toggle_show|view_all_entries)$"
-)
-EDIT_OR_GO_BACK_PATTERN: Final = (
-    r"^(edit_expense|delete_expense|go_back|show_receipt|hide_receipt)$"
-)
 DELETE_EXPENSE_PATTERN: Final = r"^(cancel_delete|confirm_delete)$"
+
+CANCEL_IMPORT: Final = "cancel_import"
+CONFIRM_IMPORT: Final = "confirm_import"
+
+IMPORT_PATTERN: Final = r"^(cancel_import|confirm_import)$"
@@ -1,30 +1,89 @@
 from __future__ import annotations
 
+from array import array
+from dataclasses import dataclass, field
 from decimal import Decimal
-from typing import Literal, TypedDict
+from typing import Any, Literal, TypeAlias
 
-from src.lib.splizy_repo.model import ExpenseId, ExpenseRow, ReceiptData
+from src.lib.splizy_repo.model import ExpenseId, ReceiptAllocationData, ReceiptData
 
+SplitType: TypeAlias = Literal["equal_all", "equal_some", "custom"]
 
-class ManageBillsChatData(TypedDict, total=False):
-    # View all
-    expenses: list[ExpenseRow]
-    expense_index: int
-    viewall_page: int
-    viewall_is_collapsed: bool
+DEFAULT_MULTIPLIER = Decimal("1.19")
+
+
+@dataclass(slots=True)
+class ManageBillsChatData:
+    # View all; rows are paged in from the repo, only the position is kept
+    viewall_page: int = 0
+    viewall_is_collapsed: bool = True
+    # /view arguments, re-parsed into an ExpenseFilter for each page
+    viewall_query: str = ""
     # Add, view, edit
-    all_participants: list[str]
-    participant_selections: list[bool]
-    selected_participants: list[str]
-    is_equal_split: bool
-    split_type: Literal["equal_all", "equal_some", "custom"]
-    custom_amounts: list[float | Decimal]
-    has_mult: bool
-    mult_val: float | Decimal
-    expense_id: ExpenseId
-    expense_name: str
-    amount: float | Decimal
-    paid_by: str
-    currency: str
-    receipt: ReceiptData | None
-    receipt_detail_message_ids: list[int]
+    all_participants: list[str] = field(default_factory=list)
+    # Bitset over all_participants, None until a split that selects people is chosen
+    participant_selections: int | None = None
+    split_type: SplitType | None = None
+    # Packed doubles rather than Decimals, they are saved as floats anyway
+    custom_amounts: array[float] | None = None
+    custom_amount_index: int = 0
+    has_mult: bool = False
+    mult_val: Decimal = DEFAULT_MULTIPLIER
+    expense_id: ExpenseId | None = None
+    expense_name: str = ""
+    amount: Decimal = Decimal(0)
+    paid_by: str = ""
+    currency: str = ""
+    receipt: ReceiptData | None = None
+    receipt_allocation: ReceiptAllocationData | None = None
+    receipt_detail_message_ids: list[int] = field(default_factory=list)
+    # Confirmation form field being edited, if any
+    edit_field: str | None = None
+    # /import document awaiting confirmation
+    import_file_id: str | None = None
+    import_file_name: str = ""
+
+    @property
+    def is_equal_split(self) -> bool:
+        return self.split_type != "custom"
+
+    @property
+    def is_editing(self) -> bool:
+        return self.expense_id is not None
+
+    def select_all(self) -> None:
+        self.participant_selections = (1 << len(self.all_participants)) - 1
+
+    def is_selected(self, index: int) -> bool:
+        return bool((self.participant_selections or 0) >> index & 1)
+
+    def toggle_selected(self, index: int) -> None:
+        self.participant_selections = (self.participant_selections or 0) ^ (1 << index)
+
+    @property
+    def any_selected(self) -> bool:
+        return bool(self.participant_selections)
+
+    def custom_amount(self, index: int) -> Decimal:
+        return Decimal(str(self.custom_amounts[index]))
+
+    @property
+    def selected_participants(self) -> list[str]:
+        return [
+            username
+            for index, username in enumerate(self.all_participants)
+            if self.is_selected(index)
+        ]
+
+    def expense_fields(self) -> dict[str, Any]:
+        """The form as the mapping splizy_repo.service.save_expense takes."""
+        return {
+            "expense_id": self.expense_id,
+            "expense_name": self.expense_name,
+            "amount": self.amount,
+            "paid_by": self.paid_by,
+            "currency": self.currency,
+            "is_equal_split": self.is_equal_split,
+            "has_mult": self.has_mult,
+            "mult_val": self.mult_val,
+        }
@@ -1,3 +1,6 @@
+from array import array
+from decimal import Decimal
+
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.ext import ContextTypes, ConversationHandler
 
@@ -40,15 +43,16 @@ async def expense_name(update: Update, context: ContextTypes.DEFAULT_TYPE) -> in
         await update.message.reply_text("Name cannot be empty, please try again.")
         return ManageBillStates.EXPENSE_NAME
 
-    context.chat_data["expense_name"] = update.message.text
+    data: ManageBillsChatData = context.chat_data.manage_bills
+    data.expense_name = update.message.text
 
-    if "edit_field" in context.chat_data:
+    if data.edit_field is not None:
         await send_confirmation_form(update, context)
         return ManageBillStates.EXPENSE_CONFIRM
 
     expense_currency, usernames = get_group_expense_setup(update.message.chat.id)
-    context.chat_data["currency"] = expense_currency
-    context.chat_data["all_participants"] = usernames
+    data.currency = expense_currency
+    data.all_participants = usernames
     await update.message.reply_text(
         f"How much is it in {expense_currency}?\n"
         f"(Prefix with currency code to override, e.g. 'USD 50.10')\n\n"
@@ -63,12 +67,13 @@ async def expense_amount(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         await update.message.reply_text(result)  # result is error msg if invalid
         return ManageBillStates.EXPENSE_AMOUNT
     currency, amount = result
+    data: ManageBillsChatData = context.chat_data.manage_bills
     # Override expense currency if new one given
     if currency:
-        context.chat_data["currency"] = currency
-    context.chat_data["amount"] = amount
+        data.currency = currency
+    data.amount = amount
 
-    if "edit_field" in context.chat_data:
+    if data.edit_field is not None:
         await send_confirmation_form(update, context)
         return ManageBillStates.EXPENSE_CONFIRM
 
@@ -81,9 +86,10 @@ async def expense_paid_by(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     await query.answer()
 
     paid_by = query.data
-    context.chat_data["paid_by"] = paid_by
+    data: ManageBillsChatData = context.chat_data.manage_bills
+    data.paid_by = paid_by
 
-    if "edit_field" in context.chat_data:
+    if data.edit_field is not None:
         await send_confirmation_form(update, context, False)
         return ManageBillStates.EXPENSE_CONFIRM
 
@@ -114,40 +120,34 @@ async def expense_split_type(update: Update, context: ContextTypes.DEFAULT_TYPE)
     await query.answer()
 
     split_type = query.data
-    data: ManageBillsChatData = context.chat_data
+    data: ManageBillsChatData = context.chat_data.manage_bills
 
     if split_type == "split_equal_all":
-        data["is_equal_split"] = True
-        data["split_type"] = "equal_all"
+        data.split_type = "equal_all"
 
         await send_confirmation_form(update, context, False)
         return ManageBillStates.EXPENSE_CONFIRM
     elif split_type == "split_equal_some":
-        data["is_equal_split"] = True
-        data["split_type"] = "equal_some"
+        data.split_type = "equal_some"
 
-        # Since entire keyboard has to be rebuilt on every callback, state is managed with a bool array to minimise latency
+        # Since entire keyboard has to be rebuilt on every callback, state is managed with a bitset to minimise latency
         # and to preserve ordering of the inline buttons, as opposed to using a adding/removing strings in a string array
-        if "participant_selections" not in data:
-            data["participant_selections"] = [True] * len(data["all_participants"])
+        if data.participant_selections is None:
+            data.select_all()
         await send_multiselect_users(update, context)
         return ManageBillStates.EXPENSE_PARTICIPANTS
     elif split_type == "split_custom":
-        data["is_equal_split"] = False
-        data["split_type"] = "custom"
-
-        # Similarly, use the bool array implementation
-        if "has_mult" not in data:
-            data["has_mult"] = False
-        if "mult_val" not in data:
-            data["mult_val"] = 1.19
-        total_participants = len(data["all_participants"])
-        if "participant_selections" not in data:
-            data["participant_selections"] = [True] * total_participants
-        if "custom_amounts" not in data:
-            data["custom_amounts"] = [
-                data["amount"] / total_participants
-            ] * total_participants
+        data.split_type = "custom"
+
+        # Similarly, use the bitset implementation
+        total_participants = len(data.all_participants)
+        if data.participant_selections is None:
+            data.select_all()
+        if data.custom_amounts is None:
+            data.custom_amounts = (
+                array("d", [float(data.amount / total_participants)])
+                * total_participants
+            )
         await send_custom_multiselect_users(update, context)
         return ManageBillStates.EXPENSE_CUSTOM_SPLIT
 
@@ -160,18 +160,16 @@ async def expense_participants(
     await query.answer()
 
     action = query.data
+    data: ManageBillsChatData = context.chat_data.manage_bills
     if action != "participants_done":
         # Toggle participant selection
-        index = int(action)
-        context.chat_data["participant_selections"][index] = not context.chat_data[
-            "participant_selections"
-        ][index]
+        data.toggle_selected(int(action))
 
         # Recreate keyboard with updated selection
         await send_multiselect_users(update, context)
         return ManageBillStates.EXPENSE_PARTICIPANTS
 
-    if not any(context.chat_data["participant_selections"]):
+    if not data.any_selected:
         # Recreate keyboard with validation error
         await send_multiselect_users(
             update, context, "Please select at least one participant."
@@ -179,18 +177,8 @@ async def expense_participants(
         return ManageBillStates.EXPENSE_PARTICIPANTS
 
     # Check if all participants were selected anyway
-    selected_participants = [
-        username
-        for username, is_selected in zip(
-            context.chat_data["all_participants"],
-            context.chat_data["participant_selections"],
-        )
-        if is_selected
-    ]
-    if len(selected_participants) == len(context.chat_data["all_participants"]):
-        context.chat_data["split_type"] = "equal_all"
-    else:
-        context.chat_data["selected_participants"] = selected_participants
+    if len(data.selected_participants) == len(data.all_participants):
+        data.split_type = "equal_all"
     await send_confirmation_form(update, context, False)
     return ManageBillStates.EXPENSE_CONFIRM
 
@@ -204,8 +192,8 @@ async def expense_custom_amount(
         return ManageBillStates.EXPENSE_CUSTOM_AMOUNT
     _, amount = result
 
-    index = context.chat_data["index"]
-    context.chat_data["custom_amounts"][index] = amount
+    data: ManageBillsChatData = context.chat_data.manage_bills
+    data.custom_amounts[data.custom_amount_index] = float(amount)
 
     await send_custom_multiselect_users(update, context, True)
     return ManageBillStates.EXPENSE_CUSTOM_SPLIT
@@ -216,7 +204,7 @@ async def expense_multiplier(update: Update, context: ContextTypes.DEFAULT_TYPE)
     if not is_valid:
         await update.message.reply_text(result)
         return ManageBillStates.EXPENSE_MULTIPLIER
-    context.chat_data["mult_val"] = result
+    context.chat_data.manage_bills.mult_val = Decimal(str(result))
 
     await send_custom_multiselect_users(update, context, True)
     return ManageBillStates.EXPENSE_CUSTOM_SPLIT
@@ -226,15 +214,16 @@ async def expense_confirm(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     query = update.callback_query
     await query.answer()
     action = query.data
+    data: ManageBillsChatData = context.chat_data.manage_bills
 
     if action != "submit_form" and action != "cancel_form":
-        context.chat_data["edit_field"] = action
+        data.edit_field = action
 
     if action == "edit_expense_name":
         await query.edit_message_text("What is the new name for this expense?")
         return ManageBillStates.EXPENSE_NAME
     elif action == "edit_amount":
-        if context.chat_data["split_type"] == "custom":
+        if data.split_type == "custom":
             await send_custom_multiselect_users(update, context)
             return ManageBillStates.EXPENSE_CUSTOM_SPLIT
         else:
@@ -271,7 +260,7 @@ async def expense_confirm(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         return ManageBillStates.EXPENSE_SPLIT_TYPE
     elif action == "cancel_form":
         # If editing, just go back to expense view
-        if "expenses" in context.chat_data:
+        if data.is_editing:
             await send_expense_view(update, context)
             return ManageBillStates.EDIT_OR_GO_BACK
         # If not editing, end convo
@@ -279,19 +268,18 @@ async def expense_confirm(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         return ConversationHandler.END
 
     elif action == "submit_form":
-        data: ManageBillsChatData = context.chat_data
         payees = build_payees(data)
         # NOTE: look into implementing transactions in the repo/service layer in future if needed; for now
         # things are simple enough that failures are unlikely / manual rollbacks are manageable, so no need
         # to overengineer at the moment
         try:
             # Create or update expense
-            saved_expense = save_expense(query.message.chat.id, data, payees)
+            saved_expense = save_expense(
+                query.message.chat.id, data.expense_fields(), payees
+            )
             # If editing, update context and return to expense view
-            if "expense_id" in data:
-                # Then update the context and return to expense view
-                index = context.chat_data["expense_index"]
-                context.chat_data["expenses"][index] = saved_expense
+            if data.is_editing:
+                # The form already holds the saved values
                 await send_expense_view(
                     update, context, "(Expense updated successfully)"
                 )
@@ -304,7 +292,7 @@ async def expense_confirm(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             return ManageBillStates.VIEW_EXPENSE
 
         except Exception as e:
-            logger.error(f"Failed to add / edit expense: {e}")
+            logger.error("Failed to add / edit expense: %s", e)
             await query.edit_message_text(
                 "Failed to add / edit expense, please check logs."
             )
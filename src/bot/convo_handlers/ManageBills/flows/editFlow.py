@@ -12,60 +12,116 @@ from src.bot.convo_handlers.ManageBills.callbacks import (
 )
 from src.bot.convo_handlers.ManageBills.context import ManageBillsChatData
 from src.bot.convo_handlers.ManageBills.states import ManageBillStates
+from src.bot.convo_handlers.ManageBills.utils.general import (
+    populate_context_for_selected_expense_from_viewall,
+)
 from src.bot.convo_handlers.ManageBills.utils.renderers import (
+    get_view_all_entries_markup,
     open_miniapp,
     send_all_expenses,
     send_confirmation_form,
     send_expense_view,
     send_expense_with_receipt_view,
 )
-from src.lib.logger import get_logger
-
-logger = get_logger(__name__)
+from src.bot.convo_utils.callback_data import CallbackRoutes
+from src.lib.splizy_repo.model import ExpenseId
+from src.lib.splizy_repo.repo import repo
 
 
 async def edit_or_go_back(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    data: ManageBillsChatData = context.chat_data
-    query = update.callback_query
-    await query.answer()
-    action = query.data
-
-    if action == EDIT_EXPENSE:
-        if data["receipt"]:
-            await open_miniapp(
-                update=update,
-                group_id=update.effective_chat.id,
-                expense_id=data["expense_id"],
-            )
-            return ManageBillStates.EXPENSE_RECEIPT_CONFIRM
-        await send_confirmation_form(update, context, False)
-        return ManageBillStates.EXPENSE_CONFIRM
-
-    elif action == DELETE_EXPENSE:
-        keyboard = [
-            [
-                InlineKeyboardButton("❌ No", callback_data=CANCEL_DELETE),
-                InlineKeyboardButton("✅ Yes", callback_data=CONFIRM_DELETE),
-            ],
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        await query.edit_message_text(
-            text=(
-                f"Are you sure you want to delete this expense?\n({data['expense_name']} | {data['paid_by']} | {data['currency']} {data['amount']})\n"
-                "This action cannot be undone."
-            ),
-            reply_markup=reply_markup,
+    await update.callback_query.answer()
+    return await EDIT_OR_GO_BACK_ROUTES.dispatch(
+        update, context, ManageBillStates.EDIT_OR_GO_BACK
+    )
+
+
+async def _load_expense(
+    update: Update, context: ContextTypes.DEFAULT_TYPE, expense_id: ExpenseId
+) -> bool:
+    """Make chat_data hold the expense the tapped button belongs to."""
+    data: ManageBillsChatData = context.chat_data.manage_bills
+    if data.expense_id == expense_id:
+        return True
+    expense = repo.get_expense(expense_id)
+    if expense is None:
+        await update.callback_query.edit_message_text(
+            "Expense could not be loaded, it may have been deleted.",
+            reply_markup=get_view_all_entries_markup(),
         )
-        return ManageBillStates.DELETE_EXPENSE
-    elif action == GO_BACK:
-        await send_all_expenses(update, context, False)
+        return False
+    populate_context_for_selected_expense_from_viewall(data, expense)
+    return True
+
+
+async def _edit_expense(
+    update: Update, context: ContextTypes.DEFAULT_TYPE, expense_id: ExpenseId
+) -> int:
+    if not await _load_expense(update, context, expense_id):
+        return ManageBillStates.VIEW_EXPENSE
+    data: ManageBillsChatData = context.chat_data.manage_bills
+    if data.receipt:
+        await open_miniapp(
+            update=update,
+            group_id=update.effective_chat.id,
+            expense_id=data.expense_id,
+        )
+        return ManageBillStates.EXPENSE_RECEIPT_CONFIRM
+    await send_confirmation_form(update, context, False)
+    return ManageBillStates.EXPENSE_CONFIRM
+
+
+async def _delete_expense(
+    update: Update, context: ContextTypes.DEFAULT_TYPE, expense_id: ExpenseId
+) -> int:
+    if not await _load_expense(update, context, expense_id):
+        return ManageBillStates.VIEW_EXPENSE
+    data: ManageBillsChatData = context.chat_data.manage_bills
+    keyboard = [
+        [
+            InlineKeyboardButton("❌ No", callback_data=CANCEL_DELETE),
+            InlineKeyboardButton("✅ Yes", callback_data=CONFIRM_DELETE),
+        ],
+    ]
+    reply_markup = InlineKeyboardMarkup(keyboard)
+    await update.callback_query.edit_message_text(
+        text=(
+            f"Are you sure you want to delete this expense?\n({data.expense_name} | {data.paid_by} | {data.currency} {data.amount})\n"
+            "This action cannot be undone."
+        ),
+        reply_markup=reply_markup,
+    )
+    return ManageBillStates.DELETE_EXPENSE
+
+
+async def _go_back(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    await send_all_expenses(update, context, False)
+    return ManageBillStates.VIEW_EXPENSE
+
+
+async def _show_receipt(
+    update: Update, context: ContextTypes.DEFAULT_TYPE, expense_id: ExpenseId
+) -> int:
+    if not await _load_expense(update, context, expense_id):
         return ManageBillStates.VIEW_EXPENSE
-    elif action == SHOW_RECEIPT:
-        await send_expense_with_receipt_view(update, context)
-        return ManageBillStates.EDIT_OR_GO_BACK
-    elif action == HIDE_RECEIPT:
-        await send_expense_view(update, context)
-        return ManageBillStates.EDIT_OR_GO_BACK
-
-    logger.warning("Unknown edit action received in edit_or_go_back: %s", action)
+    await send_expense_with_receipt_view(update, context)
     return ManageBillStates.EDIT_OR_GO_BACK
+
+
+async def _hide_receipt(
+    update: Update, context: ContextTypes.DEFAULT_TYPE, expense_id: ExpenseId
+) -> int:
+    if not await _load_expense(update, context, expense_id):
+        return ManageBillStates.VIEW_EXPENSE
+    await send_expense_view(update, context)
+    return ManageBillStates.EDIT_OR_GO_BACK
+
+
+EDIT_OR_GO_BACK_ROUTES = CallbackRoutes(
+    {
+        EDIT_EXPENSE: _edit_expense,
+        DELETE_EXPENSE: _delete_expense,
+        GO_BACK: _go_back,
+        SHOW_RECEIPT: _show_receipt,
+        HIDE_RECEIPT: _hide_receipt,
+    }
+)
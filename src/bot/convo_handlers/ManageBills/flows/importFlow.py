@@ -0,0 +1,142 @@
+from tempfile import SpooledTemporaryFile
+
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
+from telegram.ext import ContextTypes, ConversationHandler
+
+from src.bot.convo_handlers.ManageBills.callbacks import CANCEL_IMPORT, CONFIRM_IMPORT
+from src.bot.convo_handlers.ManageBills.context import ManageBillsChatData
+from src.bot.convo_handlers.ManageBills.states import ManageBillStates
+from src.bot.convo_handlers.ManageBills.utils.importer import (
+    IMPORT_FORMAT_HELP,
+    IMPORT_MAX_BYTES,
+    IMPORT_MAX_ROWS,
+    ImportPlan,
+    plan_import,
+)
+from src.bot.convo_handlers.ManageBills.utils.renderers import (
+    get_view_all_entries_markup,
+)
+from src.bot.convo_utils.wrappers import group_only
+from src.lib.currencies.utils import get_shorthand_currency
+from src.lib.logger import get_logger
+from src.lib.splizy_repo.repo import repo
+from src.lib.splizy_repo.service import get_group_expense_setup
+
+logger = get_logger(__name__)
+
+# Downloads larger than this spill from memory to a temp file
+IMPORT_SPOOL_BYTES = 512 * 1024
+MAX_LISTED_ERRORS = 20
+
+
+@group_only
+async def import_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    context.chat_data.clear()
+    await update.message.reply_text(IMPORT_FORMAT_HELP)
+    return ManageBillStates.IMPORT_DOCUMENT
+
+
+async def _plan_document(
+    context: ContextTypes.DEFAULT_TYPE, group_id: int, file_id: str, file_name: str
+) -> ImportPlan:
+    telegram_file = await context.bot.get_file(file_id)
+    with SpooledTemporaryFile(max_size=IMPORT_SPOOL_BYTES) as buffer:
+        await telegram_file.download_to_memory(out=buffer)
+        buffer.seek(0)
+        expense_currency, usernames = get_group_expense_setup(group_id)
+        return plan_import(buffer, file_name, group_id, usernames, expense_currency)
+
+
+def _format_plan(plan: ImportPlan, file_name: str) -> str:
+    lines = [f"Dry run of {file_name}: {plan.rows_read} rows read."]
+    if plan.truncated:
+        lines.append(f"Only the first {IMPORT_MAX_ROWS} rows are imported at once.")
+    if plan.payloads:
+        totals = ", ".join(
+            f"{get_shorthand_currency(currency)}{total:.2f}"
+            for currency, total in plan.totals.items()
+        )
+        lines.append(f"✅ {len(plan.payloads)} expenses ready to import ({totals})")
+    if plan.errors:
+        lines.append(f"❌ {len(plan.errors)} rows with errors, which will be skipped:")
+        lines += [
+            f"Row {error.row}: {error.message}"
+            for error in plan.errors[:MAX_LISTED_ERRORS]
+        ]
+        if len(plan.errors) > MAX_LISTED_ERRORS:
+            lines.append(f"...and {len(plan.errors) - MAX_LISTED_ERRORS} more")
+    return "\n".join(lines)
+
+
+async def import_document(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    document = update.message.document
+    file_name = document.file_name or ""
+    if not file_name.lower().endswith((".csv", ".json")):
+        await update.message.reply_text("Please send a .csv or .json file.")
+        return ManageBillStates.IMPORT_DOCUMENT
+    if document.file_size and document.file_size > IMPORT_MAX_BYTES:
+        await update.message.reply_text(
+            f"The file is over the {IMPORT_MAX_BYTES // (1024 * 1024)}MB import limit, "
+            "please split it up."
+        )
+        return ManageBillStates.IMPORT_DOCUMENT
+
+    try:
+        plan = await _plan_document(
+            context, update.message.chat.id, document.file_id, file_name
+        )
+    except (ValueError, UnicodeDecodeError) as e:
+        await update.message.reply_text(f"Could not read {file_name}: {e}")
+        return ManageBillStates.IMPORT_DOCUMENT
+
+    text = _format_plan(plan, file_name)
+    if not plan.payloads:
+        await update.message.reply_text(
+            f"{text}\n\nNothing to import, fix the file and send it again."
+        )
+        return ManageBillStates.IMPORT_DOCUMENT
+
+    # Only the file is kept; it's downloaded and validated again on confirm
+    data: ManageBillsChatData = context.chat_data.manage_bills
+    data.import_file_id = document.file_id
+    data.import_file_name = file_name
+    reply_markup = InlineKeyboardMarkup(
+        [
+            [
+                InlineKeyboardButton("❌ Cancel", callback_data=CANCEL_IMPORT),
+                InlineKeyboardButton(
+                    f"✅ Import {len(plan.payloads)}", callback_data=CONFIRM_IMPORT
+                ),
+            ]
+        ]
+    )
+    await update.message.reply_text(text, reply_markup=reply_markup)
+    return ManageBillStates.IMPORT_CONFIRM
+
+
+async def import_confirm(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    query = update.callback_query
+    await query.answer()
+    data: ManageBillsChatData = context.chat_data.manage_bills
+    if query.data != CONFIRM_IMPORT or data.import_file_id is None:
+        await query.edit_message_text("Import cancelled.")
+        return ConversationHandler.END
+
+    try:
+        plan = await _plan_document(
+            context, query.message.chat.id, data.import_file_id, data.import_file_name
+        )
+        imported = repo.create_expenses(plan.payloads)
+    except Exception as e:
+        logger.error("Failed to import expenses: %s", e)
+        await query.edit_message_text(
+            "Import failed and nothing was saved, please check logs."
+        )
+        return ConversationHandler.END
+
+    skipped = f", skipped {len(plan.errors)} rows with errors" if plan.errors else ""
+    await query.edit_message_text(
+        f"Imported {imported} expenses from {data.import_file_name}{skipped}.",
+        reply_markup=get_view_all_entries_markup(),
+    )
+    return ManageBillStates.VIEW_EXPENSE
@@ -1,8 +1,10 @@
 import json
+import logging
 
 from telegram import Update
 from telegram.ext import ContextTypes, ConversationHandler
 
+from src.bot.convo_handlers.ManageBills.context import ManageBillsChatData
 from src.bot.convo_handlers.ManageBills.states import ManageBillStates
 from src.bot.convo_handlers.ManageBills.utils.general import (
     format_saved_expense_summary,
@@ -20,6 +22,7 @@ from src.lib.receipt_parser import Receipt, parse_receipt
 from src.lib.splizy_repo.repo import repo
 from src.lib.splizy_repo.service import (
     get_latest_temp_receipt_with_expense,
+    get_receipt_allocation,
     prepare_temp_receipt_review,
 )
 
@@ -31,8 +34,6 @@ async def add_receipt_command(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ) -> int:
     context.chat_data.clear()
-    context.chat_data["receipt"] = parse_receipt(bytes())
-    # logger.info(context.chat_data["receipt"].model_dump_json(indent=2))
     await update.message.reply_text(
         "Please upload a picture of your receipt! (the clearer the better!)"
     )
@@ -55,7 +56,7 @@ async def expense_receipt_upload(
         photo_file = await largest_photo.get_file()
         image_bytes = await photo_file.download_as_bytearray()
     except Exception as e:
-        logger.error(f"Failed to download receipt photo: {e}")
+        logger.error("Failed to download receipt photo: %s", e)
         await update.message.reply_text(
             "Could not download receipt photo. Please try again."
         )
@@ -68,16 +69,17 @@ async def expense_receipt_upload(
     try:
         receipt: Receipt = parse_receipt(bytes(image_bytes))
     except Exception as e:
-        logger.error(f"Receipt parsing failed: {e}")
+        logger.error("Receipt parsing failed: %s", e)
         await update.message.reply_text(
             "Could not parse the receipt image as service might be down. Please try again later or ping the admin at @jhtzz."
         )
         return ConversationHandler.END
 
-    context.chat_data["receipt"] = receipt
-    logger.info(
-        f"Photo receipt parsed successfully:\n {json.dumps(dict(context.chat_data['receipt']), indent=2, default=str)}"
-    )
+    logger.info("Photo receipt parsed successfully: %d items", len(receipt.items))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Parsed receipt:\n%s", json.dumps(dict(receipt), indent=2, default=str)
+        )
 
     if receipt.total is None:
         await update.message.reply_text(
@@ -93,7 +95,7 @@ async def expense_receipt_upload(
             to_miniapp_receipt(receipt),
         )
     except Exception as e:
-        logger.error(f"Failed to create temp receipt row: {e}")
+        logger.error("Failed to create temp receipt row: %s", e)
         await update.message.reply_text(
             "Failed to prepare receipt for miniapp review due to a db error. Please try again later or ping the admin at @jhtzz."
         )
@@ -110,17 +112,15 @@ async def expense_receipt_confirm(
     await query.answer()
 
     # If editing, update the expense context and go back to expense view
-    is_editing = "expense_id" in context.chat_data
-    if is_editing:
-        expense = repo.get_expense(context.chat_data["expense_id"])
+    data: ManageBillsChatData = context.chat_data.manage_bills
+    if data.is_editing:
+        expense = repo.get_expense(data.expense_id)
         if expense is None:
             await query.edit_message_text(
                 "Updated expense could not be loaded, service might be down."
             )
             return ConversationHandler.END
-        index = context.chat_data["expense_index"]
-        context.chat_data["expenses"][index] = expense
-        populate_context_for_selected_expense_from_viewall(context.chat_data, expense)
+        populate_context_for_selected_expense_from_viewall(data, expense)
         await send_expense_view(update, context)
         return ManageBillStates.EDIT_OR_GO_BACK
 
@@ -144,6 +144,15 @@ async def expense_receipt_confirm(
         )
         return ConversationHandler.END
 
+    # The miniapp saves the expense; store its per-user breakdown for later views
+    if expense.get("receipt"):
+        expense["receipt_allocation"] = get_receipt_allocation(
+            expense_id,
+            expense["receipt"],
+            [payee["user"] for payee in expense["payees"]],
+            expense.get("receipt_allocation"),
+        )
+
     await query.edit_message_text(
         format_saved_expense_summary(
             expense,
@@ -3,12 +3,20 @@ from decimal import Decimal
 from telegram import Update
 from telegram.ext import ContextTypes
 
+from src.bot.convo_handlers.ManageBills.callbacks import (
+    CUSTOM_AMOUNT,
+    CUSTOM_DONE,
+    CUSTOM_TOGGLE,
+    MULT_AMOUNT,
+    MULT_TOGGLE,
+)
 from src.bot.convo_handlers.ManageBills.context import ManageBillsChatData
 from src.bot.convo_handlers.ManageBills.states import ManageBillStates
 from src.bot.convo_handlers.ManageBills.utils.renderers import (
     send_confirmation_form,
     send_custom_multiselect_users,
 )
+from src.bot.convo_utils.callback_data import CallbackRoutes
 from src.lib.logger import get_logger
 
 logger = get_logger(__name__)
@@ -17,60 +25,69 @@ logger = get_logger(__name__)
 async def expense_custom_split(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ) -> int:
-    query = update.callback_query
-    await query.answer()
-
-    action = query.data
-
-    data: ManageBillsChatData = context.chat_data
-    if action != "custom_done":
-        entity, field = action.split("_")
-        if entity.isdigit():
-            index = int(entity)
-            if field == "toggle":
-                data["participant_selections"][index] = not data[
-                    "participant_selections"
-                ][index]
-                await send_custom_multiselect_users(update, context)
-                return ManageBillStates.EXPENSE_CUSTOM_SPLIT
-            elif field == "amount":
-                data["index"] = index
-                await query.edit_message_text(
-                    f"Please enter the amount spent by @{data['all_participants'][index]}:"
-                )
-                return ManageBillStates.EXPENSE_CUSTOM_AMOUNT
-        else:
-            if field == "toggle":
-                data["has_mult"] = not data["has_mult"]
-                await send_custom_multiselect_users(update, context)
-                return ManageBillStates.EXPENSE_CUSTOM_SPLIT
-            elif field == "amount":
-                await query.edit_message_text(
-                    "Please enter a multiplier between 1 and 2, eg 1.19"
-                )
-                return ManageBillStates.EXPENSE_MULTIPLIER
+    await update.callback_query.answer()
+    return await CUSTOM_SPLIT_ROUTES.dispatch(
+        update, context, ManageBillStates.EXPENSE_CUSTOM_SPLIT
+    )
+
+
+async def _toggle_participant(
+    update: Update, context: ContextTypes.DEFAULT_TYPE, index: int
+) -> int:
+    data: ManageBillsChatData = context.chat_data.manage_bills
+    data.toggle_selected(index)
+    await send_custom_multiselect_users(update, context)
+    return ManageBillStates.EXPENSE_CUSTOM_SPLIT
+
+
+async def _ask_participant_amount(
+    update: Update, context: ContextTypes.DEFAULT_TYPE, index: int
+) -> int:
+    data: ManageBillsChatData = context.chat_data.manage_bills
+    data.custom_amount_index = index
+    await update.callback_query.edit_message_text(
+        f"Please enter the amount spent by @{data.all_participants[index]}:"
+    )
+    return ManageBillStates.EXPENSE_CUSTOM_AMOUNT
 
+
+async def _toggle_multiplier(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    data: ManageBillsChatData = context.chat_data.manage_bills
+    data.has_mult = not data.has_mult
+    await send_custom_multiselect_users(update, context)
+    return ManageBillStates.EXPENSE_CUSTOM_SPLIT
+
+
+async def _ask_multiplier(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    await update.callback_query.edit_message_text(
+        "Please enter a multiplier between 1 and 2, eg 1.19"
+    )
+    return ManageBillStates.EXPENSE_MULTIPLIER
+
+
+async def _custom_split_done(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    data: ManageBillsChatData = context.chat_data.manage_bills
     # Custom split done, validate first
     logger.info("Validating custom split selections...")
-    if not any(context.chat_data["participant_selections"]):
+    if not data.any_selected:
         await send_custom_multiselect_users(
             update, context, False, "Please select at least one participant."
         )
         return ManageBillStates.EXPENSE_CUSTOM_SPLIT
 
     logger.info("Custom selection validated. Preparing confirmation form...")
-    has_mult, mult_val = data["has_mult"], data["mult_val"]
-    data["selected_participants"] = [
-        username
-        for idx, username in enumerate(data["all_participants"])
-        if data["participant_selections"][idx]
-    ]
-    data["amount"] = sum(
+    has_mult, mult_val = data.has_mult, data.mult_val
+    data.amount = sum(
         [
-            (amount * Decimal(mult_val) if has_mult else amount)
-            for idx, amount in enumerate(data["custom_amounts"])
-            if data["participant_selections"][idx]
-        ]
+            (
+                data.custom_amount(idx) * mult_val
+                if has_mult
+                else data.custom_amount(idx)
+            )
+            for idx in range(len(data.custom_amounts))
+            if data.is_selected(idx)
+        ],
+        Decimal(0),
     )
     logger.info("Confirmation form prepared, sending...")
     # print(json.dumps(dict(context.chat_data), indent=2, default=str))
@@ -78,3 +95,14 @@ async def expense_custom_split(
     logger.info("Confirmation form sent")
 
     return ManageBillStates.EXPENSE_CONFIRM
+
+
+CUSTOM_SPLIT_ROUTES = CallbackRoutes(
+    {
+        CUSTOM_TOGGLE: _toggle_participant,
+        CUSTOM_AMOUNT: _ask_participant_amount,
+        MULT_TOGGLE: _toggle_multiplier,
+        MULT_AMOUNT: _ask_multiplier,
+        CUSTOM_DONE: _custom_split_done,
+    }
+)
@@ -5,7 +5,7 @@ from src.bot.convo_handlers.ManageBills.callbacks import (
     VIEW_ALL_ENTRIES,
     VIEW_PAGE_NEXT,
     VIEW_PAGE_PREV,
-    VIEW_SELECT_PREFIX,
+    VIEW_SELECT,
     VIEW_TOGGLE_HIDE,
     VIEW_TOGGLE_SHOW,
 )
@@ -15,11 +15,15 @@ from src.bot.convo_handlers.ManageBills.utils.general import (
     initialise_viewall_context,
     populate_context_for_selected_expense_from_viewall,
 )
+from src.bot.convo_handlers.ManageBills.utils.parsers import parse_view_filter
 from src.bot.convo_handlers.ManageBills.utils.renderers import (
+    get_view_all_entries_markup,
     send_all_expenses,
     send_expense_view,
 )
+from src.bot.convo_utils.callback_data import CallbackRoutes
 from src.bot.convo_utils.wrappers import group_only
+from src.lib.splizy_repo.model import ExpenseId
 from src.lib.splizy_repo.repo import repo
 
 
@@ -27,73 +31,97 @@ from src.lib.splizy_repo.repo import repo
 async def view_all_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     context.chat_data.clear()
     group_id = update.message.chat.id
-    expenses = repo.list_expenses(group_id)
-    if not expenses:
-        await update.message.reply_text("No expenses logged yet.")
+    query = " ".join(context.args or [])
+    is_valid, criteria = parse_view_filter(query)
+    if not is_valid:
+        await update.message.reply_text(criteria)
         return ConversationHandler.END
-    initialise_viewall_context(context.chat_data, expenses)
-    await send_all_expenses(update, context)
+    summary = repo.summarize_expenses(group_id, criteria)
+    if not summary.expense_count:
+        await update.message.reply_text(
+            f"No expenses match '{query}'." if query else "No expenses logged yet."
+        )
+        return ConversationHandler.END
+    initialise_viewall_context(context.chat_data.manage_bills, query)
+    await send_all_expenses(update, context, summary=summary)
     return ManageBillStates.VIEW_EXPENSE
 
 
 async def view_expense(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    await update.callback_query.answer()
+    return await VIEW_EXPENSE_ROUTES.dispatch(
+        update, context, ManageBillStates.VIEW_EXPENSE
+    )
+
+
+# Entry point from addFlow
+async def _view_all_entries(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     query = update.callback_query
-    await query.answer()
-    if not query.data:
-        return ManageBillStates.VIEW_EXPENSE
+    context.chat_data.clear()
+    data: ManageBillsChatData = context.chat_data.manage_bills
+    group_id = query.message.chat.id
+    summary = repo.summarize_expenses(group_id)
+    if not summary.expense_count:
+        await query.edit_message_text("No expenses logged yet.")
+        return ConversationHandler.END
+    initialise_viewall_context(data)
+    await send_all_expenses(update, context, False, summary)
+    return ManageBillStates.VIEW_EXPENSE
 
-    data: ManageBillsChatData = context.chat_data
-
-    # Entry point from addFlow
-    if query.data == VIEW_ALL_ENTRIES:
-        data.clear()
-        group_id = query.message.chat.id
-        expenses = repo.list_expenses(group_id)
-        if not expenses:
-            await query.edit_message_text("No expenses logged yet.")
-            return ConversationHandler.END
-        initialise_viewall_context(data, expenses)
-        await send_all_expenses(update, context, False)
+
+async def _select_expense(
+    update: Update, context: ContextTypes.DEFAULT_TYPE, expense_id: ExpenseId
+) -> int:
+    # Listing rows omit payees and receipt, so load the full row on selection
+    expense = repo.get_expense(expense_id)
+    if expense is None:
+        await update.callback_query.edit_message_text(
+            "Expense could not be loaded, it may have been deleted.",
+            reply_markup=get_view_all_entries_markup(),
+        )
         return ManageBillStates.VIEW_EXPENSE
 
-    # View selected expense
-    if query.data.startswith(VIEW_SELECT_PREFIX):
-        try:
-            index = int(query.data.removeprefix(VIEW_SELECT_PREFIX))
-        except ValueError:
-            return ManageBillStates.VIEW_EXPENSE
+    populate_context_for_selected_expense_from_viewall(
+        context.chat_data.manage_bills, expense
+    )
+    await send_expense_view(update, context)
+    return ManageBillStates.EDIT_OR_GO_BACK
 
-        if index < 0 or index >= len(data["expenses"]):
-            return ManageBillStates.VIEW_EXPENSE
 
-        data["expense_index"] = index
-        expense = data["expenses"][index]
+# Modify viewall settings
+async def _page_prev(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    data: ManageBillsChatData = context.chat_data.manage_bills
+    data.viewall_page = max(0, data.viewall_page - 1)
+    await send_all_expenses(update, context, False)
+    return ManageBillStates.VIEW_EXPENSE
 
-        populate_context_for_selected_expense_from_viewall(data, expense)
-        await send_expense_view(update, context)
-        return ManageBillStates.EDIT_OR_GO_BACK
 
-    # Modify viewall settings
-    if query.data == VIEW_PAGE_PREV:
-        current_page = int(data.get("viewall_page", 0))
-        data["viewall_page"] = max(0, current_page - 1)
-        await send_all_expenses(update, context, False)
-        return ManageBillStates.VIEW_EXPENSE
+async def _page_next(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    data: ManageBillsChatData = context.chat_data.manage_bills
+    data.viewall_page += 1
+    await send_all_expenses(update, context, False)
+    return ManageBillStates.VIEW_EXPENSE
 
-    if query.data == VIEW_PAGE_NEXT:
-        current_page = int(data.get("viewall_page", 0))
-        data["viewall_page"] = current_page + 1
-        await send_all_expenses(update, context, False)
-        return ManageBillStates.VIEW_EXPENSE
 
-    if query.data == VIEW_TOGGLE_HIDE:
-        data["viewall_is_collapsed"] = True
-        await send_all_expenses(update, context, False)
-        return ManageBillStates.VIEW_EXPENSE
+async def _toggle_hide(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    context.chat_data.manage_bills.viewall_is_collapsed = True
+    await send_all_expenses(update, context, False)
+    return ManageBillStates.VIEW_EXPENSE
 
-    if query.data == VIEW_TOGGLE_SHOW:
-        data["viewall_is_collapsed"] = False
-        await send_all_expenses(update, context, False)
-        return ManageBillStates.VIEW_EXPENSE
 
+async def _toggle_show(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    context.chat_data.manage_bills.viewall_is_collapsed = False
+    await send_all_expenses(update, context, False)
     return ManageBillStates.VIEW_EXPENSE
+
+
+VIEW_EXPENSE_ROUTES = CallbackRoutes(
+    {
+        VIEW_ALL_ENTRIES: _view_all_entries,
+        VIEW_SELECT: _select_expense,
+        VIEW_PAGE_PREV: _page_prev,
+        VIEW_PAGE_NEXT: _page_next,
+        VIEW_TOGGLE_HIDE: _toggle_hide,
+        VIEW_TOGGLE_SHOW: _toggle_show,
+    }
+)
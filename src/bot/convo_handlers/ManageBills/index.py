@@ -3,8 +3,7 @@ from telegram.ext import CallbackQueryHandler, CommandHandler, MessageHandler, f
 from src.bot.convo_handlers.Base import BaseConversation
 from src.bot.convo_handlers.ManageBills.callbacks import (
     DELETE_EXPENSE_PATTERN,
-    EDIT_OR_GO_BACK_PATTERN,
-    VIEW_EXPENSE_PATTERN,
+    IMPORT_PATTERN,
 )
 from src.bot.convo_handlers.ManageBills.flows.addFlow import (
     add_command,
@@ -18,7 +17,15 @@ from src.bot.convo_handlers.ManageBills.flows.addFlow import (
     expense_split_type,
 )
 from src.bot.convo_handlers.ManageBills.flows.deleteFlow import delete_expense
-from src.bot.convo_handlers.ManageBills.flows.editFlow import edit_or_go_back
+from src.bot.convo_handlers.ManageBills.flows.editFlow import (
+    EDIT_OR_GO_BACK_ROUTES,
+    edit_or_go_back,
+)
+from src.bot.convo_handlers.ManageBills.flows.importFlow import (
+    import_command,
+    import_confirm,
+    import_document,
+)
 from src.bot.convo_handlers.ManageBills.flows.receiptFlow import (
     add_receipt_command,
     expense_receipt_confirm,
@@ -28,6 +35,7 @@ from src.bot.convo_handlers.ManageBills.flows.unevenSplitFlow import (
     expense_custom_split,
 )
 from src.bot.convo_handlers.ManageBills.flows.viewFlow import (
+    VIEW_EXPENSE_ROUTES,
     view_all_command,
     view_expense,
 )
@@ -38,11 +46,14 @@ logger = get_logger(__name__)
 
 
 class ManageBills(BaseConversation):
+    state_class = States
+
     def setup_handlers(self):
         self.entry_points = [
             CommandHandler("add", add_command),
             CommandHandler("add_receipt", add_receipt_command),
             CommandHandler("view", view_all_command),
+            CommandHandler("import", import_command),
         ]
         self.states = {
             States.EXPENSE_NAME: [
@@ -72,15 +83,21 @@ class ManageBills(BaseConversation):
             ],
             States.EXPENSE_CONFIRM: [CallbackQueryHandler(expense_confirm)],
             States.VIEW_EXPENSE: [
-                CallbackQueryHandler(view_expense, pattern=VIEW_EXPENSE_PATTERN)
+                CallbackQueryHandler(view_expense, pattern=VIEW_EXPENSE_ROUTES.matches)
             ],
             States.EDIT_OR_GO_BACK: [
                 CallbackQueryHandler(
                     edit_or_go_back,
-                    pattern=EDIT_OR_GO_BACK_PATTERN,
+                    pattern=EDIT_OR_GO_BACK_ROUTES.matches,
                 )
             ],
             States.DELETE_EXPENSE: [
                 CallbackQueryHandler(delete_expense, pattern=DELETE_EXPENSE_PATTERN)
             ],
+            States.IMPORT_DOCUMENT: [
+                MessageHandler(filters.Document.ALL, import_document)
+            ],
+            States.IMPORT_CONFIRM: [
+                CallbackQueryHandler(import_confirm, pattern=IMPORT_PATTERN)
+            ],
         }
@@ -13,3 +13,5 @@ class ManageBillStates:
     VIEW_EXPENSE = 12
     EDIT_OR_GO_BACK = 13
     DELETE_EXPENSE = 14
+    IMPORT_DOCUMENT = 15
+    IMPORT_CONFIRM = 16
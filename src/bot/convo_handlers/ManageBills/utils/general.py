@@ -1,42 +1,43 @@
+from array import array
 from decimal import Decimal
 
-from src.bot.convo_handlers.ManageBills.context import ManageBillsChatData
+from src.bot.convo_handlers.ManageBills.context import (
+    DEFAULT_MULTIPLIER,
+    ManageBillsChatData,
+)
 from src.lib.currencies.utils import get_shorthand_currency
 from src.lib.splizy_repo.model import ExpenseRow, PayeeData
 
 
 def build_payees(data: ManageBillsChatData) -> list[PayeeData]:
-    if data["split_type"] in ["equal_all", "equal_some"]:
+    if data.split_type in ["equal_all", "equal_some"]:
         involved = (
-            data["all_participants"]
-            if data["split_type"] == "equal_all"
-            else data["selected_participants"]
+            data.all_participants
+            if data.split_type == "equal_all"
+            else data.selected_participants
         )
         if not involved:
             return []
-        amount_per_pax = data["amount"] / len(involved)
+        amount_per_pax = data.amount / len(involved)
         return [
             {
                 "user": username,
                 "amount": float(amount_per_pax) if username in involved else 0,
             }
-            for username in data["all_participants"]
+            for username in data.all_participants
         ]
 
     # Custom split
-    has_mult = data.get("has_mult", False)
-    mult_val = Decimal(str(data.get("mult_val", 1))) if has_mult else Decimal("1")
+    mult_val = data.mult_val if data.has_mult else Decimal("1")
     payees: list[PayeeData] = []
     for idx, (username, amount) in enumerate(
-        zip(data["all_participants"], data["custom_amounts"])
+        zip(data.all_participants, data.custom_amounts)
     ):
         final_amount = Decimal(str(amount)) * mult_val
         payees.append(
             {
                 "user": username,
-                "amount": (
-                    float(final_amount) if data["participant_selections"][idx] else 0
-                ),
+                "amount": float(final_amount) if data.is_selected(idx) else 0,
             }
         )
     return payees
@@ -70,33 +71,33 @@ def populate_context_for_selected_expense_from_viewall(
     data: ManageBillsChatData, expense: ExpenseRow
 ):
     payees = expense["payees"]
-    participants = [entry["user"] for entry in payees]
-    amounts = [float(entry["amount"]) for entry in payees]
+    amounts = [Decimal(str(entry["amount"])) for entry in payees]
 
-    data["all_participants"] = participants
-    data["is_equal_split"] = expense["is_equal_split"]
+    data.all_participants = [entry["user"] for entry in payees]
     if expense["is_equal_split"]:
         is_all_involved = all([amount > 0 for amount in amounts])
-        data["split_type"] = "equal_all" if is_all_involved else "equal_some"
+        data.split_type = "equal_all" if is_all_involved else "equal_some"
     else:
-        data["split_type"] = "custom"
-    data["selected_participants"] = [
-        entry["user"] for entry in payees if float(entry["amount"]) > 0
-    ]
-    data["participant_selections"] = [float(entry["amount"]) > 0 for entry in payees]
-    data["custom_amounts"] = amounts
-    data["has_mult"] = expense.get("multiplier") is not None
-    data["mult_val"] = expense.get("multiplier")
+        data.split_type = "custom"
+    data.participant_selections = sum(
+        1 << index for index, amount in enumerate(amounts) if amount > 0
+    )
+    data.custom_amounts = array("d", [float(amount) for amount in amounts])
+    multiplier = expense.get("multiplier")
+    data.has_mult = multiplier is not None
+    data.mult_val = Decimal(multiplier) if multiplier else DEFAULT_MULTIPLIER
 
-    data["expense_id"] = expense["id"]
-    data["expense_name"] = expense["title"]
-    data["amount"] = Decimal(str(expense["amount"]))
-    data["paid_by"] = expense["paid_by"]
-    data["currency"] = expense["currency"]
-    data["receipt"] = expense["receipt"]
+    data.expense_id = expense["id"]
+    data.expense_name = expense["title"]
+    data.amount = Decimal(str(expense["amount"]))
+    data.paid_by = expense["paid_by"]
+    data.currency = expense["currency"]
+    data.receipt = expense["receipt"]
+    data.receipt_allocation = expense.get("receipt_allocation")
 
 
-def initialise_viewall_context(data: ManageBillsChatData, expenses):
-    data["expenses"] = expenses
-    data["viewall_page"] = 0
-    data["viewall_is_collapsed"] = False
+def initialise_viewall_context(data: ManageBillsChatData, query: str = ""):
+    # Opens on the totals header; rows are loaded once the user shows them
+    data.viewall_page = 0
+    data.viewall_is_collapsed = True
+    data.viewall_query = query
@@ -0,0 +1,286 @@
+"""
+Bulk import of expenses from a CSV or JSON document, see /import. Rows are read
+one at a time from the downloaded file, validated against the group's registered
+users and the known currency codes, and split with build_payees, the same rules
+as /add.
+"""
+
+import csv
+import io
+import json
+import re
+from array import array
+from collections.abc import Iterator, Mapping, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal, InvalidOperation
+from typing import IO, Any, NamedTuple
+
+from src.bot.convo_handlers.ManageBills.context import ManageBillsChatData
+from src.bot.convo_handlers.ManageBills.utils.general import build_payees
+from src.lib.currencies.config import get_all_currency_codes
+from src.lib.splizy_repo.model import ExpenseInsert, GroupId
+from src.lib.splizy_repo.utils import build_expense_payload
+
+IMPORT_MAX_BYTES = 5 * 1024 * 1024
+IMPORT_MAX_ROWS = 5000
+# Amounts are stored as floats: larger values lose cents, and past ~1e308 (eg.
+# "1e400", a finite Decimal) turn into inf
+IMPORT_MAX_AMOUNT = Decimal(10) ** 12
+IMPORT_REQUIRED_COLUMNS = ("title", "amount", "paid_by")
+IMPORT_FORMAT_HELP = (
+    "Send a .csv or .json file of expenses to import. Columns (JSON keys):\n"
+    "- title, amount, paid_by (required)\n"
+    "- currency: defaults to the group's expense currency\n"
+    "- split_with: empty splits equally among everyone, 'alice;bob' equally "
+    "among those users, 'alice:12.50;bob:7.50' by custom amounts\n"
+    "- date: eg. 2025-01-31, defaults to now\n"
+    "JSON files hold an array of objects, where split_with may also be a list of "
+    "usernames or an object of amounts. You'll get a dry run to check first."
+)
+
+_JSON_CHUNK_CHARS = 64 * 1024
+_JSON_SEPARATORS = " \t\r\n,"
+_SPLIT_SEPARATOR = re.compile(r"[;,\s]+")
+
+
+class ImportRowError(NamedTuple):
+    row: int
+    message: str
+
+
+@dataclass(slots=True)
+class ImportPlan:
+    """Validated rows of an import document; rows with errors are skipped."""
+
+    payloads: list[ExpenseInsert] = field(default_factory=list)
+    errors: list[ImportRowError] = field(default_factory=list)
+    totals: dict[str, Decimal] = field(default_factory=dict)
+    truncated: bool = False
+
+    @property
+    def rows_read(self) -> int:
+        return len(self.payloads) + len(self.errors)
+
+
+def _iter_csv_rows(stream: IO[bytes]) -> Iterator[tuple[int, dict[str, Any]]]:
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    reader = csv.DictReader(text)
+    if reader.fieldnames is None:
+        raise ValueError("The CSV file is empty.")
+    reader.fieldnames = [name.strip().lower() for name in reader.fieldnames]
+    missing = [
+        name for name in IMPORT_REQUIRED_COLUMNS if name not in reader.fieldnames
+    ]
+    if missing:
+        raise ValueError(f"The CSV header is missing: {', '.join(missing)}.")
+    try:
+        for record in reader:
+            # Numbered by line, as spreadsheets show them
+            yield reader.line_num, record
+    except csv.Error as e:
+        # eg. an unbalanced quote running into the field size limit
+        raise ValueError(
+            f"The CSV file is malformed after line {reader.line_num}: {e}."
+        ) from e
+
+
+def _iter_json_rows(stream: IO[bytes]) -> Iterator[tuple[int, Any]]:
+    """Items of a top-level JSON array, decoded as the file is read."""
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig")
+    decoder = json.JSONDecoder()
+    buffer, pos, row = "", 0, 0
+    started = False
+    for chunk in iter(lambda: text.read(_JSON_CHUNK_CHARS), ""):
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in _JSON_SEPARATORS:
+                pos += 1
+            if pos == len(buffer):
+                break
+            if not started:
+                if buffer[pos] != "[":
+                    raise ValueError("The JSON file must hold an array of expenses.")
+                started, pos = True, pos + 1
+                continue
+            if buffer[pos] == "]":
+                return
+            try:
+                item, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Item continues in the next chunk
+                break
+            row += 1
+            yield row, item
+    if buffer[pos:].strip():
+        try:
+            decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON after item {row}: {e.msg}.") from e
+    if started:
+        raise ValueError("The JSON file ends before its array is closed.")
+    raise ValueError("The JSON file must hold an array of expenses.")
+
+
+def _resolve_username(name: str, usernames: Mapping[str, str]) -> str:
+    username = usernames.get(name.strip().lstrip("@").lower())
+    if username is None:
+        raise ValueError(f"@{name.strip().lstrip('@')} is not registered in this group")
+    return username
+
+
+def _parse_decimal(value: Any, label: str) -> Decimal:
+    try:
+        amount = Decimal(str(value).strip())
+    except InvalidOperation:
+        raise ValueError(f"{label} '{value}' is not a number") from None
+    if not amount.is_finite() or amount < 0:
+        raise ValueError(f"{label} '{value}' must be a positive number")
+    if amount > IMPORT_MAX_AMOUNT:
+        raise ValueError(f"{label} '{value}' is too large")
+    return amount
+
+
+def _parse_split(split_with: Any) -> list[str] | dict[str, Any]:
+    """Usernames for an equal split, or username to amount for a custom one."""
+    if split_with is None or isinstance(split_with, (list, dict)):
+        return split_with or []
+    tokens = [token for token in _SPLIT_SEPARATOR.split(str(split_with)) if token]
+    if not any(":" in token for token in tokens):
+        return tokens
+    shares: dict[str, Any] = {}
+    for token in tokens:
+        name, separator, amount = token.partition(":")
+        if not separator:
+            raise ValueError(f"split_with mixes names and amounts at '{token}'")
+        shares[name] = amount
+    return shares
+
+
+def _split_state(
+    split_with: Any, amount: Decimal, usernames: Mapping[str, str]
+) -> ManageBillsChatData:
+    # The split as /add would leave it in chat_data, for build_payees
+    data = ManageBillsChatData(all_participants=list(usernames.values()))
+    data.amount = amount
+    split = _parse_split(split_with)
+    if not split:
+        data.split_type = "equal_all"
+        data.select_all()
+        return data
+
+    index_of = {username: index for index, username in enumerate(data.all_participants)}
+    if isinstance(split, list):
+        data.split_type = "equal_some"
+        data.participant_selections = 0
+        for name in split:
+            index = index_of[_resolve_username(str(name), usernames)]
+            data.participant_selections |= 1 << index
+        return data
+
+    data.split_type = "custom"
+    data.participant_selections = 0
+    data.custom_amounts = array("d", [0.0] * len(data.all_participants))
+    total = Decimal(0)
+    for name, share in split.items():
+        index = index_of[_resolve_username(str(name), usernames)]
+        share_amount = _parse_decimal(share, f"Share of @{name}")
+        data.participant_selections |= 1 << index
+        data.custom_amounts[index] = float(share_amount)
+        total += share_amount
+    if abs(total - amount) > Decimal("0.01"):
+        raise ValueError(f"custom shares add up to {total}, not the amount {amount}")
+    return data
+
+
+def _parse_date(value: Any) -> str | None:
+    if value in (None, ""):
+        return None
+    try:
+        created = datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError(f"date '{value}' is not an ISO date, eg. 2025-01-31") from None
+    if created.tzinfo is None:
+        created = created.replace(tzinfo=timezone.utc)
+    return _format_timestamp(created)
+
+
+def _format_timestamp(moment: datetime) -> str:
+    # UTC with milliseconds, like created_at defaults, so timestamps sort as text
+    return moment.astimezone(timezone.utc).isoformat(timespec="milliseconds")
+
+
+def _build_row(
+    record: Any,
+    group_id: GroupId,
+    usernames: Mapping[str, str],
+    default_currency: str,
+    imported_at: str,
+) -> ExpenseInsert:
+    if not isinstance(record, dict):
+        raise ValueError("expected an object with the expense's fields")
+    record = {str(key).strip().lower(): value for key, value in record.items()}
+    title = str(record.get("title") or "").strip()
+    if not title:
+        raise ValueError("title is empty")
+    if record.get("amount") in (None, ""):
+        raise ValueError("amount is empty")
+    amount = _parse_decimal(record["amount"], "amount")
+    if not amount:
+        raise ValueError("amount must be more than 0")
+    if not record.get("paid_by"):
+        raise ValueError("paid_by is empty")
+    paid_by = _resolve_username(str(record["paid_by"]), usernames)
+    currency = str(record.get("currency") or default_currency).strip().upper()
+    if currency not in get_all_currency_codes():
+        raise ValueError(f"unknown currency '{currency}'")
+
+    data = _split_state(record.get("split_with"), amount, usernames)
+    data.expense_name = title
+    data.paid_by = paid_by
+    data.currency = currency
+    payload = build_expense_payload(group_id, data.expense_fields(), build_payees(data))
+    payload["created_at"] = _parse_date(record.get("date")) or imported_at
+    return payload
+
+
+def plan_import(
+    stream: IO[bytes],
+    file_name: str,
+    group_id: GroupId,
+    usernames: Sequence[str],
+    default_currency: str,
+) -> ImportPlan:
+    """
+    Dry run of an import document. Raises ValueError when the file itself can't
+    be read; problems with single rows are collected in ImportPlan.errors.
+    """
+    if not usernames:
+        raise ValueError("No users registered in this group yet, run /register first.")
+    rows = _iter_json_rows if file_name.lower().endswith(".json") else _iter_csv_rows
+    # Usernames match case-insensitively, as on Telegram
+    registered = {username.lower(): username for username in usernames}
+    imported_at = datetime.now(timezone.utc)
+    plan = ImportPlan()
+    for row, record in rows(stream):
+        if plan.rows_read >= IMPORT_MAX_ROWS:
+            plan.truncated = True
+            break
+        # Undated rows are 1ms apart in file order, so they keep that order
+        row_imported_at = _format_timestamp(
+            imported_at + timedelta(milliseconds=plan.rows_read)
+        )
+        try:
+            payload = _build_row(
+                record, group_id, registered, default_currency, row_imported_at
+            )
+        except ValueError as e:
+            plan.errors.append(ImportRowError(row, str(e)))
+            continue
+        plan.payloads.append(payload)
+        currency = payload["currency"]
+        plan.totals[currency] = plan.totals.get(currency, Decimal(0)) + Decimal(
+            str(payload["amount"])
+        )
+    return plan
@@ -3,8 +3,15 @@ from decimal import Decimal, InvalidOperation
 from typing import Optional
 
 from src.bot.convo_utils.parsers import ParsedResult, parse_currency
+from src.lib.splizy_repo.model import ExpenseFilter
 
 AMOUNT_INPUT_PATTERN = re.compile(r"^(?:([A-Za-z]{3})\s*)?([^\s]+)$")
+AMOUNT_BOUND_PATTERN = re.compile(r"^(>=|<=|>|<)(\d+(?:\.\d+)?)$")
+AMOUNT_RANGE_PATTERN = re.compile(r"^(\d+(?:\.\d+)?)-(\d+(?:\.\d+)?)$")
+VIEW_FILTER_HELP = (
+    "Filter with eg. '/view @alice', '/view paid:@alice', '/view USD', "
+    "'/view hotpot', '/view >100' or '/view 20-50', combined as needed."
+)
 
 
 def parse_amount(input: str) -> ParsedResult[tuple[Optional[str], Decimal]]:
@@ -45,3 +52,45 @@ def parse_multiplier(input: str) -> ParsedResult[float]:
 
     except (TypeError, ValueError):
         return False, "Invalid input, please input a number between 1 and 2."
+
+
+def parse_view_filter(query: str) -> ParsedResult[ExpenseFilter | None]:
+    """
+    /view arguments as an ExpenseFilter, None when there are none. Tokens are
+    @user (paid or shares in), paid:@user, an uppercase currency code, an amount
+    bound (>100, <=50) or range (20-50); the remaining words search titles.
+    """
+    fields: dict = {}
+    title_words: list[str] = []
+    for token in query.split():
+        if token.startswith("@") and len(token) > 1:
+            # Usernames match case-insensitively, as on Telegram
+            fields["participant"] = token[1:].lower()
+        elif token.lower().startswith("paid:"):
+            username = token[5:].lstrip("@")
+            if not username:
+                return False, f"Could not read '{token}'. {VIEW_FILTER_HELP}"
+            fields["paid_by"] = username.lower()
+        elif (bound := AMOUNT_BOUND_PATTERN.match(token)) is not None:
+            operator, amount = bound.group(1), float(bound.group(2))
+            side = "min" if operator.startswith(">") else "max"
+            fields[f"{side}_amount"] = amount
+            fields[f"{side}_inclusive"] = operator.endswith("=")
+        elif (amount_range := AMOUNT_RANGE_PATTERN.match(token)) is not None:
+            low, high = sorted(float(amount) for amount in amount_range.groups())
+            fields.update(min_amount=low, max_amount=high)
+            fields.update(min_inclusive=True, max_inclusive=True)
+        elif (
+            len(token) == 3
+            and token.isupper()
+            and parse_currency(token) == (True, token)
+        ):
+            # Uppercase codes only, so words like "tea" or "cup" search titles
+            fields["currency"] = token
+        elif token.startswith(("@", ">", "<")):
+            return False, f"Could not read '{token}'. {VIEW_FILTER_HELP}"
+        else:
+            title_words.append(token)
+    if title_words:
+        fields["title"] = " ".join(title_words)
+    return True, ExpenseFilter(**fields) if fields else None
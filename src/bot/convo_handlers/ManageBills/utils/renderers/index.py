@@ -1,24 +1,32 @@
+from datetime import datetime
 from decimal import Decimal
 
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
+from telegram.constants import BulkRequestLimit
 from telegram.error import BadRequest
 from telegram.ext import ContextTypes
 
 from config import MINIAPP_URL
 from src.bot.convo_handlers.ManageBills.callbacks import (
+    CUSTOM_AMOUNT,
+    CUSTOM_DONE,
+    CUSTOM_TOGGLE,
     DELETE_EXPENSE,
     EDIT_EXPENSE,
     GO_BACK,
     HIDE_RECEIPT,
+    MULT_AMOUNT,
+    MULT_TOGGLE,
     SHOW_RECEIPT,
     VIEW_ALL_ENTRIES,
     VIEW_PAGE_NEXT,
     VIEW_PAGE_PREV,
-    VIEW_SELECT_PREFIX,
+    VIEW_SELECT,
     VIEW_TOGGLE_HIDE,
     VIEW_TOGGLE_SHOW,
 )
 from src.bot.convo_handlers.ManageBills.context import ManageBillsChatData
+from src.bot.convo_handlers.ManageBills.utils.parsers import parse_view_filter
 from src.bot.convo_handlers.ManageBills.utils.renderers.bill_summary import (
     get_bill_summary,
     get_bill_summary_with_receipt,
@@ -26,10 +34,13 @@ from src.bot.convo_handlers.ManageBills.utils.renderers.bill_summary import (
 from src.bot.convo_utils.formatters import get_2dp_str, truncate_label
 from src.bot.convo_utils.pagination import get_page_window
 from src.lib.currencies.utils import get_shorthand_currency
+from src.lib.splizy_repo.model import ExpenseSummary
+from src.lib.splizy_repo.repo import repo
+from src.lib.splizy_repo.service import get_receipt_allocation
 
 MAX_TELEGRAM_TEXT_LEN = 3800
-RECEIPT_DETAIL_MESSAGE_IDS_KEY = "receipt_detail_message_ids"
 VIEWALL_PAGE_SIZE = 10
+VIEWALL_TOP_PAYERS = 3
 
 
 def get_view_all_entries_markup() -> InlineKeyboardMarkup:
@@ -37,7 +48,7 @@ def get_view_all_entries_markup() -> InlineKeyboardMarkup:
         [
             [
                 InlineKeyboardButton(
-                    "View all entries so far", callback_data=VIEW_ALL_ENTRIES
+                    "View all entries so far", callback_data=VIEW_ALL_ENTRIES()
                 )
             ]
         ]
@@ -77,25 +88,30 @@ def _chunk_text_by_blocks(text: str, max_len: int = MAX_TELEGRAM_TEXT_LEN) -> li
 async def _delete_receipt_detail_messages(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ) -> None:
-    message_ids = context.chat_data.get(RECEIPT_DETAIL_MESSAGE_IDS_KEY, [])
+    data: ManageBillsChatData = context.chat_data.manage_bills
+    message_ids = data.receipt_detail_message_ids
     if not message_ids:
         return
 
     chat_id = update.effective_chat.id
-    for message_id in message_ids:
+    # One request per 100 messages; ones already deleted are skipped by Telegram
+    for start in range(0, len(message_ids), BulkRequestLimit.MAX_LIMIT):
         try:
-            await context.bot.delete_message(chat_id=chat_id, message_id=message_id)
+            await context.bot.delete_messages(
+                chat_id=chat_id,
+                message_ids=message_ids[start : start + BulkRequestLimit.MAX_LIMIT],
+            )
         except BadRequest:
-            # Ignore messages that are already deleted or no longer deletable.
+            # Ignore messages that are no longer deletable.
             continue
 
-    context.chat_data[RECEIPT_DETAIL_MESSAGE_IDS_KEY] = []
+    data.receipt_detail_message_ids = []
 
 
 async def send_confirmation_form(
     update: Update, context: ContextTypes.DEFAULT_TYPE, is_new_msg=True
 ):
-    summary = get_bill_summary(context.chat_data)
+    summary = get_bill_summary(context.chat_data.manage_bills)
     keyboard = [
         [
             InlineKeyboardButton("Bill name", callback_data="edit_expense_name"),
@@ -120,18 +136,19 @@ async def send_confirmation_form(
 async def send_select_user(
     update: Update, context: ContextTypes.DEFAULT_TYPE, new_msg=True
 ):
+    data: ManageBillsChatData = context.chat_data.manage_bills
     keyboard = []
-    for username in context.chat_data["all_participants"]:
+    for username in data.all_participants:
         keyboard.append([InlineKeyboardButton(username, callback_data=username)])
     reply_markup = InlineKeyboardMarkup(keyboard)
     if new_msg:
         await update.message.reply_text(
-            f"Who paid for this expense of {context.chat_data['currency']} {context.chat_data['amount']}?",
+            f"Who paid for this expense of {data.currency} {data.amount}?",
             reply_markup=reply_markup,
         )
     else:
         await update.callback_query.edit_message_text(
-            f"Who paid for this expense of {context.chat_data['currency']} {context.chat_data['amount']}?",
+            f"Who paid for this expense of {data.currency} {data.amount}?",
             reply_markup=reply_markup,
         )
 
@@ -139,14 +156,10 @@ async def send_select_user(
 async def send_multiselect_users(
     update: Update, context: ContextTypes.DEFAULT_TYPE, validation_error=None
 ):
+    data: ManageBillsChatData = context.chat_data.manage_bills
     keyboard = []
-    for idx, (is_selected, username) in enumerate(
-        zip(
-            context.chat_data["participant_selections"],
-            context.chat_data["all_participants"],
-        )
-    ):
-        prefix = "✅" if is_selected else "❌"
+    for idx, username in enumerate(data.all_participants):
+        prefix = "✅" if data.is_selected(idx) else "❌"
         keyboard.append(
             [InlineKeyboardButton(f"{prefix} @{username}", callback_data=idx)]
         )
@@ -166,21 +179,18 @@ async def send_custom_multiselect_users(
     is_new_msg=False,
     validation_error=None,
 ):
-    data: ManageBillsChatData = context.chat_data
+    data: ManageBillsChatData = context.chat_data.manage_bills
     keyboard = []
-    for idx, (is_selected, username, amount) in enumerate(
-        zip(
-            data["participant_selections"],
-            data["all_participants"],
-            data["custom_amounts"],
-        )
-    ):
+    for idx, username in enumerate(data.all_participants):
+        is_selected = data.is_selected(idx)
         prefix = "✅" if is_selected else "❌"
         toggle_button = InlineKeyboardButton(
-            f"{prefix} @{username}", callback_data=f"{idx}_toggle"
+            f"{prefix} @{username}", callback_data=CUSTOM_TOGGLE(idx)
         )
         amount_button = (
-            InlineKeyboardButton(get_2dp_str(amount), callback_data=f"{idx}_amount")
+            InlineKeyboardButton(
+                get_2dp_str(data.custom_amount(idx)), callback_data=CUSTOM_AMOUNT(idx)
+            )
             if is_selected
             else None
         )
@@ -188,30 +198,33 @@ async def send_custom_multiselect_users(
             [toggle_button, amount_button] if is_selected else [toggle_button]
         )
 
-    has_mult, mult_val = data["has_mult"], data["mult_val"]
+    has_mult, mult_val = data.has_mult, data.mult_val
     mult_toggle_button = InlineKeyboardButton(
         "Tap to remove multiplier:" if has_mult else "Tap to add multiplier",
-        callback_data="mult_toggle",
+        callback_data=MULT_TOGGLE(),
     )
     mult_amount_button = (
-        InlineKeyboardButton(mult_val, callback_data="mult_amount")
+        InlineKeyboardButton(str(mult_val), callback_data=MULT_AMOUNT())
         if has_mult
         else None
     )
     keyboard.append(
         [mult_toggle_button, mult_amount_button] if has_mult else [mult_toggle_button]
     )
-    keyboard.append([InlineKeyboardButton("Done", callback_data="custom_done")])
+    keyboard.append([InlineKeyboardButton("Done", callback_data=CUSTOM_DONE())])
     reply_markup = InlineKeyboardMarkup(keyboard)
 
     subtotal = sum(
-        amount
-        for idx, amount in enumerate(data["custom_amounts"])
-        if data["participant_selections"][idx]
+        (
+            data.custom_amount(idx)
+            for idx in range(len(data.custom_amounts))
+            if data.is_selected(idx)
+        ),
+        Decimal(0),
     )
     text = (
-        f"👥 Select participants and specify the custom amount paid in {data['currency']}.\n"
-        f"Current total = {data['currency']} {get_2dp_str(subtotal)}{f' (*{mult_val} = {get_2dp_str(subtotal*Decimal(mult_val))})' if has_mult else ''}\n\n"
+        f"👥 Select participants and specify the custom amount paid in {data.currency}.\n"
+        f"Current total = {data.currency} {get_2dp_str(subtotal)}{f' (*{mult_val} = {get_2dp_str(subtotal*mult_val)})' if has_mult else ''}\n\n"
         "Tap on the left to toggle selection, and on the right to specify the amount. "
         "You can also specify the service charge multiplier at the bottom, eg 1.19.\n\n"
         "NOTE: current total will override initial total if they don't tally.\n"
@@ -227,63 +240,101 @@ async def send_custom_multiselect_users(
         )
 
 
+def _format_created_at(created_at: str) -> str:
+    try:
+        created = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+    except ValueError:
+        return created_at
+    return created.strftime("%d %b %Y %H:%M UTC")
+
+
+def format_expense_summary(summary: ExpenseSummary) -> str:
+    count = summary.expense_count
+    lines = [f"{count} expense{'s' if count > 1 else ''} so far"]
+    if summary.last_created_at:
+        lines[0] += f", last added {_format_created_at(summary.last_created_at)}"
+    for item in summary.currencies:
+        symbol = get_shorthand_currency(item.currency)
+        payers = ", ".join(
+            f"@{username} {symbol}{amount:.2f}"
+            for username, amount in item.payers[:VIEWALL_TOP_PAYERS]
+        )
+        lines.append(f"Total {symbol}{item.total:.2f}, top payers: {payers}")
+    return "\n".join(lines)
+
+
 async def send_all_expenses(
-    update: Update, context: ContextTypes.DEFAULT_TYPE, is_new_msg=True
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    is_new_msg=True,
+    summary: ExpenseSummary | None = None,
 ):
+    """
+    The /view message: a totals header, plus one page of expense rows when shown.
+    Both are queried on each render, so edits and deletes are reflected on return.
+    """
     await _delete_receipt_detail_messages(update, context)
 
-    data: ManageBillsChatData = context.chat_data
-    expenses = data["expenses"]
-    total_expenses = len(expenses)
+    data: ManageBillsChatData = context.chat_data.manage_bills
+    group_id = update.effective_chat.id
+    # The query was validated by /view
+    _, criteria = parse_view_filter(data.viewall_query)
+    if summary is None:
+        summary = repo.summarize_expenses(group_id, criteria)
     current_page, total_pages, start_idx, end_idx = get_page_window(
-        total_items=total_expenses,
+        total_items=summary.expense_count,
         page_size=VIEWALL_PAGE_SIZE,
-        requested_page=int(data.get("viewall_page", 0)),
+        requested_page=data.viewall_page,
     )
-    data["viewall_page"] = current_page
-    is_collapsed = bool(data.get("viewall_is_collapsed", False))
+    data.viewall_page = current_page
+    is_collapsed = data.viewall_is_collapsed
 
     keyboard = []
 
-    if not is_collapsed:
-        for idx in range(start_idx, end_idx):
-            expense = expenses[idx]
-            title_label = truncate_label(expense["title"], width=18)
-            payer_label = truncate_label(f"@{expense['paid_by']}", width=7)
+    if not is_collapsed and end_idx > start_idx:
+        expenses = repo.list_expenses_page(
+            group_id, start_idx, end_idx - start_idx, criteria
+        )
+        for expense in expenses:
+            title_label = truncate_label(expense.title, width=18)
+            payer_label = truncate_label(f"@{expense.paid_by}", width=7)
             keyboard.append(
                 [
                     InlineKeyboardButton(
                         (
                             f"{title_label} | "
                             f"{payer_label} | "
-                            f"{get_shorthand_currency(expense['currency'])}{expense['amount']:.2f}"
+                            f"{get_shorthand_currency(expense.currency)}{expense.amount:.2f}"
                         ),
-                        callback_data=f"{VIEW_SELECT_PREFIX}{idx}",
+                        callback_data=VIEW_SELECT(expense.id),
                     )
                 ]
             )
         nav_row = []
         if current_page > 0:
             nav_row.append(
-                InlineKeyboardButton("<- Prev page", callback_data=VIEW_PAGE_PREV)
+                InlineKeyboardButton("<- Prev page", callback_data=VIEW_PAGE_PREV())
             )
         if current_page < total_pages - 1:
             nav_row.append(
-                InlineKeyboardButton("Next page ->", callback_data=VIEW_PAGE_NEXT)
+                InlineKeyboardButton("Next page ->", callback_data=VIEW_PAGE_NEXT())
             )
         if nav_row:
             keyboard.append(nav_row)
 
     toggle_label = "Show entries" if is_collapsed else "Hide entries"
-    toggle_callback = VIEW_TOGGLE_SHOW if is_collapsed else VIEW_TOGGLE_HIDE
-    keyboard.append([InlineKeyboardButton(toggle_label, callback_data=toggle_callback)])
+    toggle_op = VIEW_TOGGLE_SHOW if is_collapsed else VIEW_TOGGLE_HIDE
+    keyboard.append([InlineKeyboardButton(toggle_label, callback_data=toggle_op())])
 
     reply_markup = InlineKeyboardMarkup(keyboard)
-    total_expenses_text = (
-        f"{total_expenses} expense{'s' if total_expenses > 1 else ''} so far"
-    )
-    page_text = f"(Page {current_page + 1}/{total_pages})" if total_pages > 1 else ""
-    text = f"{total_expenses_text} {page_text}\n" "Format: (title | payer | amount)\n"
+    text = format_expense_summary(summary)
+    if data.viewall_query:
+        text = f"Filter: {data.viewall_query}\n{text}"
+    if not is_collapsed:
+        page_text = (
+            f" (Page {current_page + 1}/{total_pages})" if total_pages > 1 else ""
+        )
+        text += f"\n\nFormat: (title | payer | amount){page_text}\n"
 
     if is_new_msg:
         await update.message.reply_text(text, reply_markup=reply_markup)
@@ -326,20 +377,26 @@ async def send_expense_view(
 ):
     await _delete_receipt_detail_messages(update, context)
 
-    summary = get_bill_summary(context.chat_data)
-    has_receipt = context.chat_data["receipt"] is not None
+    data: ManageBillsChatData = context.chat_data.manage_bills
+    summary = get_bill_summary(data)
+    has_receipt = data.receipt is not None
+    expense_id = data.expense_id
     text = summary if not remarks else f"{summary}\n{remarks}"
     keyboard = [
         [
-            InlineKeyboardButton("Edit", callback_data=EDIT_EXPENSE),
-            InlineKeyboardButton("Delete", callback_data=DELETE_EXPENSE),
+            InlineKeyboardButton("Edit", callback_data=EDIT_EXPENSE(expense_id)),
+            InlineKeyboardButton("Delete", callback_data=DELETE_EXPENSE(expense_id)),
         ]
     ]
     if has_receipt:
         keyboard.append(
-            [InlineKeyboardButton("Show receipt details", callback_data=SHOW_RECEIPT)]
+            [
+                InlineKeyboardButton(
+                    "Show receipt details", callback_data=SHOW_RECEIPT(expense_id)
+                )
+            ]
         )
-    keyboard.append([InlineKeyboardButton("Go back", callback_data=GO_BACK)])
+    keyboard.append([InlineKeyboardButton("Go back", callback_data=GO_BACK())])
 
     reply_markup = InlineKeyboardMarkup(keyboard)
     await update.callback_query.edit_message_text(text, reply_markup=reply_markup)
@@ -350,17 +407,29 @@ async def send_expense_with_receipt_view(
 ):
     await _delete_receipt_detail_messages(update, context)
 
-    summary = get_bill_summary_with_receipt(context.chat_data)
+    data: ManageBillsChatData = context.chat_data.manage_bills
+    data.receipt_allocation = get_receipt_allocation(
+        data.expense_id,
+        data.receipt,
+        data.all_participants,
+        data.receipt_allocation,
+    )
+    summary = get_bill_summary_with_receipt(data)
+    expense_id = data.expense_id
     chunks = _chunk_text_by_blocks(summary)
     first_text = chunks[0] if not remarks else f"{chunks[0]}\n{remarks}"
 
     keyboard = [
         [
-            InlineKeyboardButton("Edit", callback_data=EDIT_EXPENSE),
-            InlineKeyboardButton("Delete", callback_data=DELETE_EXPENSE),
+            InlineKeyboardButton("Edit", callback_data=EDIT_EXPENSE(expense_id)),
+            InlineKeyboardButton("Delete", callback_data=DELETE_EXPENSE(expense_id)),
+        ],
+        [
+            InlineKeyboardButton(
+                "Hide receipt details", callback_data=HIDE_RECEIPT(expense_id)
+            )
         ],
-        [InlineKeyboardButton("Hide receipt details", callback_data=HIDE_RECEIPT)],
-        [InlineKeyboardButton("Go back", callback_data=GO_BACK)],
+        [InlineKeyboardButton("Go back", callback_data=GO_BACK())],
     ]
     reply_markup = InlineKeyboardMarkup(keyboard)
     await update.callback_query.edit_message_text(first_text, reply_markup=reply_markup)
@@ -372,4 +441,4 @@ async def send_expense_with_receipt_view(
         )
         detail_message_ids.append(sent.message_id)
 
-    context.chat_data[RECEIPT_DETAIL_MESSAGE_IDS_KEY] = detail_message_ids
+    data.receipt_detail_message_ids = detail_message_ids
@@ -1,3 +1,5 @@
+from dataclasses import dataclass, field
+
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.ext import (
     CallbackQueryHandler,
@@ -10,9 +12,25 @@ from telegram.ext import (
 
 from src.bot.convo_handlers.Base import BaseConversation
 from src.bot.convo_utils.wrappers import group_only
+from src.lib.splizy_repo.model import GroupId
 from src.lib.splizy_repo.repo import repo
 
 
+@dataclass(slots=True)
+class RegisterUsersChatData:
+    group_id: GroupId | None = None
+    pending_usernames: list[str] = field(default_factory=list)
+    # /register_manual deletion
+    manual_delete_group_id: GroupId | None = None
+    manual_delete_usernames: list[str] = field(default_factory=list)
+    manual_delete_selected: list[str] = field(default_factory=list)
+
+    def clear_manual_delete(self) -> None:
+        self.manual_delete_group_id = None
+        self.manual_delete_usernames = []
+        self.manual_delete_selected = []
+
+
 class RegisterUsers(BaseConversation):
     REGISTER_USERS = 0
     CONFIRM_USERS = 1
@@ -85,7 +103,7 @@ async def register_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -
             "If there are any new members, make sure to assign them as admins and tap on Try Again.",
             reply_markup=InlineKeyboardMarkup(keyboard),
         )
-        context.chat_data["group_id"] = group_id
+        context.chat_data.register_users.group_id = group_id
         return RegisterUsers.CONFIRM_USERS
 
     # Fetch all group admins
@@ -109,12 +127,12 @@ async def register_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -
             "No user handles detected. Ensure that they have been set as admins, then tap on Try Again.",
             reply_markup=InlineKeyboardMarkup(keyboard),
         )
-        context.chat_data["group_id"] = group_id
+        context.chat_data.register_users.group_id = group_id
         return RegisterUsers.CONFIRM_USERS
 
     # Store for later confirmation
-    context.chat_data["pending_usernames"] = sorted(usernames)
-    context.chat_data["group_id"] = group_id
+    context.chat_data.register_users.pending_usernames = sorted(usernames)
+    context.chat_data.register_users.group_id = group_id
 
     # Show confirmation message
     await _show_admin_users_confirmation(update, usernames)
@@ -152,8 +170,9 @@ async def confirm_admin_users(
     query = update.callback_query
     await query.answer()
 
-    usernames = context.chat_data.get("pending_usernames", [])
-    group_id = context.chat_data.get("group_id")
+    data: RegisterUsersChatData = context.chat_data.register_users
+    usernames = data.pending_usernames
+    group_id = data.group_id
 
     if not usernames or not group_id:
         await query.edit_message_text("Session expired. Please run /register again.")
@@ -184,8 +203,8 @@ async def confirm_admin_users(
     await query.edit_message_text(msg)
 
     # Clean up user data
-    context.chat_data.pop("pending_usernames", None)
-    context.chat_data.pop("group_id", None)
+    data.pending_usernames = []
+    data.group_id = None
 
     return ConversationHandler.END
 
@@ -195,7 +214,7 @@ async def retry_admin_users(update: Update, context: ContextTypes.DEFAULT_TYPE)
     query = update.callback_query
     await query.answer()
 
-    group_id = context.chat_data.get("group_id")
+    group_id = context.chat_data.register_users.group_id
 
     if not group_id:
         await query.edit_message_text("Session expired. Please run /register again.")
@@ -223,7 +242,7 @@ async def retry_admin_users(update: Update, context: ContextTypes.DEFAULT_TYPE)
         )
         return RegisterUsers.CONFIRM_USERS
 
-    context.chat_data["pending_usernames"] = sorted(usernames)
+    context.chat_data.register_users.pending_usernames = sorted(usernames)
     await _show_admin_users_confirmation(update, usernames)
     return RegisterUsers.CONFIRM_USERS
 
@@ -290,6 +309,17 @@ def _render_manual_delete_users_keyboard(
     return InlineKeyboardMarkup(keyboard)
 
 
+def _split_deletable_usernames(
+    group_id: int, usernames: list[str]
+) -> tuple[list[str], list[str]]:
+    """Split usernames into (deletable, blocked); blocked users are involved in
+    existing expenses as payer or payee."""
+    involvements = repo.count_user_involvements(group_id, usernames)
+    allowed = sorted([username for username in usernames if not involvements[username]])
+    blocked = sorted([username for username in usernames if involvements[username]])
+    return allowed, blocked
+
+
 async def begin_manual_delete_users(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ) -> int:
@@ -307,9 +337,10 @@ async def begin_manual_delete_users(
         )
         return ConversationHandler.END
 
-    context.chat_data["manual_delete_group_id"] = group_id
-    context.chat_data["manual_delete_usernames"] = usernames
-    context.chat_data["manual_delete_selected"] = []
+    data: RegisterUsersChatData = context.chat_data.register_users
+    data.manual_delete_group_id = group_id
+    data.manual_delete_usernames = usernames
+    data.manual_delete_selected = []
 
     await query.edit_message_text(
         "Select users to delete, then tap Done to confirm.",
@@ -327,8 +358,9 @@ async def toggle_manual_delete_user(
     action = query.data or ""
     username = action.replace(RegisterUsers.DELETE_USERS_TOGGLE_PREFIX, "", 1)
 
-    usernames = context.chat_data.get("manual_delete_usernames", [])
-    selected = set(context.chat_data.get("manual_delete_selected", []))
+    data: RegisterUsersChatData = context.chat_data.register_users
+    usernames = data.manual_delete_usernames
+    selected = set(data.manual_delete_selected)
 
     if username not in usernames:
         await query.edit_message_text(
@@ -341,7 +373,7 @@ async def toggle_manual_delete_user(
     else:
         selected.add(username)
 
-    context.chat_data["manual_delete_selected"] = sorted(selected)
+    data.manual_delete_selected = sorted(selected)
     await query.edit_message_text(
         "Select users to delete, then tap Done to confirm.",
         reply_markup=_render_manual_delete_users_keyboard(usernames, selected),
@@ -355,9 +387,10 @@ async def confirm_manual_delete_users(
     query = update.callback_query
     await query.answer()
 
-    group_id = context.chat_data.get("manual_delete_group_id")
-    selected = sorted(context.chat_data.get("manual_delete_selected", []))
-    usernames = context.chat_data.get("manual_delete_usernames", [])
+    data: RegisterUsersChatData = context.chat_data.register_users
+    group_id = data.manual_delete_group_id
+    selected = sorted(data.manual_delete_selected)
+    usernames = data.manual_delete_usernames
 
     if group_id is None or not usernames:
         await query.edit_message_text(
@@ -372,29 +405,12 @@ async def confirm_manual_delete_users(
         )
         return RegisterUsers.DELETE_USERS
 
-    expenses = repo.list_expenses(group_id)
-    locked_users: set[str] = set()
-    for expense in expenses:
-        paid_by = expense.get("paid_by")
-        if paid_by:
-            locked_users.add(str(paid_by))
-
-        for payee in expense.get("payees") or []:
-            payee_user = payee.get("user")
-            if payee_user:
-                locked_users.add(str(payee_user))
-
-    blocked = sorted([username for username in selected if username in locked_users])
-    allowed = sorted(
-        [username for username in selected if username not in locked_users]
-    )
+    allowed, blocked = _split_deletable_usernames(group_id, selected)
 
     if allowed:
         repo.delete_group_users(group_id, allowed)
 
-    context.chat_data.pop("manual_delete_group_id", None)
-    context.chat_data.pop("manual_delete_usernames", None)
-    context.chat_data.pop("manual_delete_selected", None)
+    data.clear_manual_delete()
 
     messages: list[str] = []
     if allowed:
@@ -418,9 +434,7 @@ async def back_manual_delete_users(
     query = update.callback_query
     await query.answer()
 
-    context.chat_data.pop("manual_delete_group_id", None)
-    context.chat_data.pop("manual_delete_usernames", None)
-    context.chat_data.pop("manual_delete_selected", None)
+    context.chat_data.register_users.clear_manual_delete()
 
     await query.edit_message_text("Delete users cancelled.")
     return ConversationHandler.END
@@ -483,23 +497,8 @@ async def register_users(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     blocked_delete_usernames: list[str] = []
     allowed_delete_usernames: list[str] = []
     if delete_usernames:
-        expenses = repo.list_expenses(group_id)
-        locked_users: set[str] = set()
-        for expense in expenses:
-            paid_by = expense.get("paid_by")
-            if paid_by:
-                locked_users.add(str(paid_by))
-
-            for payee in expense.get("payees") or []:
-                payee_user = payee.get("user")
-                if payee_user:
-                    locked_users.add(str(payee_user))
-
-        blocked_delete_usernames = sorted(
-            [username for username in delete_usernames if username in locked_users]
-        )
-        allowed_delete_usernames = sorted(
-            [username for username in delete_usernames if username not in locked_users]
+        allowed_delete_usernames, blocked_delete_usernames = _split_deletable_usernames(
+            group_id, delete_usernames
         )
 
         if allowed_delete_usernames:
@@ -1,15 +1,17 @@
 from __future__ import annotations
 
-from typing import Final, Literal, TypeAlias
+from typing import Final, Literal, TypeAlias, get_args
+
+from src.bot.convo_utils.callback_data import CURRENCY_CODE, ArgType, CallbackOp
 
 CurrencyTargetField: TypeAlias = Literal["expense_currency", "settleup_currency"]
 
-EDIT_EXPENSE_CURRENCY: Final = "edit_expense_currency"
-EDIT_SETTLEUP_CURRENCY: Final = "edit_settleup_currency"
-CURRENCY_BACK: Final = "currency_back"
+# Packed as the field's index in CurrencyTargetField
+_TARGET_FIELDS: tuple[CurrencyTargetField, ...] = get_args(CurrencyTargetField)
+TARGET_FIELD = ArgType("B", _TARGET_FIELDS.index, _TARGET_FIELDS.__getitem__)
 
-ACTION_PATTERN: Final = (
-    r"^(edit_expense_currency|edit_settleup_currency|currency_back|"
-    r"currency_custom:(expense_currency|settleup_currency)|"
-    r"currency_set:(expense_currency|settleup_currency):[A-Za-z]{3})$"
-)
+EDIT_EXPENSE_CURRENCY: Final = CallbackOp("Q", "edit_expense_currency")
+EDIT_SETTLEUP_CURRENCY: Final = CallbackOp("R", "edit_settleup_currency")
+CURRENCY_BACK: Final = CallbackOp("S", "currency_back")
+CURRENCY_CUSTOM: Final = CallbackOp("T", "currency_custom", TARGET_FIELD)
+CURRENCY_SET: Final = CallbackOp("U", "currency_set", TARGET_FIELD, CURRENCY_CODE)
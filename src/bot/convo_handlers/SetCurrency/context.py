@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-from typing import TypedDict
+from dataclasses import dataclass
 
 from src.bot.convo_handlers.SetCurrency.callbacks import CurrencyTargetField
 from src.lib.splizy_repo.model import GroupRow
 
 
-class SetCurrencyChatData(TypedDict, total=False):
-    group: GroupRow
-    currency_target_field: CurrencyTargetField
+@dataclass(slots=True)
+class SetCurrencyChatData:
+    group: GroupRow | None = None
+    currency_target_field: CurrencyTargetField | None = None
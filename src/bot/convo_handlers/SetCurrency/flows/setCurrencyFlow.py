@@ -3,6 +3,8 @@ from telegram.ext import ContextTypes, ConversationHandler
 
 from src.bot.convo_handlers.SetCurrency.callbacks import (
     CURRENCY_BACK,
+    CURRENCY_CUSTOM,
+    CURRENCY_SET,
     EDIT_EXPENSE_CURRENCY,
     EDIT_SETTLEUP_CURRENCY,
     CurrencyTargetField,
@@ -14,9 +16,10 @@ from src.bot.convo_handlers.SetCurrency.utils.renderers import (
     send_current_currencies_for_query,
     send_select_currency,
 )
+from src.bot.convo_utils.callback_data import CallbackRoutes
 from src.bot.convo_utils.parsers import parse_currency
 from src.bot.convo_utils.wrappers import group_only
-from src.lib.currencies.config import ALL_CURRENCY_CODES
+from src.lib.currencies.config import get_all_currency_codes
 from src.lib.splizy_repo.repo import repo
 
 VALID_TARGET_FIELDS: frozenset[CurrencyTargetField] = frozenset(
@@ -34,90 +37,119 @@ def _target_label(field: str) -> str:
 async def set_currencies_command(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ) -> int:
-    data: SetCurrencyChatData = context.chat_data
+    data: SetCurrencyChatData = context.chat_data.set_currency
     group_id = update.message.chat.id
     group = repo.get_group(group_id)
-    data["group"] = group
+    data.group = group
     await send_current_currencies(update, context)
     return SetCurrencyStates.SELECT_CURRENCY
 
 
 async def select_currency(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    data: SetCurrencyChatData = context.chat_data
-    query = update.callback_query
-    await query.answer()
-    action = query.data or ""
-
-    if action in {EDIT_EXPENSE_CURRENCY, EDIT_SETTLEUP_CURRENCY}:
-        target_field = (
-            "expense_currency"
-            if action == EDIT_EXPENSE_CURRENCY
-            else "settleup_currency"
-        )
-        data["currency_target_field"] = target_field
-        await send_select_currency(
-            query,
-            f"Select a default {_target_label(target_field)} currency, or input another currency if not found.",
-            target_field,
-        )
-        return SetCurrencyStates.SELECT_CURRENCY
+    await update.callback_query.answer()
+    state = await SELECT_CURRENCY_ROUTES.dispatch(update, context, None)
+    if state is None:
+        await update.callback_query.edit_message_text("Unknown action.")
+        return ConversationHandler.END
+    return state
 
-    if action == CURRENCY_BACK:
-        group = data.get("group")
-        if group is None:
-            await query.edit_message_text(
-                "No group context found. Please try /set_currencies again."
-            )
-            return ConversationHandler.END
-        await send_current_currencies_for_query(query, group)
-        return SetCurrencyStates.SELECT_CURRENCY
 
-    if action.startswith("currency_custom:"):
-        _, target_field = action.split(":", 1)
-        if target_field not in VALID_TARGET_FIELDS:
-            await query.edit_message_text("Invalid currency selection action.")
-            return ConversationHandler.END
+async def _edit_target_currency(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    target_field: CurrencyTargetField,
+) -> int:
+    data: SetCurrencyChatData = context.chat_data.set_currency
+    data.currency_target_field = target_field
+    await send_select_currency(
+        update.callback_query,
+        f"Select a default {_target_label(target_field)} currency, or input another currency if not found.",
+        target_field,
+    )
+    return SetCurrencyStates.SELECT_CURRENCY
+
 
-        data["currency_target_field"] = target_field
+async def _edit_expense_currency(
+    update: Update, context: ContextTypes.DEFAULT_TYPE
+) -> int:
+    return await _edit_target_currency(update, context, "expense_currency")
+
+
+async def _edit_settleup_currency(
+    update: Update, context: ContextTypes.DEFAULT_TYPE
+) -> int:
+    return await _edit_target_currency(update, context, "settleup_currency")
+
+
+async def _currency_back(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    data: SetCurrencyChatData = context.chat_data.set_currency
+    query = update.callback_query
+    group = data.group
+    if group is None:
         await query.edit_message_text(
-            f"Type a 3-letter currency code for {_target_label(target_field)}. Example: USD"
+            "No group context found. Please try /set_currencies again."
         )
-        return SetCurrencyStates.SET_CUSTOM_CURRENCY
+        return ConversationHandler.END
+    await send_current_currencies_for_query(query, group)
+    return SetCurrencyStates.SELECT_CURRENCY
 
-    if action.startswith("currency_set:"):
-        _, target_field, currency_code = action.split(":", 2)
-        currency_code = currency_code.strip().upper()
-        if target_field not in VALID_TARGET_FIELDS:
-            await query.edit_message_text("Invalid currency selection action.")
-            return ConversationHandler.END
-        if currency_code not in ALL_CURRENCY_CODES:
-            await query.edit_message_text("Currency code may be out of scope")
-            return SetCurrencyStates.SELECT_CURRENCY
-
-        group_id = update.effective_chat.id
-        repo.update_group(group_id, {target_field: currency_code})
-        updated_group = repo.get_group(group_id)
-        if updated_group is None:
-            await query.edit_message_text("Failed to update group currency settings.")
-            return ConversationHandler.END
-
-        data["group"] = updated_group
-        await send_current_currencies_for_query(
-            query,
-            updated_group,
-            f"Updated {_target_label(target_field)} currency to {currency_code}",
-        )
+
+async def _currency_custom(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    target_field: CurrencyTargetField,
+) -> int:
+    data: SetCurrencyChatData = context.chat_data.set_currency
+    data.currency_target_field = target_field
+    await update.callback_query.edit_message_text(
+        f"Type a 3-letter currency code for {_target_label(target_field)}. Example: USD"
+    )
+    return SetCurrencyStates.SET_CUSTOM_CURRENCY
+
+
+async def _currency_set(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    target_field: CurrencyTargetField,
+    currency_code: str,
+) -> int:
+    data: SetCurrencyChatData = context.chat_data.set_currency
+    query = update.callback_query
+    if currency_code not in get_all_currency_codes():
+        await query.edit_message_text("Currency code may be out of scope")
         return SetCurrencyStates.SELECT_CURRENCY
 
-    await query.edit_message_text("Unknown action.")
-    return ConversationHandler.END
+    group_id = update.effective_chat.id
+    updated_group = repo.update_group(group_id, {target_field: currency_code})
+    if updated_group is None:
+        await query.edit_message_text("Failed to update group currency settings.")
+        return ConversationHandler.END
+
+    data.group = updated_group
+    await send_current_currencies_for_query(
+        query,
+        updated_group,
+        f"Updated {_target_label(target_field)} currency to {currency_code}",
+    )
+    return SetCurrencyStates.SELECT_CURRENCY
+
+
+SELECT_CURRENCY_ROUTES = CallbackRoutes(
+    {
+        EDIT_EXPENSE_CURRENCY: _edit_expense_currency,
+        EDIT_SETTLEUP_CURRENCY: _edit_settleup_currency,
+        CURRENCY_BACK: _currency_back,
+        CURRENCY_CUSTOM: _currency_custom,
+        CURRENCY_SET: _currency_set,
+    }
+)
 
 
 async def set_custom_currency(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ) -> int:
-    data: SetCurrencyChatData = context.chat_data
-    target_field = data.get("currency_target_field")
+    data: SetCurrencyChatData = context.chat_data.set_currency
+    target_field = data.currency_target_field
     if target_field not in VALID_TARGET_FIELDS:
         await update.message.reply_text(
             "No currency target selected. Please try /set_currencies again."
@@ -131,13 +163,12 @@ async def set_custom_currency(
 
     currency_code = parsed
     group_id = update.effective_chat.id
-    repo.update_group(group_id, {target_field: currency_code})
-    updated_group = repo.get_group(group_id)
+    updated_group = repo.update_group(group_id, {target_field: currency_code})
     if updated_group is None:
         await update.message.reply_text("Failed to update group currency settings.")
         return ConversationHandler.END
 
-    data["group"] = updated_group
+    data.group = updated_group
     await send_current_currencies(
         update,
         context,
@@ -1,8 +1,8 @@
 from telegram.ext import CallbackQueryHandler, CommandHandler, MessageHandler, filters
 
 from src.bot.convo_handlers.Base import BaseConversation
-from src.bot.convo_handlers.SetCurrency.callbacks import ACTION_PATTERN
 from src.bot.convo_handlers.SetCurrency.flows.setCurrencyFlow import (
+    SELECT_CURRENCY_ROUTES,
     select_currency,
     set_currencies_command,
     set_custom_currency,
@@ -11,6 +11,8 @@ from src.bot.convo_handlers.SetCurrency.states import SetCurrencyStates as State
 
 
 class SetCurrency(BaseConversation):
+    state_class = States
+
     def setup_handlers(self):
         self.entry_points = [
             (CommandHandler("set_currencies", set_currencies_command)),
@@ -19,7 +21,7 @@ class SetCurrency(BaseConversation):
             States.SELECT_CURRENCY: [
                 CallbackQueryHandler(
                     select_currency,
-                    pattern=ACTION_PATTERN,
+                    pattern=SELECT_CURRENCY_ROUTES.matches,
                 )
             ],
             States.SET_CUSTOM_CURRENCY: [
@@ -3,11 +3,13 @@ from telegram.ext import ContextTypes
 
 from src.bot.convo_handlers.SetCurrency.callbacks import (
     CURRENCY_BACK,
+    CURRENCY_CUSTOM,
+    CURRENCY_SET,
     EDIT_EXPENSE_CURRENCY,
     EDIT_SETTLEUP_CURRENCY,
 )
 from src.bot.convo_handlers.SetCurrency.context import SetCurrencyChatData
-from src.lib.currencies.config import ALL_CURRENCY_CODES, COMMON_CURRENCY_CODES
+from src.lib.currencies.config import get_all_currency_codes, get_common_currency_codes
 from src.lib.currencies.utils import build_exchange_rate_line
 from src.lib.splizy_repo.model import GroupRow
 
@@ -17,8 +19,9 @@ def _build_current_currencies_payload(
 ) -> tuple[str, InlineKeyboardMarkup]:
     expense_currency = (group.get("expense_currency") or "SGD").upper()
     settleup_currency = (group.get("settleup_currency") or "SGD").upper()
-    expense_desc = ALL_CURRENCY_CODES.get(expense_currency, expense_currency)
-    settleup_desc = ALL_CURRENCY_CODES.get(settleup_currency, settleup_currency)
+    all_currency_codes = get_all_currency_codes()
+    expense_desc = all_currency_codes.get(expense_currency, expense_currency)
+    settleup_desc = all_currency_codes.get(settleup_currency, settleup_currency)
     rate_line = build_exchange_rate_line(settleup_currency, expense_currency)
 
     text = (
@@ -31,12 +34,12 @@ def _build_current_currencies_payload(
     keyboard = [
         [
             InlineKeyboardButton(
-                "Edit expenses currency", callback_data=EDIT_EXPENSE_CURRENCY
+                "Edit expenses currency", callback_data=EDIT_EXPENSE_CURRENCY()
             )
         ],
         [
             InlineKeyboardButton(
-                "Edit settleup currency", callback_data=EDIT_SETTLEUP_CURRENCY
+                "Edit settleup currency", callback_data=EDIT_SETTLEUP_CURRENCY()
             ),
         ],
     ]
@@ -46,8 +49,8 @@ def _build_current_currencies_payload(
 async def send_current_currencies(
     update: Update, context: ContextTypes.DEFAULT_TYPE, remarks=None
 ):
-    data: SetCurrencyChatData = context.chat_data
-    group: GroupRow = data["group"]
+    data: SetCurrencyChatData = context.chat_data.set_currency
+    group: GroupRow = data.group
     text, reply_markup = _build_current_currencies_payload(group)
     if remarks:
         text = f"({remarks})\n\n" + text
@@ -65,12 +68,12 @@ async def send_current_currencies_for_query(
 
 async def send_select_currency(query: CallbackQuery, text: str, target_field: str):
     keyboard = []
-    for code, info in COMMON_CURRENCY_CODES.items():
+    for code, info in get_common_currency_codes().items():
         keyboard.append(
             [
                 InlineKeyboardButton(
                     f"{code} ({info})",
-                    callback_data=f"currency_set:{target_field}:{code}",
+                    callback_data=CURRENCY_SET(target_field, code),
                 )
             ]
         )
@@ -78,10 +81,10 @@ async def send_select_currency(query: CallbackQuery, text: str, target_field: st
         [
             InlineKeyboardButton(
                 f"Input another currency",
-                callback_data=f"currency_custom:{target_field}",
+                callback_data=CURRENCY_CUSTOM(target_field),
             )
         ]
     )
-    keyboard.append([InlineKeyboardButton("Go back", callback_data=CURRENCY_BACK)])
+    keyboard.append([InlineKeyboardButton("Go back", callback_data=CURRENCY_BACK())])
     reply_markup = InlineKeyboardMarkup(keyboard)
     await query.edit_message_text(text, reply_markup=reply_markup)
@@ -1,6 +1,7 @@
 from datetime import datetime, timezone
 
 from telegram import Update
+from telegram.constants import MessageLimit
 from telegram.ext import ContextTypes, ConversationHandler
 
 from src.bot.convo_handlers.Settleup.utils.general import (
@@ -8,7 +9,11 @@ from src.bot.convo_handlers.Settleup.utils.general import (
     get_suggested_payments,
 )
 from src.bot.convo_handlers.Settleup.utils.renderers import send_stats_table
-from src.bot.convo_handlers.Settleup.utils.reports import send_settleup_reports
+from src.bot.convo_handlers.Settleup.utils.reports import (
+    send_settleup_reports,
+    spool_settleup_csv,
+    spool_settleup_pdf,
+)
 from src.bot.convo_utils.wrappers import group_only
 from src.lib.currencies.service import refresh_exchange_rates_if_stale
 from src.lib.splizy_repo.repo import repo
@@ -18,15 +23,20 @@ from src.lib.splizy_repo.repo import repo
 async def settleup_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     refresh_exchange_rates_if_stale()
     group_id = update.message.chat.id
-    all_expenses = repo.list_expenses(group_id)
-    settleup_currency = repo.get_group(group_id).get("settleup_currency", "SGD")
-    stats, suggested_payments = get_suggested_payments(all_expenses, settleup_currency)
+    balances = repo.aggregate_balances(group_id)
+    settleup_currency = repo.get_group(group_id).get("settleup_currency") or "SGD"
+    stats, suggested_payments = get_suggested_payments(balances, settleup_currency)
     exchange_rates_summary = build_exchange_rate_summary_for_settleup(
-        all_expenses, settleup_currency
+        balances, settleup_currency
     )
 
-    await update.message.reply_text(f"{exchange_rates_summary}\n\n{suggested_payments}")
-    await send_stats_table(update, context, stats)
+    summary = f"{exchange_rates_summary}\n\n{suggested_payments}"
+    # Attach the summary to the stats image when it fits, saving a message
+    if len(summary) <= MessageLimit.CAPTION_LENGTH:
+        await send_stats_table(update, context, stats, caption=summary)
+    else:
+        await update.message.reply_text(summary)
+        await send_stats_table(update, context, stats)
     return ConversationHandler.END
 
 
@@ -37,14 +47,18 @@ async def settleup_report_command(
     report_generated_at = datetime.now(timezone.utc)
     refresh_exchange_rates_if_stale()
     group_id = update.message.chat.id
-    all_expenses = repo.list_expenses(group_id)
-    settleup_currency = repo.get_group(group_id).get("settleup_currency", "SGD")
-
-    await send_settleup_reports(
-        update,
-        context,
-        all_expenses,
-        settleup_currency,
-        report_generated_at=report_generated_at,
-    )
+    # /settleup_report gzip sends the CSV gzipped, for very long histories
+    compress = any(arg.lower() in ("gz", "gzip") for arg in context.args or [])
+    balances = repo.aggregate_balances(group_id)
+    settleup_currency = repo.get_group(group_id).get("settleup_currency") or "SGD"
+
+    # Each report pages through the history once, see repo.iter_expenses
+    with spool_settleup_csv(
+        repo.iter_expenses(group_id), balances, settleup_currency, compress=compress
+    ) as csv_file, spool_settleup_pdf(
+        repo.iter_expenses(group_id), balances, settleup_currency, report_generated_at
+    ) as pdf_file:
+        await send_settleup_reports(
+            update, context, csv_file, pdf_file, compress=compress
+        )
     return ConversationHandler.END
@@ -6,7 +6,7 @@ from src.lib.currencies.utils import (
     convert,
     get_shorthand_currency,
 )
-from src.lib.splizy_repo.model import CurrencyCode, ExpenseRow
+from src.lib.splizy_repo.model import BalanceRow, CurrencyCode, ExpenseSettleupRow
 
 AMOUNT_CUTOFF = 0.01
 
@@ -40,21 +40,59 @@ def _get_suggested_payments_str(payments: Payments, settleup_currency) -> str:
     return res[0] + "\n" + "\n\n".join(res[1:])
 
 
-def get_settleup_details(
-    all_expenses: list[ExpenseRow], settleup_currency: str
-) -> tuple[SettleupStats, Payments]:
-    # Populate payer and payee maps
-    payer_amounts = defaultdict(float)
-    payee_amounts = defaultdict(float)
+def _accumulate_expenses(
+    all_expenses: list[ExpenseSettleupRow], settleup_currency: str
+) -> tuple[defaultdict[str, float], defaultdict[str, float]]:
+    payer_amounts: defaultdict[str, float] = defaultdict(float)
+    payee_amounts: defaultdict[str, float] = defaultdict(float)
     for expense in all_expenses:
-        currency = expense["currency"]
-        payer_amounts[expense["paid_by"]] += convert(
-            expense["amount"], currency, settleup_currency
+        currency = expense.currency
+        payer_amounts[expense.paid_by] += convert(
+            expense.amount, currency, settleup_currency
         )
-        for payee in expense["payees"]:
-            payee_amounts[payee["user"]] += convert(
-                payee["amount"], currency, settleup_currency
+        for payee in expense.payees:
+            payee_amounts[payee.user] += convert(
+                payee.amount, currency, settleup_currency
             )
+    return payer_amounts, payee_amounts
+
+
+def _accumulate_balances(
+    balances: list[BalanceRow], settleup_currency: str
+) -> tuple[defaultdict[str, float], defaultdict[str, float]]:
+    payer_amounts: defaultdict[str, float] = defaultdict(float)
+    payee_amounts: defaultdict[str, float] = defaultdict(float)
+    for balance in balances:
+        currency = balance["currency"]
+        if balance["paid"]:
+            payer_amounts[balance["username"]] += convert(
+                balance["paid"], currency, settleup_currency
+            )
+        payee_amounts[balance["username"]] += convert(
+            balance["owed"], currency, settleup_currency
+        )
+    return payer_amounts, payee_amounts
+
+
+def get_settleup_details(
+    all_expenses: list[ExpenseSettleupRow], settleup_currency: str
+) -> tuple[SettleupStats, Payments]:
+    payer_amounts, payee_amounts = _accumulate_expenses(all_expenses, settleup_currency)
+    return _settle(payer_amounts, payee_amounts, settleup_currency)
+
+
+def get_settleup_details_from_balances(
+    balances: list[BalanceRow], settleup_currency: str
+) -> tuple[SettleupStats, Payments]:
+    payer_amounts, payee_amounts = _accumulate_balances(balances, settleup_currency)
+    return _settle(payer_amounts, payee_amounts, settleup_currency)
+
+
+def _settle(
+    payer_amounts: defaultdict[str, float],
+    payee_amounts: defaultdict[str, float],
+    settleup_currency: str,
+) -> tuple[SettleupStats, Payments]:
     stats: SettleupStats = {
         "currency": settleup_currency,
         "total_spending": sum([paid for _, paid in payer_amounts.items()]),
@@ -112,15 +150,15 @@ def get_settleup_details(
 
 
 def get_suggested_payments(
-    all_expenses: list[ExpenseRow], settleup_currency: str
+    balances: list[BalanceRow], settleup_currency: str
 ) -> tuple[SettleupStats, str]:
-    stats, payments = get_settleup_details(all_expenses, settleup_currency)
+    stats, payments = get_settleup_details_from_balances(balances, settleup_currency)
 
     return (stats, _get_suggested_payments_str(payments, settleup_currency))
 
 
 def build_exchange_rate_summary_for_settleup(
-    all_expenses: list[ExpenseRow], settleup_currency: str
+    balances: list[BalanceRow], settleup_currency: str
 ) -> str:
-    involved_currencies = [expense["currency"] for expense in all_expenses]
+    involved_currencies = [balance["currency"] for balance in balances]
     return build_exchange_rate_summary(involved_currencies, settleup_currency)
@@ -0,0 +1,263 @@
+"""
+A small PDF writer for text reports: pages of text in the standard Helvetica
+fonts, straight rules and filled rectangles, nothing else. Every page is written
+to the output as soon as it is finished, so a long report never sits in memory.
+
+The standard fonts need no embedding but only cover Windows-1252; other
+characters are written as "?".
+"""
+
+import zlib
+from collections.abc import Sequence
+from typing import IO, NamedTuple
+
+# Advance widths of Helvetica for " " to "~", in 1/1000 of the font size
+_HELVETICA_WIDTHS = (
+    (278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278)
+    + (556,) * 10
+    + (278, 278, 584, 584, 584, 556, 1015)
+    + (667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833)
+    + (722, 778, 667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611)
+    + (278, 278, 278, 469, 556, 333)
+    + (556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833)
+    + (556, 556, 556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500)
+    + (334, 260, 334, 584)
+)
+_DEFAULT_WIDTH = 556
+# Helvetica-Bold is measured as Helvetica plus this margin, which only matters
+# for truncation
+_BOLD_WIDTH_FACTOR = 1.1
+
+_FONTS = {False: b"/F1", True: b"/F2"}
+
+
+class Color(NamedTuple):
+    red: float
+    green: float
+    blue: float
+
+    @classmethod
+    def from_hex(cls, value: str) -> "Color":
+        value = value.lstrip("#")
+        return cls(*(int(value[i : i + 2], 16) / 255 for i in (0, 2, 4)))
+
+    def operands(self) -> bytes:
+        return b" ".join(_number(channel) for channel in self)
+
+
+BLACK = Color(0.0, 0.0, 0.0)
+
+
+def _number(value: float) -> bytes:
+    return (b"%.2f" % value).rstrip(b"0").rstrip(b".") or b"0"
+
+
+def _encode(text: str) -> bytes:
+    raw = text.encode("cp1252", errors="replace")
+    return (
+        raw.replace(b"\\", b"\\\\")
+        .replace(b"(", b"\\(")
+        .replace(b")", b"\\)")
+        .replace(b"\r", b" ")
+        .replace(b"\n", b" ")
+    )
+
+
+def text_width(text: str, size: float, bold: bool = False) -> float:
+    units = sum(
+        (_HELVETICA_WIDTHS[ord(char) - 32] if " " <= char <= "~" else _DEFAULT_WIDTH)
+        for char in text
+    )
+    return units * size / 1000 * (_BOLD_WIDTH_FACTOR if bold else 1.0)
+
+
+def truncate(text: str, width: float, size: float, bold: bool = False) -> str:
+    """`text`, cut short with "..." so it fits in `width` points."""
+    if text_width(text, size, bold) <= width:
+        return text
+    ellipsis = "..."
+    while text and text_width(text + ellipsis, size, bold) > width:
+        text = text[:-1]
+    return text.rstrip() + ellipsis if text else ""
+
+
+class PdfPage:
+    """Drawing operations of one page, with the origin at the top left corner."""
+
+    def __init__(self, width: float, height: float) -> None:
+        self.width = width
+        self.height = height
+        self._ops: list[bytes] = []
+
+    def text(
+        self,
+        x: float,
+        y: float,
+        text: str,
+        size: float,
+        bold: bool = False,
+        color: Color = BLACK,
+    ) -> None:
+        """Draw `text` with its baseline at y."""
+        self._ops.append(
+            b"BT %s rg %s %s Tf %s %s Td (%s) Tj ET"
+            % (
+                color.operands(),
+                _FONTS[bold],
+                _number(size),
+                _number(x),
+                _number(self.height - y),
+                _encode(text),
+            )
+        )
+
+    def text_right(
+        self,
+        right: float,
+        y: float,
+        text: str,
+        size: float,
+        bold: bool = False,
+        color: Color = BLACK,
+    ) -> None:
+        self.text(right - text_width(text, size, bold), y, text, size, bold, color)
+
+    def rule(
+        self, x1: float, x2: float, y: float, width: float, color: Color = BLACK
+    ) -> None:
+        """Draw a horizontal line from x1 to x2."""
+        self._ops.append(
+            b"%s RG %s w %s %s m %s %s l S"
+            % (
+                color.operands(),
+                _number(width),
+                _number(x1),
+                _number(self.height - y),
+                _number(x2),
+                _number(self.height - y),
+            )
+        )
+
+    def fill_rect(
+        self, x: float, y: float, width: float, height: float, color: Color
+    ) -> None:
+        """Fill a rectangle whose top left corner is at (x, y)."""
+        self._ops.append(
+            b"%s rg %s %s %s %s re f"
+            % (
+                color.operands(),
+                _number(x),
+                _number(self.height - y - height),
+                _number(width),
+                _number(height),
+            )
+        )
+
+    def content(self) -> bytes:
+        return b"\n".join(self._ops)
+
+
+class PdfWriter:
+    """
+    Writes a PDF to a binary stream: add_page for each finished page, then close.
+    Objects are written as they are made and only their offsets are kept, for
+    the cross-reference table at the end.
+    """
+
+    _CATALOG = 1
+    _PAGES = 2
+
+    def __init__(
+        self, output: IO[bytes], page_size: Sequence[float], title: str = ""
+    ) -> None:
+        self.page_width, self.page_height = page_size
+        self._output = output
+        self._position = 0
+        self._offsets: dict[int, int] = {}
+        self._next_id = self._PAGES + 1
+        self._page_ids: list[int] = []
+        self._title = title
+
+        # The binary comment marks the file as binary for transfer tools
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self._fonts = {
+            bold: self._add_object(
+                b"<< /Type /Font /Subtype /Type1 /BaseFont /%s "
+                b"/Encoding /WinAnsiEncoding >>"
+                % (b"Helvetica-Bold" if bold else b"Helvetica")
+            )
+            for bold in (False, True)
+        }
+
+    @property
+    def page_count(self) -> int:
+        return len(self._page_ids)
+
+    def new_page(self) -> PdfPage:
+        return PdfPage(self.page_width, self.page_height)
+
+    def add_page(self, page: PdfPage) -> None:
+        content = zlib.compress(page.content())
+        content_id = self._add_object(
+            b"<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream"
+            % (len(content), content)
+        )
+        fonts = b" ".join(
+            b"%s %d 0 R" % (_FONTS[bold], font_id)
+            for bold, font_id in self._fonts.items()
+        )
+        self._page_ids.append(
+            self._add_object(
+                b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %s %s] "
+                b"/Resources << /Font << %s >> >> /Contents %d 0 R >>"
+                % (
+                    self._PAGES,
+                    _number(self.page_width),
+                    _number(self.page_height),
+                    fonts,
+                    content_id,
+                )
+            )
+        )
+
+    def close(self) -> None:
+        """Write the page tree, catalog and trailer. The output is left open."""
+        kids = b" ".join(b"%d 0 R" % page_id for page_id in self._page_ids)
+        self._write_object(
+            self._PAGES,
+            b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(self._page_ids)),
+        )
+        self._write_object(
+            self._CATALOG, b"<< /Type /Catalog /Pages %d 0 R >>" % self._PAGES
+        )
+        info_id = self._add_object(
+            b"<< /Title (%s) /Producer (splizy) >>" % _encode(self._title)
+        )
+
+        xref_offset = self._position
+        object_count = self._next_id
+        lines = [b"xref", b"0 %d" % object_count, b"0000000000 65535 f "]
+        lines += [
+            b"%010d 00000 n " % self._offsets[object_id]
+            for object_id in range(1, object_count)
+        ]
+        self._write(b"\n".join(lines) + b"\n")
+        self._write(
+            b"trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\n"
+            b"startxref\n%d\n%%%%EOF\n"
+            % (object_count, self._CATALOG, info_id, xref_offset)
+        )
+
+    def _add_object(self, body: bytes) -> int:
+        object_id = self._next_id
+        self._next_id += 1
+        self._write_object(object_id, body)
+        return object_id
+
+    def _write_object(self, object_id: int, body: bytes) -> None:
+        self._offsets[object_id] = self._position
+        self._write(b"%d 0 obj\n%s\nendobj\n" % (object_id, body))
+
+    def _write(self, data: bytes) -> None:
+        self._output.write(data)
+        self._position += len(data)
@@ -0,0 +1,14 @@
+from functools import cache
+from types import ModuleType
+
+
+@cache
+def get_pyplot() -> ModuleType:
+    # matplotlib is only needed for /settleup renders, so it is imported on first
+    # use instead of at bot startup.
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    return plt
@@ -1,24 +1,56 @@
 import csv
+import gzip
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from io import BytesIO, StringIO
+from io import TextIOWrapper
+from itertools import islice
+from tempfile import SpooledTemporaryFile
+from typing import IO
 
-import matplotlib
-from telegram import Update
+from telegram import InputFile, InputMediaDocument, Update
 from telegram.error import BadRequest
 from telegram.ext import ContextTypes
 
-from src.bot.convo_handlers.Settleup.utils.general import get_settleup_details
+from src.bot.convo_handlers.Settleup.utils.general import (
+    get_settleup_details_from_balances,
+)
+from src.bot.convo_handlers.Settleup.utils.pdf import (
+    BLACK,
+    Color,
+    PdfPage,
+    PdfWriter,
+    truncate,
+)
 from src.bot.convo_utils.telegram import get_message_thread_id
-from src.lib.currencies.config import ALL_CURRENCY_CODES
+from src.lib.currencies.config import get_all_currency_codes
 from src.lib.currencies.utils import (
     convert,
     get_shorthand_currency,
     read_cached_exchange_rates,
 )
-from src.lib.splizy_repo.model import ExpenseRow
-
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
+from src.lib.metrics import timed_phase
+from src.lib.splizy_repo.model import BalanceRow, ExpenseSettleupRow
+
+CSV_FILENAME = "settleup_breakdown.csv"
+PDF_FILENAME = "settleup_breakdown.pdf"
+# Exports up to this size stay in memory, larger ones spill to a temp file
+CSV_SPOOL_BYTES = 1024 * 1024
+PDF_SPOOL_BYTES = 1024 * 1024
+
+# PDF layout, in points: A4 landscape, one label column then a column per user
+PDF_PAGE_SIZE = (842.0, 595.0)
+PDF_MARGIN = 36.0
+PDF_HEADING_SIZE = 11.0
+PDF_FONT_SIZE = 8.0
+PDF_ROW_HEIGHT = 13.0
+PDF_LABEL_WIDTH = 180.0
+PDF_AMOUNT_WIDTH = 66.0
+RED = Color.from_hex("#C62828")  # Negative (paid/owed)
+GREEN = Color.from_hex("#2E7D32")  # Positive (received/credit)
+GREY = Color.from_hex("#EEEEEE")
+RULE_GREY = Color.from_hex("#9E9E9E")
 
 
 def _fmt_signed_raw(amount: float) -> str:
@@ -28,51 +60,95 @@ def _fmt_signed_raw(amount: float) -> str:
     return f"{sign}{abs(amount):.2f}"
 
 
-def _get_users(all_expenses: list[ExpenseRow]) -> list[str]:
-    users = set()
-    for expense in all_expenses:
-        users.add(expense["paid_by"])
-        for payee in expense["payees"]:
-            users.add(payee["user"])
-    return sorted(users, key=str.lower)
-
-
-def _sorted_expenses_chronological(all_expenses: list[ExpenseRow]) -> list[ExpenseRow]:
-    return sorted(all_expenses, key=lambda expense: expense.get("created_at", ""))
-
-
-def _compute_per_expense_rows(
-    all_expenses: list[ExpenseRow], settleup_currency: str, users: list[str]
-) -> list[tuple[str, dict[str, float]]]:
-    per_expense_rows: list[tuple[str, dict[str, float]]] = []
-
-    for expense in _sorted_expenses_chronological(all_expenses):
-        row = {u: 0.0 for u in users}
-        currency = expense["currency"]
-
-        paid_amount = convert(expense["amount"], currency, settleup_currency)
-        row[expense["paid_by"]] -= paid_amount  # Payer starts with deficit
-
-        for payee in expense["payees"]:
-            row[payee["user"]] += convert(
-                payee["amount"], currency, settleup_currency
-            )  # Payee owes positive
+def _sorted_expenses_chronological(
+    all_expenses: list[ExpenseSettleupRow],
+) -> list[ExpenseSettleupRow]:
+    return sorted(all_expenses, key=lambda expense: expense.created_at)
+
+
+def _compute_expense_row(
+    expense: ExpenseSettleupRow, settleup_currency: str, users: list[str]
+) -> tuple[str, dict[str, float]] | None:
+    """The expense's label and amount per user; None if it involves other users."""
+    row = {u: 0.0 for u in users}
+    if expense.paid_by not in row or any(
+        payee.user not in row for payee in expense.payees
+    ):
+        return None
+    currency = expense.currency
+
+    paid_amount = convert(expense.amount, currency, settleup_currency)
+    row[expense.paid_by] -= paid_amount  # Payer starts with deficit
+
+    for payee in expense.payees:
+        row[payee.user] += convert(
+            payee.amount, currency, settleup_currency
+        )  # Payee owes positive
+
+    title = (expense.title or "").strip()
+    return title or expense.id or "untitled_expense", row
+
+
+@dataclass(slots=True)
+class _Breakdown:
+    """
+    Expense rows of a report and the net balances they add up to. The user
+    columns come from balances read before the expenses, so an expense saved in
+    between may involve a user without a column: it is left out and counted.
+    """
+
+    users: list[str]
+    settleup_currency: str
+    net: dict[str, float] = field(init=False)
+    skipped: int = 0
+
+    def __post_init__(self) -> None:
+        self.net = {u: 0.0 for u in self.users}
+
+    def rows(
+        self, expenses: Iterable[ExpenseSettleupRow]
+    ) -> Iterator[tuple[str, dict[str, float]]]:
+        for expense in expenses:
+            expense_row = _compute_expense_row(
+                expense, self.settleup_currency, self.users
+            )
+            if expense_row is None:
+                self.skipped += 1
+                continue
+            for user, amount in expense_row[1].items():
+                self.net[user] += amount
+            yield expense_row
+
+    def note(self) -> str | None:
+        if not self.skipped:
+            return None
+        return (
+            f"{self.skipped} expense(s) saved while this report was generated "
+            "are not included"
+        )
 
-        title = (expense.get("title") or "").strip()
-        row_label = title or expense.get("id") or "untitled_expense"
-        per_expense_rows.append((row_label, row))
 
-    return per_expense_rows
+def _balances_from_expenses(all_expenses: list[ExpenseSettleupRow]) -> list[BalanceRow]:
+    # The in-memory equivalent of repo.aggregate_balances
+    totals: defaultdict[tuple[str, str], list[float]] = defaultdict(lambda: [0.0, 0.0])
+    for expense in all_expenses:
+        totals[(expense.paid_by, expense.currency)][0] += expense.amount
+        for payee in expense.payees:
+            totals[(payee.user, expense.currency)][1] += payee.amount
+    return [
+        {"username": username, "currency": currency, "paid": paid, "owed": owed}
+        for (username, currency), (paid, owed) in totals.items()
+    ]
 
 
 def _build_metadata_lines(
-    all_expenses: list[ExpenseRow],
+    currencies: Iterable[str],
     settleup_currency: str,
     report_generated_at: datetime,
 ) -> list[str]:
     settle_currency = settleup_currency.upper()
     settle_shorthand = get_shorthand_currency(settle_currency)
-    settle_desc = ALL_CURRENCY_CODES.get(settle_currency, settle_currency)
+    settle_desc = get_all_currency_codes().get(settle_currency, settle_currency)
 
     lines = [
         f"All amounts are in {settle_currency}, {settle_shorthand} ({settle_desc}).",
@@ -96,9 +172,9 @@ def _build_metadata_lines(
 
     involved_currencies = sorted(
         {
-            expense["currency"].upper()
-            for expense in all_expenses
-            if expense["currency"].upper() != settle_currency
+            currency.upper()
+            for currency in currencies
+            if currency.upper() != settle_currency
         }
     )
 
@@ -138,68 +214,39 @@ def _build_transfer_matrix(
     return transfer_rows
 
 
-def _build_report_parts(
-    all_expenses: list[ExpenseRow],
-    settleup_currency: str,
-    report_generated_at: datetime,
-) -> tuple[
-    list[str],
-    list[str],
-    list[list[str]],
-    dict[str, float],
-    list[tuple[str, dict[str, float]]],
-]:
-    users = _get_users(all_expenses)
-    per_expense_rows = _compute_per_expense_rows(all_expenses, settleup_currency, users)
+def _build_balance_parts(
+    balances: list[BalanceRow], settleup_currency: str
+) -> tuple[list[str], list[tuple[str, dict[str, float]]]]:
+    """Users and suggested transfer rows, from balance totals."""
+    users = sorted({balance["username"] for balance in balances}, key=str.lower)
+    _, payments = get_settleup_details_from_balances(balances, settleup_currency)
+    return users, _build_transfer_matrix(payments, users)
 
-    metadata_lines = _build_metadata_lines(
-        all_expenses, settleup_currency, report_generated_at
-    )
-    headers = ["expense", *users]
-    rows: list[list[str]] = []
-    for label, row in per_expense_rows:
-        rows.append([label, *[_fmt_signed_raw(row[u]) for u in users]])
-
-    # Compute net balances before settleup (sum across all expenses)
-    before_balances: dict[str, float] = {u: 0.0 for u in users}
-    for _, expense_row in per_expense_rows:
-        for user in users:
-            before_balances[user] += expense_row[user]
-
-    # Get suggested transfers in matrix format
-    stats, payments = get_settleup_details(all_expenses, settleup_currency)
-    transfer_rows = _build_transfer_matrix(payments, users)
-
-    return metadata_lines, headers, rows, before_balances, transfer_rows
 
-
-def build_settleup_csv(
-    all_expenses: list[ExpenseRow],
+def _write_settleup_csv(
+    output: IO[str],
+    expenses: Iterable[ExpenseSettleupRow],
+    balances: list[BalanceRow],
     settleup_currency: str,
-    report_generated_at: datetime | None = None,
-) -> bytes:
-    generated_at = report_generated_at or datetime.now(timezone.utc)
-    metadata_lines, headers, rows, before_balances, transfer_rows = _build_report_parts(
-        all_expenses, settleup_currency, generated_at
-    )
-    users = list(before_balances.keys())
+) -> None:
+    users, transfer_rows = _build_balance_parts(balances, settleup_currency)
+    breakdown = _Breakdown(users, settleup_currency)
+    headers = ["expense", *users]
 
-    output = StringIO()
     writer = csv.writer(output)
     writer.writerow(["settleup_currency", settleup_currency])
     writer.writerow([])
 
-    # Expense breakdown
+    # Expense breakdown, one row at a time as expenses arrive
     writer.writerow(headers)
-    for row in rows:
-        writer.writerow(row)
+    for label, row in breakdown.rows(expenses):
+        writer.writerow([label, *[_fmt_signed_raw(row[u]) for u in users]])
 
     # Settle-up logic
     writer.writerow([])
     writer.writerow(["BEFORE SETTLEUP"])
     writer.writerow(headers)
-    before_row = [u for u in users]
-    writer.writerow(["net", *[_fmt_signed_raw(before_balances[u]) for u in users]])
+    writer.writerow(["net", *[_fmt_signed_raw(breakdown.net[u]) for u in users]])
 
     writer.writerow([])
     writer.writerow(["SUGGESTED TRANSFERS"])
@@ -212,120 +259,256 @@ def build_settleup_csv(
     writer.writerow(headers)
     writer.writerow(["net", *["0.00" for _ in users]])
 
-    return output.getvalue().encode("utf-8")
+    note = breakdown.note()
+    if note:
+        writer.writerow([])
+        writer.writerow(["note", note])
 
 
-def build_settleup_pdf(
-    all_expenses: list[ExpenseRow],
+def spool_settleup_csv(
+    expenses: Iterable[ExpenseSettleupRow],
+    balances: list[BalanceRow],
+    settleup_currency: str,
+    compress: bool = False,
+) -> SpooledTemporaryFile:
+    """
+    Write the settle-up CSV into a spooled temp file, rewound and ready to upload.
+    Expenses are consumed as an iterable in chronological order, eg.
+    repo.iter_expenses, and `balances` (from repo.aggregate_balances) give the
+    user columns up front, so memory stays bounded however long the history.
+    With `compress`, the file is gzipped.
+    """
+    spool = SpooledTemporaryFile(max_size=CSV_SPOOL_BYTES)
+    try:
+        # mtime=0 keeps the archive the same for the same report
+        binary = gzip.GzipFile(fileobj=spool, mode="wb", mtime=0) if compress else spool
+        text = TextIOWrapper(binary, encoding="utf-8", newline="")
+        _write_settleup_csv(text, expenses, balances, settleup_currency)
+        text.flush()
+        text.detach()
+        if compress:
+            # Writes the gzip trailer, leaving the spool open
+            binary.close()
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
+
+
+@timed_phase("render")
+def build_settleup_csv(
+    all_expenses: list[ExpenseSettleupRow],
     settleup_currency: str,
     report_generated_at: datetime | None = None,
 ) -> bytes:
-    generated_at = report_generated_at or datetime.now(timezone.utc)
-    metadata_lines, headers, rows, before_balances, transfer_rows = _build_report_parts(
-        all_expenses, settleup_currency, generated_at
+    # report_generated_at is kept for symmetry with build_settleup_pdf; the CSV
+    # carries no metadata lines
+    with spool_settleup_csv(
+        _sorted_expenses_chronological(all_expenses),
+        _balances_from_expenses(all_expenses),
+        settleup_currency,
+    ) as spool:
+        return spool.read()
+
+
+def _report_rows(
+    expenses: Iterable[ExpenseSettleupRow],
+    breakdown: _Breakdown,
+    transfer_rows: list[tuple[str, dict[str, float]]],
+) -> Iterator[tuple[str, dict[str, float] | None]]:
+    # Table rows of the PDF, where section labels have no amounts
+    yield from breakdown.rows(expenses)
+    yield "BEFORE SETTLEUP", None
+    yield "net", breakdown.net
+    yield "SUGGESTED TRANSFERS", None
+    yield from transfer_rows
+    yield "AFTER SETTLEUP", None
+    yield "net", {u: 0.0 for u in breakdown.users}
+    note = breakdown.note()
+    if note:
+        yield f"Note: {note}", None
+
+
+def _draw_pdf_page(
+    page: PdfPage,
+    page_number: int,
+    heading: str,
+    metadata_lines: list[str],
+    users: list[str],
+    rows: list[tuple[str, dict[str, float] | None]],
+) -> None:
+    left, right = PDF_MARGIN, page.width - PDF_MARGIN
+    y = PDF_MARGIN + PDF_HEADING_SIZE
+    page.text(left, y, heading, PDF_HEADING_SIZE, bold=True)
+    y += PDF_ROW_HEIGHT
+    for line in metadata_lines:
+        y += PDF_ROW_HEIGHT
+        page.text(left, y, line, PDF_FONT_SIZE)
+    y += PDF_ROW_HEIGHT
+
+    # Header row
+    y += PDF_ROW_HEIGHT
+    page.text(left, y, "expense", PDF_FONT_SIZE, bold=True)
+    amounts_left = left + PDF_LABEL_WIDTH
+    for index, user in enumerate(users):
+        column_right = amounts_left + (index + 1) * PDF_AMOUNT_WIDTH
+        name = truncate(user, PDF_AMOUNT_WIDTH - 6, PDF_FONT_SIZE, bold=True)
+        page.text_right(column_right, y, name, PDF_FONT_SIZE, bold=True)
+    table_right = min(right, amounts_left + len(users) * PDF_AMOUNT_WIDTH)
+    page.rule(left, table_right, y + 4, 0.8)
+
+    for label, amounts in rows:
+        y += PDF_ROW_HEIGHT
+        if amounts is None:
+            page.fill_rect(
+                left, y - PDF_ROW_HEIGHT + 4, table_right - left, PDF_ROW_HEIGHT, GREY
+            )
+            page.text(left + 2, y, label, PDF_FONT_SIZE, bold=True)
+            continue
+        page.text(
+            left,
+            y,
+            truncate(label, PDF_LABEL_WIDTH - 6, PDF_FONT_SIZE),
+            PDF_FONT_SIZE,
+        )
+        for index, user in enumerate(users):
+            value = _fmt_signed_raw(amounts[user])
+            color = RED if value[0] == "-" else GREEN if value[0] == "+" else BLACK
+            column_right = amounts_left + (index + 1) * PDF_AMOUNT_WIDTH
+            page.text_right(column_right, y, value, PDF_FONT_SIZE, color=color)
+        page.rule(left, table_right, y + 4, 0.25, RULE_GREY)
+
+    page.text_right(
+        right,
+        page.height - PDF_MARGIN / 2,
+        f"Page {page_number}",
+        PDF_FONT_SIZE,
+        color=RULE_GREY,
     )
-    users = list(before_balances.keys())
 
-    # Build all data for single combined table
-    before_row = ["net", *[_fmt_signed_raw(before_balances[u]) for u in users]]
-    transfer_data = [
-        [label, *[_fmt_signed_raw(transfer_row[u]) for u in users]]
-        for label, transfer_row in transfer_rows
-    ]
-    after_row = ["net", *["0.00" for _ in users]]
 
-    # Calculate figure height
-    num_expense_rows = len(rows)
-    num_transfer_rows = len(transfer_data)
-    total_data_rows = (
-        num_expense_rows + 1 + num_transfer_rows + 1 + 0.5
-    )  # expenses + before + transfers + after
-    fig_h = max(6.0, 1.5 + 0.35 * total_data_rows + 0.3 * len(metadata_lines))
+def _write_settleup_pdf(
+    output: IO[bytes],
+    expenses: Iterable[ExpenseSettleupRow],
+    balances: list[BalanceRow],
+    settleup_currency: str,
+    report_generated_at: datetime,
+) -> None:
+    users, transfer_rows = _build_balance_parts(balances, settleup_currency)
+    metadata_lines = _build_metadata_lines(
+        (balance["currency"] for balance in balances),
+        settleup_currency,
+        report_generated_at,
+    )
+    pdf = PdfWriter(output, PDF_PAGE_SIZE, title="Settle-up breakdown")
+
+    # Wide groups spread their users over several pages of columns
+    columns = int(
+        (pdf.page_width - 2 * PDF_MARGIN - PDF_LABEL_WIDTH) // PDF_AMOUNT_WIDTH
+    )
+    column_groups = [users[i : i + columns] for i in range(0, len(users), columns)]
+    # Lines above the table: heading, metadata (first rows only), spacing, header
+    fixed_lines = 4 + PDF_HEADING_SIZE / PDF_ROW_HEIGHT
+    rows_per_page = int(
+        (pdf.page_height - 2 * PDF_MARGIN) // PDF_ROW_HEIGHT - fixed_lines
+    )
 
-    fig = plt.figure(figsize=(12, fig_h), facecolor="#FFFFFF")
-    ax = fig.add_subplot(111)
-    ax.axis("off")
+    rows = _report_rows(expenses, _Breakdown(users, settleup_currency), transfer_rows)
+    first_row = 1
+    page_metadata = metadata_lines
+    while True:
+        # One batch of rows at a time, drawn across every group of columns
+        batch = list(islice(rows, max(1, rows_per_page - len(page_metadata))))
+        if not batch:
+            break
+        for group_index, group_users in enumerate(column_groups or [[]]):
+            heading = (
+                f"Settle-up breakdown, rows {first_row}-{first_row + len(batch) - 1}"
+            )
+            if len(column_groups) > 1:
+                heading += (
+                    f", users {group_index * columns + 1}-"
+                    f"{group_index * columns + len(group_users)} of {len(users)}"
+                )
+            page = pdf.new_page()
+            _draw_pdf_page(
+                page,
+                pdf.page_count + 1,
+                heading,
+                page_metadata,
+                group_users,
+                batch,
+            )
+            pdf.add_page(page)
+        first_row += len(batch)
+        page_metadata = []
+    pdf.close()
 
-    text_y = 0.98
 
-    # Add metadata at top
-    for line in metadata_lines:
-        ax.text(
-            0.02,
-            text_y,
-            line,
-            transform=ax.transAxes,
-            va="top",
-            ha="left",
-            fontsize=9,
+def spool_settleup_pdf(
+    expenses: Iterable[ExpenseSettleupRow],
+    balances: list[BalanceRow],
+    settleup_currency: str,
+    report_generated_at: datetime | None = None,
+) -> SpooledTemporaryFile:
+    """
+    Write the settle-up PDF into a spooled temp file, rewound and ready to upload.
+    Takes the same inputs as spool_settleup_csv; rows are paginated as expenses
+    arrive, and each page is written out once drawn.
+    """
+    spool = SpooledTemporaryFile(max_size=PDF_SPOOL_BYTES)
+    try:
+        _write_settleup_pdf(
+            spool,
+            expenses,
+            balances,
+            settleup_currency,
+            report_generated_at or datetime.now(timezone.utc),
         )
-        text_y -= 0.035
-
-    # Combine all table data with section labels
-    all_table_rows = []
-
-    # Expense breakdown section
-    for row in rows:
-        all_table_rows.append(row)
-
-    # Separator
-    all_table_rows.append(["" for _ in headers])
-
-    # Before section label
-    all_table_rows.append(["[BEFORE SETTLEUP]"] + ["" for _ in users])
-    all_table_rows.append(before_row)
-
-    # Transfers section label
-    all_table_rows.append(["[SUGGESTED TRANSFERS]"] + ["" for _ in users])
-    for transfer_row in transfer_data:
-        all_table_rows.append(transfer_row)
-
-    # After section label
-    all_table_rows.append(["[AFTER SETTLEUP]"] + ["" for _ in users])
-    all_table_rows.append(after_row)
-
-    table_y_top = text_y - 0.01
-    table = ax.table(
-        cellText=all_table_rows,
-        colLabels=headers,
-        bbox=[0.0, 0.02, 1.0, table_y_top],
-        cellLoc="left",
-        colLoc="left",
-    )
-    table.auto_set_font_size(False)
-    table.set_fontsize(9)
-    table.scale(1, 1.2)
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
 
-    # Apply color coding to data cells (skip label rows)
-    for (row_idx, col_idx), cell in table.get_celld().items():
-        if row_idx == 0 or col_idx == 0:  # Headers and row labels
-            continue
-        cell_text = cell.get_text().get_text().strip()
-        if cell_text.startswith("-"):
-            cell.get_text().set_color("#C62828")  # Red for negative (paid/owed)
-        elif cell_text.startswith("+"):
-            cell.get_text().set_color("#2E7D32")  # Green for positive (received/credit)
 
-    buffer = BytesIO()
-    fig.savefig(buffer, format="pdf", bbox_inches="tight")
-    plt.close(fig)
-    buffer.seek(0)
-    return buffer.getvalue()
+@timed_phase("render")
+def build_settleup_pdf(
+    all_expenses: list[ExpenseSettleupRow],
+    settleup_currency: str,
+    report_generated_at: datetime | None = None,
+) -> bytes:
+    with spool_settleup_pdf(
+        _sorted_expenses_chronological(all_expenses),
+        _balances_from_expenses(all_expenses),
+        settleup_currency,
+        report_generated_at,
+    ) as spool:
+        return spool.read()
+
+
+def _csv_upload(csv_file: IO[bytes], compress: bool, attach: bool) -> InputFile:
+    # Streamed by the networking backend instead of read into memory first
+    return InputFile(
+        csv_file,
+        filename=f"{CSV_FILENAME}.gz" if compress else CSV_FILENAME,
+        attach=attach,
+        read_file_handle=False,
+    )
 
 
 async def send_settleup_csv(
     update: Update,
     context: ContextTypes.DEFAULT_TYPE,
-    all_expenses: list[ExpenseRow],
-    settleup_currency: str,
-    report_generated_at: datetime | None = None,
+    csv_file: IO[bytes],
+    compress: bool = False,
 ) -> None:
-    csv_bytes = build_settleup_csv(all_expenses, settleup_currency, report_generated_at)
+    """Upload a CSV from spool_settleup_csv; csv_file must stay open until then."""
     try:
         await context.bot.send_document(
             chat_id=update.effective_chat.id,
-            document=BytesIO(csv_bytes),
-            filename="settleup_breakdown.csv",
+            document=_csv_upload(csv_file, compress, attach=False),
             caption="Settle-up breakdown CSV",
             message_thread_id=get_message_thread_id(update),
         )
@@ -336,28 +519,27 @@ async def send_settleup_csv(
 async def send_settleup_reports(
     update: Update,
     context: ContextTypes.DEFAULT_TYPE,
-    all_expenses: list[ExpenseRow],
-    settleup_currency: str,
-    report_generated_at: datetime | None = None,
+    csv_file: IO[bytes],
+    pdf_file: IO[bytes],
+    compress: bool = False,
 ) -> None:
-    csv_bytes = build_settleup_csv(all_expenses, settleup_currency, report_generated_at)
-    pdf_bytes = build_settleup_pdf(all_expenses, settleup_currency, report_generated_at)
+    """Upload files from spool_settleup_csv and spool_settleup_pdf as one album."""
     message_thread_id = get_message_thread_id(update)
-
     try:
-        csv_file = BytesIO(csv_bytes)
-        csv_file.name = "settleup_breakdown.csv"
-        pdf_file = BytesIO(pdf_bytes)
-        pdf_file.name = "settleup_breakdown.pdf"
-
-        await context.bot.send_document(
-            chat_id=update.effective_chat.id,
-            document=csv_file,
-            message_thread_id=message_thread_id,
-        )
-        await context.bot.send_document(
+        # Sent as one album: a single request instead of one per file
+        await context.bot.send_media_group(
             chat_id=update.effective_chat.id,
-            document=pdf_file,
+            media=[
+                InputMediaDocument(_csv_upload(csv_file, compress, attach=True)),
+                InputMediaDocument(
+                    InputFile(
+                        pdf_file,
+                        filename=PDF_FILENAME,
+                        attach=True,
+                        read_file_handle=False,
+                    )
+                ),
+            ],
             message_thread_id=message_thread_id,
         )
     except BadRequest:
@@ -0,0 +1,383 @@
+"""
+Raster renderer of the /settleup stats table, drawn with Pillow rather than a
+matplotlib figure, and encoded as PNG directly.
+
+The image is cut into horizontal bands. Bands without cell text (the header,
+grid lines and row padding) only depend on the number of rows, so each table
+size is rendered once into a template that keeps them deflated. A render draws
+the cell text of each row on a copy of its band background, from a cached glyph
+atlas, and deflates just those bands.
+
+The geometry follows the matplotlib table this replaces: a 10.5in wide figure at
+180dpi cropped to its axes, with the table in the middle 92%.
+"""
+
+import importlib.util
+import struct
+import zlib
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import cache, lru_cache
+from pathlib import Path
+
+from PIL import Image, ImageDraw, ImageFont
+
+TABLE_FONT_FAMILY = "DejaVu Sans"
+TABLE_FONT_FILES = {False: "DejaVuSans.ttf", True: "DejaVuSans-Bold.ttf"}
+TABLE_BODY_FONT_SIZE = 16
+TABLE_HEADER_FONT_SIZE = 17
+TABLE_HEADERS = (
+    "User",
+    "Amount paid\nfor group",
+    "Suggested\ntransfers",
+    "Final indiv\nspending",
+)
+
+DPI = 180
+PAD = round(0.1 * DPI)
+AXES_WIDTH = 0.775 * 10.5 * DPI
+# Relative heights of the header and body rows
+HEADER_SHARE = 0.215
+ROW_SHARE = 0.12
+LINE_WIDTH = round(1.45 * DPI / 72)
+HEADER_LINE_SPACING = 1.25
+CELL_PAD = 0.1
+# Advances are measured at this multiple of the font size, as matplotlib's
+# hinting_factor, so that they keep fractions of a pixel
+ADVANCE_SCALE = 8
+
+BACKGROUND = "#05070C"
+HEADER_FILL = "#1B2742"
+ROW_FILLS = ("#0C1120", "#090D17")
+TOTAL_FILL = "#131A2C"
+GRID = "#00FFFF"
+HEADER_TEXT = "#F2FCFF"
+LABEL_TEXT = "#EAF3FF"
+NEUTRAL_TEXT = "#FFFFFF"
+NEGATIVE_TEXT = "#FF768E"
+POSITIVE_TEXT = "#57FFA3"
+SPENDING_TEXT = "#00FFFF"
+
+# Templates are keyed by row count and hold ~100KB of deflated bands each
+TEMPLATE_CACHE_SIZE = 64
+# zlib level of the text bands; the photo is re-encoded by Telegram anyway
+PNG_COMPRESS_LEVEL = 1
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# zlib stream header: deflate with a 32K window, fastest
+_ZLIB_HEADER = b"\x78\x01"
+_ADLER_BASE = 65521
+
+
+def _font_path(bold: bool) -> str:
+    # matplotlib bundles DejaVu Sans; found without importing it
+    spec = importlib.util.find_spec("matplotlib")
+    if spec is not None and spec.origin is not None:
+        path = Path(spec.origin).parent / "mpl-data" / "fonts" / "ttf"
+        path /= TABLE_FONT_FILES[bold]
+        if path.exists():
+            return str(path)
+    # Otherwise Pillow searches the system font directories
+    return TABLE_FONT_FILES[bold]
+
+
+@cache
+def _font(points: float, bold: bool) -> ImageFont.FreeTypeFont:
+    return ImageFont.truetype(_font_path(bold), points * DPI / 72)
+
+
+def _advance(char: str, points: float, bold: bool) -> float:
+    # Hinted advances are whole pixels, which adds up over a line
+    return _font(points * ADVANCE_SCALE, bold).getlength(char) / ADVANCE_SCALE
+
+
+@cache
+def _glyph(
+    char: str, points: float, bold: bool
+) -> tuple[Image.Image | None, int, int, float]:
+    """Coverage mask of a glyph, its offset from the pen on the baseline, advance."""
+    font = _font(points, bold)
+    left, top, right, bottom = font.getbbox(char, anchor="ls")
+    if right <= left or bottom <= top:
+        return None, 0, 0, _advance(char, points, bold)
+    mask = Image.new("L", (right - left, bottom - top))
+    ImageDraw.Draw(mask).text((-left, -top), char, fill=255, font=font, anchor="ls")
+    return mask, left, top, _advance(char, points, bold)
+
+
+@cache
+def _lp_extent(points: float, bold: bool) -> tuple[int, int]:
+    _, top, _, bottom = _font(points, bold).getbbox("lp", anchor="ls")
+    return -top, bottom
+
+
+def _text_extent(text: str, points: float, bold: bool) -> tuple[int, int, int, int]:
+    """
+    Ink extent of a line from the pen on the baseline: left, right, and the height
+    above and depth below the baseline. Like matplotlib, a line is at least as
+    tall and deep as "lp".
+    """
+    above, below = _lp_extent(points, bold)
+    left, right, x = None, 0, 0.0
+    for char in text:
+        mask, glyph_left, glyph_top, advance = _glyph(char, points, bold)
+        if mask is not None:
+            if left is None:
+                left = round(x) + glyph_left
+            right = round(x) + glyph_left + mask.width
+            above = max(above, -glyph_top)
+            below = max(below, glyph_top + mask.height)
+        x += advance
+    return left or 0, right, above, below
+
+
+def _paste_text(
+    image: Image.Image,
+    x: float,
+    baseline: int,
+    text: str,
+    points: float,
+    bold: bool,
+    color: str,
+) -> None:
+    # Anything sticking out of the image is clipped by paste
+    for char in text:
+        mask, left, top, advance = _glyph(char, points, bold)
+        if mask is not None:
+            image.paste(color, (round(x) + left, baseline + top), mask)
+        x += advance
+
+
+@cache
+def _text_band_height() -> int:
+    ascent, descent = _font(TABLE_BODY_FONT_SIZE, True).getmetrics()
+    return ascent + descent + 2 * LINE_WIDTH
+
+
+class _Layout:
+    def __init__(self, row_count: int) -> None:
+        fig_height = max(4.2, 1.7 + 0.62 * (row_count + 1))
+        axes_height = 0.77 * fig_height * DPI
+        self.row_count = row_count
+        self.width = int(AXES_WIDTH + 2 * PAD)
+        self.height = int(axes_height + 2 * PAD)
+        self.top = PAD + 0.04 * axes_height
+        unit = 0.92 * axes_height / (HEADER_SHARE + ROW_SHARE * row_count)
+        self.header_height = HEADER_SHARE * unit
+        self.row_height = ROW_SHARE * unit
+        self.bottom = self.top + self.header_height + row_count * self.row_height
+
+    # Columns are the same for every row count
+    left = PAD + 0.04 * AXES_WIDTH
+    column_width = 0.92 * AXES_WIDTH / len(TABLE_HEADERS)
+    right = left + len(TABLE_HEADERS) * column_width
+
+    def column_left(self, column: int) -> float:
+        return self.left + column * self.column_width
+
+    def row_top(self, row: int) -> float:
+        return self.top + self.header_height + row * self.row_height
+
+    def row_fill(self, row: int) -> str:
+        return TOTAL_FILL if row == self.row_count - 1 else ROW_FILLS[(row + 1) % 2]
+
+    def text_band(self, row: int) -> tuple[int, int]:
+        """Pixel rows holding the cell text of a body row, clear of the grid."""
+        height = _text_band_height()
+        top = round(self.row_top(row) + (self.row_height - height) / 2)
+        return top, top + height
+
+
+def _draw_column_lines(draw: ImageDraw.ImageDraw, top: float, bottom: float) -> None:
+    half = LINE_WIDTH / 2
+    for column in range(1, len(TABLE_HEADERS)):
+        x = _Layout.left + column * _Layout.column_width
+        draw.rectangle((x - half, top, x + half - 1, bottom), fill=GRID)
+
+
+def _draw_table(layout: _Layout) -> Image.Image:
+    image = Image.new("RGB", (layout.width, layout.height), BACKGROUND)
+    draw = ImageDraw.Draw(image)
+    draw.rectangle(
+        (layout.left, layout.top, layout.right, layout.row_top(0)), fill=HEADER_FILL
+    )
+    half = LINE_WIDTH / 2
+    for row in range(layout.row_count):
+        top = layout.row_top(row)
+        draw.rectangle(
+            (layout.left, top, layout.right, layout.row_top(row + 1)),
+            fill=layout.row_fill(row),
+        )
+        # Inner edges only, as the outer border of the table is open
+        draw.rectangle(
+            (layout.left, top - half, layout.right, top + half - 1), fill=GRID
+        )
+    _draw_column_lines(draw, layout.top, layout.bottom)
+
+    for column, header in enumerate(TABLE_HEADERS):
+        _draw_header(image, layout, column, header)
+    return image
+
+
+def _draw_header(image: Image.Image, layout: _Layout, column: int, header: str) -> None:
+    """Lines of a header centered in its cell, spaced as matplotlib does."""
+    points = TABLE_HEADER_FONT_SIZE
+    lines = header.split("\n")
+    extents = [_text_extent(line, points, True) for line in lines]
+    min_step = _lp_extent(points, True)[0] * HEADER_LINE_SPACING
+    baselines = []
+    y = 0.0
+    for index, (_, _, above, below) in enumerate(extents):
+        y += above if index == 0 else max(min_step, above * HEADER_LINE_SPACING)
+        baselines.append(y)
+        y += below
+    top = layout.top + (layout.header_height - y) / 2
+    center_x = layout.column_left(column) + layout.column_width / 2
+    for line, (left, right, _, _), baseline in zip(lines, extents, baselines):
+        x = center_x - (left + right) / 2
+        _paste_text(image, x, round(top + baseline), line, points, True, HEADER_TEXT)
+
+
+@cache
+def _band_background(fill: str) -> Image.Image:
+    """A text band of a body row with `fill`, before any text is drawn."""
+    height = _text_band_height()
+    image = Image.new("RGB", (int(AXES_WIDTH + 2 * PAD), height), BACKGROUND)
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((_Layout.left, 0, _Layout.right, height), fill=fill)
+    _draw_column_lines(draw, 0, height)
+    return image
+
+
+def _filtered(image: Image.Image) -> bytes:
+    # PNG scanlines, each prefixed with filter type 0 (none)
+    raw = image.tobytes()
+    stride = image.width * 3
+    return b"".join(
+        b"\x00" + raw[start : start + stride] for start in range(0, len(raw), stride)
+    )
+
+
+def _deflate(data: bytes) -> bytes:
+    # Raw deflate blocks ending on a byte boundary, so that bands compressed on
+    # their own can be concatenated into one stream
+    compressor = zlib.compressobj(PNG_COMPRESS_LEVEL, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush(zlib.Z_FULL_FLUSH)
+
+
+# An empty final deflate block, ending the stream
+_FINAL_BLOCK = zlib.compressobj(PNG_COMPRESS_LEVEL, zlib.DEFLATED, -15).flush()
+
+
+def _adler32_combine(adler1: int, adler2: int, length2: int) -> int:
+    """Adler-32 of two byte strings joined, from each one's checksum (as in zlib)."""
+    remainder = length2 % _ADLER_BASE
+    sum1 = adler1 & 0xFFFF
+    sum2 = remainder * sum1 % _ADLER_BASE
+    sum1 = (sum1 + (adler2 & 0xFFFF) + _ADLER_BASE - 1) % _ADLER_BASE
+    sum2 = (
+        sum2 + (adler1 >> 16) + (adler2 >> 16) + _ADLER_BASE - remainder
+    ) % _ADLER_BASE
+    return (sum2 << 16) | sum1
+
+
+@dataclass(frozen=True, slots=True)
+class _Band:
+    """Deflated scanlines of a band, with their Adler-32 and uncompressed length."""
+
+    deflated: bytes
+    adler: int
+    length: int
+
+    @classmethod
+    def encode(cls, image: Image.Image) -> "_Band":
+        data = _filtered(image)
+        return cls(_deflate(data), zlib.adler32(data), len(data))
+
+
+@dataclass(frozen=True, slots=True)
+class _Template:
+    layout: _Layout
+    # The bands around each row's text band, so one more than there are rows
+    static_bands: tuple[_Band, ...]
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def _template(row_count: int) -> _Template:
+    layout = _Layout(row_count)
+    image = _draw_table(layout)
+    edges = [0]
+    for row in range(row_count):
+        edges += layout.text_band(row)
+    edges.append(layout.height)
+    static_bands = tuple(
+        _Band.encode(image.crop((0, top, layout.width, bottom)))
+        for top, bottom in zip(edges[::2], edges[1::2])
+    )
+    return _Template(layout, static_bands)
+
+
+def _cell_style(column: int, text: str, is_total: bool) -> tuple[str, bool]:
+    if column in (1, 2):
+        if text == "-":
+            color = NEUTRAL_TEXT
+        elif text.startswith("-"):
+            color = NEGATIVE_TEXT
+        elif text.startswith("+"):
+            color = POSITIVE_TEXT
+        else:
+            color = LABEL_TEXT
+        return color, is_total
+    if column == 3:
+        return SPENDING_TEXT, True
+    return LABEL_TEXT, is_total
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return b"".join(
+        (
+            struct.pack(">I", len(data)),
+            kind,
+            data,
+            struct.pack(">I", zlib.crc32(kind + data)),
+        )
+    )
+
+
+def render_stats_table(rows: Sequence[Sequence[str]]) -> bytes:
+    """
+    PNG of the stats table with `rows` of 4 cells under TABLE_HEADERS, the last
+    being the total.
+    """
+    template = _template(len(rows))
+    layout = template.layout
+
+    bands = [template.static_bands[0]]
+    for row, cells in enumerate(rows):
+        image = _band_background(layout.row_fill(row)).copy()
+        band_top, _ = layout.text_band(row)
+        center_y = layout.row_top(row) + layout.row_height / 2 - band_top
+        for column, text in enumerate(cells):
+            color, bold = _cell_style(column, text, row == len(rows) - 1)
+            _, _, above, below = _text_extent(text, TABLE_BODY_FONT_SIZE, bold)
+            # Centered on the line's extent, as matplotlib's va="center"
+            baseline = round(center_y + (above - below) / 2)
+            x = layout.column_left(column) + CELL_PAD * layout.column_width
+            _paste_text(image, x, baseline, text, TABLE_BODY_FONT_SIZE, bold, color)
+        bands += (_Band.encode(image), template.static_bands[row + 1])
+
+    adler = 1
+    for band in bands:
+        adler = _adler32_combine(adler, band.adler, band.length)
+    idat = b"".join(
+        (_ZLIB_HEADER, *(band.deflated for band in bands), _FINAL_BLOCK)
+    ) + struct.pack(">I", adler)
+    header = struct.pack(">IIBBBBB", layout.width, layout.height, 8, 2, 0, 0, 0)
+    return b"".join(
+        (
+            _PNG_SIGNATURE,
+            _png_chunk(b"IHDR", header),
+            _png_chunk(b"IDAT", idat),
+            _png_chunk(b"IEND", b""),
+        )
+    )
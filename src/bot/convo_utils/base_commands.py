@@ -60,9 +60,12 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
         "/set_currencies - Configure default expense and settlement currencies\n"
         "/add - Add a new expense\n"
         "/add_receipt - Add detailed expense from a receipt photo\n"
-        "/view - View all expenses + make edits / deletes from here as well\n"
+        "/view - View all expenses + make edits / deletes from here as well; "
+        "filter with eg. /view @alice USD >100 hotpot\n"
+        "/import - Import expenses from a CSV or JSON file\n"
         "/settleup - Get suggested transfer amounts\n"
-        "/settleup_report - Get details on how suggested transfers were calculated\n"
+        "/settleup_report - Get details on how suggested transfers were calculated; "
+        "/settleup_report gzip sends the CSV compressed\n"
     )
     await update.message.reply_text(message, reply_markup=help_buttons)
     return ConversationHandler.END
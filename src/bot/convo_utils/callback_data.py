@@ -0,0 +1,115 @@
+"""
+Compact callback data: one opcode character followed by the op's arguments,
+struct-packed and base64url-encoded, eg. an expense id fits in 23 characters.
+Handlers route on the opcode with one dict lookup instead of regex patterns and
+string parsing.
+"""
+
+import struct
+import uuid
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from telegram import Update
+from telegram.ext import ContextTypes
+
+# Telegram's limit on InlineKeyboardButton.callback_data
+MAX_CALLBACK_DATA_BYTES = 64
+
+
+@dataclass(frozen=True, slots=True)
+class ArgType:
+    fmt: str
+    pack: Callable[[Any], Any]
+    unpack: Callable[[Any], Any]
+
+
+U16 = ArgType("H", int, int)
+UUID = ArgType(
+    "16s",
+    lambda value: uuid.UUID(str(value)).bytes,
+    lambda raw: str(uuid.UUID(bytes=raw)),
+)
+CURRENCY_CODE = ArgType(
+    "3s",
+    lambda value: str(value).upper().encode("ascii"),
+    lambda raw: raw.decode("ascii"),
+)
+
+_ops: dict[str, "CallbackOp"] = {}
+
+
+class CallbackOp:
+    """
+    A callback action. Opcodes are single uppercase characters, so they never
+    clash with older plain-text callback data.
+    """
+
+    __slots__ = ("code", "name", "args", "_struct")
+
+    def __init__(self, code: str, name: str, *args: ArgType):
+        if len(code) != 1 or not code.isupper():
+            raise ValueError(f"Opcode must be one uppercase character, got {code!r}")
+        if code in _ops:
+            raise ValueError(f"Opcode {code!r} already used by {_ops[code].name}")
+        self.code = code
+        self.name = name
+        self.args = args
+        self._struct = struct.Struct(">" + "".join(arg.fmt for arg in args))
+        _ops[code] = self
+
+    def __repr__(self) -> str:
+        return f"CallbackOp({self.code!r}, {self.name!r})"
+
+    def __call__(self, *values: Any) -> str:
+        """Encode callback data for this op with the given arguments."""
+        if len(values) != len(self.args):
+            raise ValueError(f"{self.name} takes {len(self.args)} arguments")
+        packed = self._struct.pack(
+            *(arg.pack(value) for arg, value in zip(self.args, values))
+        )
+        data = self.code + urlsafe_b64encode(packed).decode("ascii").rstrip("=")
+        if len(data) > MAX_CALLBACK_DATA_BYTES:
+            raise ValueError(f"{self.name} callback data exceeds 64 bytes")
+        return data
+
+    def decode(self, data: str) -> tuple[Any, ...]:
+        payload = data[1:]
+        raw = urlsafe_b64decode(payload + "=" * (-len(payload) % 4))
+        return tuple(
+            arg.unpack(value) for arg, value in zip(self.args, self._struct.unpack(raw))
+        )
+
+
+CallbackHandler = Callable[..., Awaitable[Any]]
+
+
+class CallbackRoutes:
+    """
+    Dispatch table from ops to handlers, built once when the conversation is set
+    up. Handlers receive the decoded arguments after (update, context).
+    """
+
+    def __init__(self, routes: Mapping[CallbackOp, CallbackHandler]):
+        self._routes = {op.code: (op, handler) for op, handler in routes.items()}
+
+    def matches(self, data: object) -> bool:
+        """CallbackQueryHandler pattern: is this data for one of our ops."""
+        return isinstance(data, str) and data[:1] in self._routes
+
+    async def dispatch(
+        self, update: Update, context: ContextTypes.DEFAULT_TYPE, default: Any
+    ) -> Any:
+        """Run the handler for the query's op; `default` for unknown or bad data."""
+        data = update.callback_query.data
+        route = self._routes.get(data[:1]) if isinstance(data, str) else None
+        if route is None:
+            return default
+        op, handler = route
+        try:
+            args = op.decode(data)
+        except (ValueError, IndexError, struct.error):
+            return default
+        return await handler(update, context, *args)
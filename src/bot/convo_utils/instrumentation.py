@@ -0,0 +1,111 @@
+from collections.abc import Awaitable, Callable
+from functools import wraps
+from time import perf_counter
+from types import FrameType
+from typing import Any
+
+from telegram import Update
+from telegram.ext import Application, ContextTypes
+from telegram.request import HTTPXRequest
+
+import config
+from src.bot.convo_utils.profiling import profile_update
+from src.lib.metrics import PHASES, LoopWatchdog, collect_phases, metrics, phase
+from src.lib.splizy_repo.tracing import trace_queries
+
+HANDLER_SECONDS = "splizy_handler_seconds"
+HANDLER_PHASE_SECONDS = "splizy_handler_phase_seconds"
+
+metrics.describe(HANDLER_SECONDS, "Wall time of a conversation handler callback.")
+metrics.describe(
+    HANDLER_PHASE_SECONDS,
+    "Handler wall time split into db, provider, render, telegram and other.",
+)
+
+
+def instrument_handler(
+    callback: Callable[..., Awaitable[Any]], conversation: str, state: str
+) -> Callable[..., Awaitable[Any]]:
+    """Record the callback's wall time and per-phase breakdown once per update."""
+    if getattr(callback, "_splizy_instrumented", False):
+        return callback
+
+    labels = {
+        "conversation": conversation,
+        "state": state,
+        "handler": getattr(callback, "__name__", type(callback).__name__),
+    }
+
+    @wraps(callback)
+    async def wrapped(
+        update: Update,
+        context: ContextTypes.DEFAULT_TYPE,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        start = perf_counter()
+        trace_label = f"{conversation}.{labels['handler']}"
+        with (
+            trace_queries(trace_label),
+            collect_phases() as totals,
+            profile_update(update, labels),
+        ):
+            try:
+                return await callback(update, context, *args, **kwargs)
+            finally:
+                elapsed = perf_counter() - start
+                metrics.observe(HANDLER_SECONDS, elapsed, **labels)
+                for name in PHASES:
+                    if name in totals:
+                        metrics.observe(
+                            HANDLER_PHASE_SECONDS, totals[name], phase=name, **labels
+                        )
+                metrics.observe(
+                    HANDLER_PHASE_SECONDS,
+                    max(0.0, elapsed - sum(totals.values())),
+                    phase="other",
+                    **labels,
+                )
+
+    setattr(wrapped, "_splizy_instrumented", True)
+    return wrapped
+
+
+class TimedHTTPXRequest(HTTPXRequest):
+    """Bot API request that counts its round trip as the handler's telegram time."""
+
+    async def do_request(self, *args: Any, **kwargs: Any) -> tuple[int, bytes]:
+        with phase("telegram"):
+            return await super().do_request(*args, **kwargs)
+
+
+def _handler_from_frames(frames: list[FrameType]) -> str | None:
+    # The instrument_handler wrapper frame sits above whatever blocked the loop
+    for frame in frames:
+        code = frame.f_code
+        if code.co_name == "wrapped" and frame.f_globals.get("__name__") == __name__:
+            labels = frame.f_locals.get("labels") or {}
+            return (
+                f"{labels.get('conversation')}.{labels.get('state')}."
+                f"{labels.get('handler')}"
+            )
+    return None
+
+
+async def start_loop_watchdog(application: Application) -> None:
+    """post_init hook starting the event-loop watchdog when enabled in config."""
+    if not config.LOOP_WATCHDOG_ENABLED:
+        return
+    watchdog = LoopWatchdog(
+        threshold=config.LOOP_WATCHDOG_THRESHOLD_MS / 1000,
+        interval=config.LOOP_WATCHDOG_INTERVAL_MS / 1000,
+        describe_stack=_handler_from_frames,
+    )
+    watchdog.start()
+    application.bot_data["loop_watchdog"] = watchdog
+
+
+async def stop_loop_watchdog(application: Application) -> None:
+    watchdog = application.bot_data.pop("loop_watchdog", None)
+    if watchdog is not None:
+        await watchdog.stop()
@@ -1,6 +1,6 @@
 from typing import TypeVar
 
-from src.lib.currencies.config import ALL_CURRENCY_CODES
+from src.lib.currencies.config import get_all_currency_codes
 
 T = TypeVar("T")
 ParsedResult = tuple[bool, T | str]
@@ -9,7 +9,7 @@ ParsedResult = tuple[bool, T | str]
 def parse_currency(input: str) -> ParsedResult[str]:
     try:
         currency = input.strip().upper()
-        if currency not in ALL_CURRENCY_CODES:
+        if currency not in get_all_currency_codes():
             return (
                 False,
                 "Invalid currency code, please double check and try again.",
@@ -0,0 +1,255 @@
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+from telegram import Update
+
+import config
+from src.lib.logger import get_logger
+from src.lib.metrics import StackSampler, write_collapsed
+
+logger = get_logger(__name__)
+
+PROFILE_USAGE = (
+    "Usage: /profile [updates=N] [command=NAME] [chat=ID|here|any]\n"
+    "       /profile status\n"
+    "       /profile off"
+)
+
+
+@dataclass(slots=True)
+class ProfileRequest:
+    """Profile the next `remaining` updates of a chat and/or command."""
+
+    remaining: int
+    chat_id: int | None = None
+    command: str | None = None
+
+    def matches(self, update: Update, labels: dict[str, str]) -> bool:
+        if self.chat_id is not None and (
+            update.effective_chat is None or update.effective_chat.id != self.chat_id
+        ):
+            return False
+        if self.command is None:
+            return True
+        if self.command in (labels["handler"], labels["conversation"]):
+            return True
+        text = update.message.text if update.message else None
+        return bool(text) and text.split()[0].split("@")[0] == f"/{self.command}"
+
+    def describe(self) -> str:
+        chat = self.chat_id if self.chat_id is not None else "any"
+        return (
+            f"{self.remaining} update(s), chat={chat}, command={self.command or 'any'}"
+        )
+
+
+_requests: list[ProfileRequest] = []
+
+SHARED_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS profile_requests (
+    id INTEGER PRIMARY KEY,
+    remaining INTEGER NOT NULL,
+    chat_id INTEGER,
+    command TEXT
+);
+"""
+# How stale a worker's view of the shared requests may get
+SHARED_REFRESH_SEC = 1.0
+
+
+class _SharedRequests:
+    """
+    Profile requests kept in the update store's SQLite file, so that with
+    WORKER_PROCESSES > 1 a /profile handled by any worker arms all of them, and
+    `remaining` counts updates across workers: a claim is an atomic decrement,
+    so each profiled update is claimed by one worker only. Each worker re-reads
+    the requests at most every SHARED_REFRESH_SEC.
+    """
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, isolation_level=None, timeout=5.0)
+        self._conn.executescript(SHARED_SCHEMA_SQL)
+        self._cached: list[tuple[int, ProfileRequest]] = []
+        self._refreshed_at = 0.0
+
+    def add(self, request: ProfileRequest) -> None:
+        self._conn.execute(
+            "INSERT INTO profile_requests (remaining, chat_id, command) "
+            "VALUES (?, ?, ?)",
+            (request.remaining, request.chat_id, request.command),
+        )
+        self._refreshed_at = 0.0
+
+    def clear(self) -> int:
+        self._refreshed_at = 0.0
+        return self._conn.execute(
+            "DELETE FROM profile_requests WHERE remaining > 0"
+        ).rowcount
+
+    def pending(self) -> list[tuple[int, ProfileRequest]]:
+        rows = self._conn.execute(
+            "SELECT id, remaining, chat_id, command FROM profile_requests "
+            "WHERE remaining > 0 ORDER BY id"
+        ).fetchall()
+        return [(row[0], ProfileRequest(*row[1:])) for row in rows]
+
+    def cached(self) -> list[tuple[int, ProfileRequest]]:
+        now = time.monotonic()
+        if now - self._refreshed_at >= SHARED_REFRESH_SEC:
+            self._cached = self.pending()
+            self._refreshed_at = now
+        return self._cached
+
+    def claim(self, update: Update, labels: dict[str, str]) -> bool:
+        for request_id, request in self.cached():
+            if not request.matches(update, labels):
+                continue
+            cursor = self._conn.execute(
+                "UPDATE profile_requests SET remaining = remaining - 1 "
+                "WHERE id = ? AND remaining > 0 RETURNING remaining",
+                (request_id,),
+            )
+            row = cursor.fetchone()
+            if row is None:
+                # Used up by another worker
+                continue
+            if row[0] <= 0:
+                self._conn.execute(
+                    "DELETE FROM profile_requests WHERE id = ?", (request_id,)
+                )
+                self._refreshed_at = 0.0
+            return True
+        return False
+
+
+_shared: _SharedRequests | None = None
+
+
+def share_profiles(store_path: str) -> None:
+    """
+    Keep profile requests in the update store at `store_path`, shared by the
+    front and the worker processes, instead of in this process.
+    """
+    global _shared
+    _shared = _SharedRequests(store_path)
+
+
+def parse_profile_args(
+    args: list[str], current_chat_id: int | None = None
+) -> ProfileRequest:
+    """Parse `key=value` arguments of /profile and PROFILE_ON_START."""
+    request = ProfileRequest(remaining=1, chat_id=current_chat_id)
+    for arg in args:
+        key, sep, value = arg.partition("=")
+        if not sep or not value:
+            raise ValueError(f"Expected key=value, got {arg!r}")
+        if key == "updates":
+            request.remaining = int(value)
+            if request.remaining < 1:
+                raise ValueError("updates must be at least 1")
+        elif key == "command":
+            request.command = value.lstrip("/")
+        elif key == "chat":
+            if value == "here":
+                request.chat_id = current_chat_id
+            elif value == "any":
+                request.chat_id = None
+            else:
+                request.chat_id = int(value)
+        else:
+            raise ValueError(f"Unknown option {key!r}")
+    return request
+
+
+def schedule_profile(request: ProfileRequest) -> None:
+    if _shared is not None:
+        _shared.add(request)
+    else:
+        _requests.append(request)
+    logger.info("Profiling armed: %s", request.describe())
+
+
+def clear_profiles() -> int:
+    if _shared is not None:
+        return _shared.clear()
+    count = len(_requests)
+    _requests.clear()
+    return count
+
+
+def pending_profiles() -> list[ProfileRequest]:
+    if _shared is not None:
+        return [request for _, request in _shared.pending()]
+    return list(_requests)
+
+
+def schedule_profile_from_config(shared: bool = False) -> None:
+    """
+    Arm PROFILE_ON_START. Workers sharing their requests skip it: the front arms
+    it once for all of them, replacing requests left over from the last run.
+    """
+    if _shared is not None and not shared:
+        return
+    if shared:
+        clear_profiles()
+    if config.PROFILE_ON_START:
+        schedule_profile(parse_profile_args(config.PROFILE_ON_START.split()))
+
+
+def _has_requests() -> bool:
+    if _shared is not None:
+        return bool(_shared.cached())
+    return bool(_requests)
+
+
+def _claim(update: Update, labels: dict[str, str]) -> bool:
+    if _shared is not None:
+        return _shared.claim(update, labels)
+    for request in _requests:
+        if request.matches(update, labels):
+            request.remaining -= 1
+            if request.remaining <= 0:
+                _requests.remove(request)
+            return True
+    return False
+
+
+def _profile_path(update: Update, labels: dict[str, str]) -> Path:
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+    chat = update.effective_chat.id if update.effective_chat else "nochat"
+    name = f"{timestamp}_{chat}_{labels['conversation']}.{labels['handler']}.collapsed"
+    return Path(config.PROFILE_DIR) / name
+
+
+@contextmanager
+def profile_update(update: object, labels: dict[str, str]) -> Iterator[None]:
+    """
+    Sample the event loop thread while the handler runs, if a pending profile
+    request matches this update. Samples from other updates handled concurrently
+    land in the same file, so profile with concurrent_updates off (the default).
+    """
+    if (
+        not _has_requests()
+        or not isinstance(update, Update)
+        or not _claim(update, labels)
+    ):
+        yield
+        return
+
+    sampler = StackSampler(
+        threading.get_ident(), interval=config.PROFILE_INTERVAL_MS / 1000
+    )
+    sampler.start()
+    try:
+        yield
+    finally:
+        samples = sampler.stop()
+        path = _profile_path(update, labels)
+        write_collapsed(samples, path)
+        logger.info("Wrote profile with %d samples to %s", samples.total(), path)
@@ -0,0 +1,172 @@
+import asyncio
+from time import monotonic
+
+from telegram import Update
+from telegram.error import TelegramError
+from telegram.ext import Application, ContextTypes, ConversationHandler
+
+import config
+from src.lib.logger import get_logger
+from src.lib.metrics import metrics
+
+logger = get_logger(__name__)
+
+ACTIVE_CONVERSATIONS = "splizy_active_conversations"
+metrics.describe(ACTIVE_CONVERSATIONS, "Conversations in progress, per handler.")
+
+SESSION_EXPIRED_TEXT = (
+    "This session expired after {minutes} minutes of inactivity. "
+    "Run the command again to start over."
+)
+
+ConversationKey = tuple[int, int]
+
+
+class SessionSweeper:
+    """
+    Ends conversations left idle for longer than their handler's TTL and drops
+    chat_data of chats with no conversation left, in one pass every `interval`
+    seconds (PTB's conversation_timeout instead schedules a JobQueue job per
+    conversation and reschedules it on every update).
+
+    Activity is recorded by `touch`, registered as a group -1 TypeHandler so it
+    sees every update before the conversations do.
+    """
+
+    def __init__(self, interval: float, chat_data_ttl: float, notify: bool) -> None:
+        self.interval = interval
+        self.chat_data_ttl = chat_data_ttl
+        self.notify = notify
+        self._handlers: list[tuple[ConversationHandler, float]] = []
+        self._last_active: dict[ConversationKey, float] = {}
+        self._chat_last_active: dict[int, float] = {}
+        self._task: asyncio.Task | None = None
+
+    def register(self, handler: ConversationHandler, ttl: float) -> None:
+        # Keys are (chat id, user id), PTB's default
+        if not (handler.per_chat and handler.per_user) or handler.per_message:
+            raise ValueError(f"{handler.name} must be keyed per chat and user")
+        self._handlers.append((handler, ttl))
+
+    async def touch(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        chat, user = update.effective_chat, update.effective_user
+        if chat is None:
+            return
+        now = monotonic()
+        self._chat_last_active[chat.id] = now
+        if user is not None:
+            self._last_active[(chat.id, user.id)] = now
+
+    def sweep(
+        self, application: Application, now: float | None = None
+    ) -> dict[int, float]:
+        """
+        Evict idle conversations and chat_data. Returns the chats that had a
+        conversation expire, with the TTL it exceeded.
+        """
+        now = monotonic() if now is None else now
+        expired_chats: dict[int, float] = {}
+        live_keys: set[ConversationKey] = set()
+
+        for handler, ttl in self._handlers:
+            conversations = handler._conversations
+            for key in list(conversations):
+                # Conversations from before the sweeper started count from now
+                last_active = self._last_active.setdefault(key, now)
+                if now - last_active > ttl:
+                    conversations.pop(key, None)
+                    expired_chats[key[0]] = ttl
+                else:
+                    live_keys.add(key)
+            metrics.set_gauge(
+                ACTIVE_CONVERSATIONS, len(conversations), conversation=handler.name
+            )
+
+        live_chats = {chat_id for chat_id, _ in live_keys}
+        self._last_active = {
+            key: last_active
+            for key, last_active in self._last_active.items()
+            if key in live_keys
+        }
+        for chat_id in list(application.chat_data):
+            if chat_id in live_chats:
+                continue
+            last_active = self._chat_last_active.get(chat_id, now)
+            if chat_id in expired_chats or now - last_active > self.chat_data_ttl:
+                application.drop_chat_data(chat_id)
+        self._chat_last_active = {
+            chat_id: last_active
+            for chat_id, last_active in self._chat_last_active.items()
+            if now - last_active <= self.chat_data_ttl
+        }
+
+        if expired_chats:
+            logger.info("Expired idle conversations in %d chats", len(expired_chats))
+        return expired_chats
+
+    async def _notify_expired(
+        self, application: Application, expired_chats: dict[int, float]
+    ) -> None:
+        chat_ids = list(expired_chats)
+        results = await asyncio.gather(
+            *(
+                application.bot.send_message(
+                    chat_id=chat_id,
+                    text=SESSION_EXPIRED_TEXT.format(
+                        minutes=max(1, round(expired_chats[chat_id] / 60))
+                    ),
+                )
+                for chat_id in chat_ids
+            ),
+            return_exceptions=True,
+        )
+        for chat_id, result in zip(chat_ids, results):
+            if isinstance(result, TelegramError):
+                # Eg. the bot was removed from the chat
+                logger.debug("Session expiry notice to %s failed: %s", chat_id, result)
+            elif isinstance(result, BaseException):
+                raise result
+
+    async def _run(self, application: Application) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                expired_chats = self.sweep(application)
+                if expired_chats and self.notify:
+                    await self._notify_expired(application, expired_chats)
+            except Exception:
+                logger.exception("Session sweep failed")
+
+    def start(self, application: Application) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run(application))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+async def start_session_sweeper(application: Application) -> None:
+    """post_init hook starting the sweeper created by initialise_telebot."""
+    sweeper = application.bot_data.get("session_sweeper")
+    if sweeper is not None:
+        sweeper.start(application)
+
+
+async def stop_session_sweeper(application: Application) -> None:
+    sweeper = application.bot_data.get("session_sweeper")
+    if sweeper is not None:
+        await sweeper.stop()
+
+
+def create_session_sweeper() -> SessionSweeper | None:
+    if config.CONVERSATION_IDLE_TTL_SEC <= 0:
+        return None
+    return SessionSweeper(
+        interval=config.SESSION_SWEEP_INTERVAL_SEC,
+        chat_data_ttl=config.CONVERSATION_IDLE_TTL_SEC,
+        notify=config.SESSION_EXPIRED_NOTICE,
+    )
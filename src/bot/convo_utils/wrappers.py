@@ -1,8 +1,13 @@
+from functools import wraps
+
 from telegram import Update
 from telegram.ext import ContextTypes
 
+import config
+
 
 def group_only(handler):
+    @wraps(handler)
     async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
         if update.effective_chat.type in ["group", "supergroup"]:
             return await handler(update, context)
@@ -12,3 +17,17 @@ def group_only(handler):
             )
 
     return wrapper
+
+
+def admin_only(handler):
+    @wraps(handler)
+    async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
+        user = update.effective_user
+        if user is not None and user.username in config.ADMIN_USERNAMES:
+            return await handler(update, context)
+        else:
+            await update.message.reply_text(
+                "This command is only available to bot admins."
+            )
+
+    return wrapper
@@ -0,0 +1,4 @@
+from src.bot.sharding.front import run_sharded_webhook
+from src.bot.sharding.routing import rendezvous_worker, routing_key
+
+__all__ = ["rendezvous_worker", "routing_key", "run_sharded_webhook"]
@@ -0,0 +1,197 @@
+import asyncio
+import hmac
+import json
+import multiprocessing
+import signal
+import time
+from typing import Any
+
+import tornado.web
+from telegram import Bot
+
+from src.bot.convo_utils.profiling import schedule_profile_from_config, share_profiles
+from src.bot.sharding.routing import rendezvous_worker, routing_key
+from src.bot.sharding.update_store import UpdateStore
+from src.bot.sharding.worker import run_worker
+from src.lib.logger import get_logger
+
+logger = get_logger(__name__)
+
+SECRET_TOKEN_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+SUPERVISE_INTERVAL_SEC = 1.0
+# Don't restart a crash-looping worker more often than this
+RESTART_BACKOFF_SEC = 5.0
+STOP_TIMEOUT_SEC = 10.0
+PRUNE_INTERVAL_SEC = 3600.0
+
+
+class WorkerPool:
+    """Worker processes, each draining its own queue, restarted when they die."""
+
+    def __init__(self, size: int, store_path: str) -> None:
+        self.store_path = store_path
+        self._context = multiprocessing.get_context("spawn")
+        self.queues = [self._context.Queue() for _ in range(size)]
+        self._processes: list[multiprocessing.Process | None] = [None] * size
+        self._started_at = [0.0] * size
+
+    def _spawn(self, index: int) -> None:
+        if self._processes[index] is not None:
+            # A worker killed inside a blocking get() leaves the queue's reader
+            # lock held, so the replacement gets a new queue; updates stranded
+            # in the old one are replayed from the store
+            stale = self.queues[index]
+            self.queues[index] = self._context.Queue()
+            stale.close()
+            # Nothing reads the old queue any more, don't wait to flush it
+            stale.cancel_join_thread()
+        process = self._context.Process(
+            target=run_worker,
+            args=(index, self.queues[index], self.store_path),
+            name=f"splizy-worker-{index}",
+        )
+        process.start()
+        self._processes[index] = process
+        self._started_at[index] = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self.queues)
+
+    def start(self) -> None:
+        for index in range(len(self.queues)):
+            self._spawn(index)
+
+    def supervise(self) -> None:
+        # The replacement replays the dead worker's unfinished updates from the
+        # store, on a new queue; its in-memory conversation state is lost
+        for index, process in enumerate(self._processes):
+            if process is None or process.is_alive():
+                continue
+            if time.monotonic() - self._started_at[index] < RESTART_BACKOFF_SEC:
+                continue
+            logger.error(
+                "Worker %d exited with code %s, restarting", index, process.exitcode
+            )
+            self._spawn(index)
+
+    def worker_for(self, payload: dict[str, Any]) -> int:
+        return rendezvous_worker(routing_key(payload), len(self.queues))
+
+    def stop(self) -> None:
+        for updates in self.queues:
+            updates.put(None)
+        for process in self._processes:
+            if process is not None:
+                process.join(STOP_TIMEOUT_SEC)
+                if process.is_alive():
+                    process.terminate()
+
+
+class UpdateHandler(tornado.web.RequestHandler):
+    def initialize(
+        self, pool: WorkerPool, store: UpdateStore, secret_token: str | None
+    ) -> None:
+        self.pool = pool
+        self.store = store
+        self.secret_token = secret_token
+
+    def post(self) -> None:
+        if self.secret_token and not hmac.compare_digest(
+            self.request.headers.get(SECRET_TOKEN_HEADER, ""), self.secret_token
+        ):
+            raise tornado.web.HTTPError(403)
+        try:
+            body = self.request.body.decode("utf-8")
+            payload = json.loads(body)
+            update_id = int(payload["update_id"])
+        except (UnicodeDecodeError, json.JSONDecodeError, KeyError, TypeError):
+            raise tornado.web.HTTPError(400)
+
+        # Persist before the ACK; redeliveries are ACKed again but not re-queued
+        worker = self.pool.worker_for(payload)
+        if self.store.add(update_id, worker, body):
+            self.pool.queues[worker].put(payload)
+        else:
+            logger.info("Dropped duplicate update %d", update_id)
+        self.set_status(200)
+
+
+async def _set_webhook(token: str, webhook_url: str, secret_token: str | None) -> None:
+    async with Bot(token) as bot:
+        await bot.set_webhook(webhook_url, secret_token=secret_token)
+
+
+async def _serve_front(
+    pool: WorkerPool,
+    store: UpdateStore,
+    token: str,
+    webhook_url: str,
+    port: int,
+    secret_token: str | None,
+    retention_sec: float,
+) -> None:
+    handler_args = {"pool": pool, "store": store, "secret_token": secret_token}
+    server = tornado.web.Application([(r"/.*", UpdateHandler, handler_args)]).listen(
+        port
+    )
+    await _set_webhook(token, webhook_url, secret_token)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    logger.info("Webhook front on port %d routing to %d workers", port, len(pool))
+    pruned_at = 0.0
+    while not stop.is_set():
+        pool.supervise()
+        if time.monotonic() - pruned_at >= PRUNE_INTERVAL_SEC:
+            store.prune(retention_sec)
+            pruned_at = time.monotonic()
+        try:
+            await asyncio.wait_for(stop.wait(), SUPERVISE_INTERVAL_SEC)
+        except TimeoutError:
+            pass
+    server.stop()
+
+
+def run_sharded_webhook(
+    token: str,
+    webhook_url: str,
+    port: int,
+    workers: int,
+    store_path: str,
+    secret_token: str | None = None,
+    retention_sec: float = 24 * 3600,
+) -> None:
+    """
+    Receive webhook updates, persist them to the update store, ACK, then hand
+    each to one of `workers` processes, chosen by rendezvous hash of its chat id.
+    All updates of a chat go to the same worker, keeping their order and the
+    chat's ConversationHandler state.
+    """
+    store = UpdateStore(store_path)
+    # Profile requests live in the store too, shared by all workers
+    share_profiles(store_path)
+    schedule_profile_from_config(shared=True)
+    pool = WorkerPool(workers, store_path)
+    # Unfinished updates from the last run, replayed by the workers on start
+    pending = store.reassign_pending(pool.worker_for)
+    if pending:
+        logger.info("Recovering %d unfinished updates", pending)
+    pool.start()
+    try:
+        asyncio.run(
+            _serve_front(
+                pool,
+                store,
+                token,
+                webhook_url,
+                port,
+                secret_token,
+                retention_sec,
+            )
+        )
+    finally:
+        pool.stop()
+        store.close()
@@ -0,0 +1,34 @@
+from hashlib import blake2b
+from typing import Any
+
+
+def _weight(key: int, worker: int) -> int:
+    digest = blake2b(f"{key}:{worker}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def rendezvous_worker(key: int, workers: int) -> int:
+    """
+    Highest-random-weight hashing: every worker scores the key and the highest
+    wins. Changing the worker count only moves the keys of added/removed workers.
+    """
+    return max(range(workers), key=lambda worker: _weight(key, worker))
+
+
+def routing_key(payload: dict[str, Any]) -> int:
+    """
+    The chat id of a raw update, read without building telegram objects. Updates
+    without a chat (inline queries, polls) fall back to the sender's user id.
+    """
+    for field, value in payload.items():
+        if field == "update_id" or not isinstance(value, dict):
+            continue
+        chat = value.get("chat")
+        if chat is None and isinstance(value.get("message"), dict):
+            chat = value["message"].get("chat")
+        if isinstance(chat, dict) and "id" in chat:
+            return int(chat["id"])
+        sender = value.get("from") or value.get("user")
+        if isinstance(sender, dict) and "id" in sender:
+            return int(sender["id"])
+    return 0
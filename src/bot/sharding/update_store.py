@@ -0,0 +1,103 @@
+import json
+import sqlite3
+import time
+from collections.abc import Callable
+from typing import Any
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS updates (
+    update_id INTEGER PRIMARY KEY,
+    worker INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    received_at REAL NOT NULL,
+    done_at REAL,
+    attempts INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS updates_pending_idx
+    ON updates (worker, update_id) WHERE done_at IS NULL;
+"""
+
+
+class UpdateStore:
+    """
+    Durable log of received webhook updates, shared by the front (writer) and
+    the workers (which mark updates done). update_id is the primary key, so
+    Telegram redeliveries are dropped on insert. Rows not yet done are replayed
+    by their worker on start, recovering updates lost in a crash.
+    """
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, isolation_level=None, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Survives process crashes; a power loss may drop the last commits
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA_SQL)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(updates)")}
+        # Stores created before attempts were counted
+        if "attempts" not in columns:
+            self._conn.execute(
+                "ALTER TABLE updates ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0"
+            )
+
+    def add(self, update_id: int, worker: int, payload: str) -> bool:
+        """Store a new update; False if this update_id was already received."""
+        cursor = self._conn.execute(
+            "INSERT OR IGNORE INTO updates (update_id, worker, payload, received_at) "
+            "VALUES (?, ?, ?, ?)",
+            (update_id, worker, payload, time.time()),
+        )
+        return cursor.rowcount == 1
+
+    def pending(self, worker: int) -> list[tuple[int, str]]:
+        return self._conn.execute(
+            "SELECT update_id, payload FROM updates "
+            "WHERE worker = ? AND done_at IS NULL ORDER BY update_id",
+            (worker,),
+        ).fetchall()
+
+    def reassign_pending(self, route: Callable[[dict[str, Any]], int]) -> int:
+        """Re-route pending updates, eg. after the worker count changed."""
+        rows = self._conn.execute(
+            "SELECT update_id, worker, payload FROM updates WHERE done_at IS NULL"
+        ).fetchall()
+        moved = [
+            (worker, update_id)
+            for update_id, old_worker, payload in rows
+            if (worker := route(json.loads(payload))) != old_worker
+        ]
+        self._conn.executemany(
+            "UPDATE updates SET worker = ? WHERE update_id = ?", moved
+        )
+        return len(rows)
+
+    def is_done(self, update_id: int) -> bool:
+        row = self._conn.execute(
+            "SELECT done_at FROM updates WHERE update_id = ?", (update_id,)
+        ).fetchone()
+        return row is not None and row[0] is not None
+
+    def begin_attempt(self, update_id: int) -> int:
+        """Count a new attempt at handling an update; returns the attempts so far."""
+        row = self._conn.execute(
+            "UPDATE updates SET attempts = attempts + 1 WHERE update_id = ? "
+            "RETURNING attempts",
+            (update_id,),
+        ).fetchone()
+        return row[0] if row else 1
+
+    def mark_done(self, update_id: int) -> None:
+        self._conn.execute(
+            "UPDATE updates SET done_at = ? WHERE update_id = ?",
+            (time.time(), update_id),
+        )
+
+    def prune(self, retention_sec: float) -> int:
+        """Forget done updates older than the retention (the dedupe window)."""
+        cursor = self._conn.execute(
+            "DELETE FROM updates WHERE done_at IS NOT NULL AND received_at < ?",
+            (time.time() - retention_sec,),
+        )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        self._conn.close()
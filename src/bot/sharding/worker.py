@@ -0,0 +1,92 @@
+import asyncio
+import json
+import multiprocessing
+import signal
+from typing import Any
+
+from telegram import Update
+from telegram.ext import Application
+
+import config
+from src.bot.convo_utils.profiling import share_profiles
+from src.bot.sharding.update_store import UpdateStore
+from src.lib.logger import get_logger
+from src.lib.metrics import start_metrics_server
+
+logger = get_logger(__name__)
+
+
+async def _process(
+    app: Application, store: UpdateStore, payload: dict[str, Any]
+) -> None:
+    update_id = payload["update_id"]
+    # Replayed on start and still queued, or replayed by a previous run
+    if store.is_done(update_id):
+        return
+    # Counted before handling: an update that kills the worker would otherwise be
+    # replayed on every restart. It stays in the store until pruned
+    attempts = store.begin_attempt(update_id)
+    if attempts > config.UPDATE_MAX_ATTEMPTS:
+        logger.error(
+            "Dropping update %d: handling it was cut short %d times",
+            update_id,
+            attempts - 1,
+        )
+        store.mark_done(update_id)
+        return
+    # Handler errors go to the error handlers; the update is not retried
+    await app.process_update(Update.de_json(payload, app.bot))
+    store.mark_done(update_id)
+
+
+async def _serve(
+    app: Application, index: int, updates: multiprocessing.Queue, store: UpdateStore
+) -> None:
+    loop = asyncio.get_running_loop()
+    async with app:
+        # Application.start() skips the hooks run_webhook/run_polling would call
+        if app.post_init:
+            await app.post_init(app)
+        await app.start()
+        try:
+            pending = store.pending(index)
+            if pending:
+                logger.info("Worker %d replaying %d updates", index, len(pending))
+            for _, payload in pending:
+                await _process(app, store, json.loads(payload))
+            while True:
+                payload: dict[str, Any] | None = await loop.run_in_executor(
+                    None, updates.get
+                )
+                if payload is None:
+                    break
+                await _process(app, store, payload)
+        finally:
+            await app.stop()
+            if app.post_shutdown:
+                await app.post_shutdown(app)
+
+
+def run_worker(index: int, updates: multiprocessing.Queue, store_path: str) -> None:
+    """
+    Worker process entry point: a full application without an updater, fed raw
+    updates by the front. Updates are processed one at a time and marked done in
+    the update store. A None payload stops the worker.
+    """
+    # The supervisor handles Ctrl+C and tells workers to stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    from src.bot.telebot import initialise_telebot
+
+    if config.METRICS_PORT:
+        # One port per worker: METRICS_PORT, METRICS_PORT + 1, ...
+        start_metrics_server(config.METRICS_PORT + index)
+    # /profile on any worker arms them all; PROFILE_ON_START is armed by the front
+    share_profiles(store_path)
+    app = initialise_telebot(with_updater=False)
+    logger.info("Worker %d started", index)
+    store = UpdateStore(store_path)
+    try:
+        asyncio.run(_serve(app, index, updates, store))
+    finally:
+        store.close()
+    logger.info("Worker %d stopped", index)
@@ -1,22 +1,89 @@
-from telegram.ext import ApplicationBuilder
+from telegram import Bot, Update
+from telegram.ext import (
+    AIORateLimiter,
+    Application,
+    ApplicationBuilder,
+    ContextTypes,
+    TypeHandler,
+)
 
-from config import TELEBOT_TOKEN
+from config import (
+    CONVERSATION_IDLE_TTL_SEC,
+    TELEBOT_TOKEN,
+    TELEGRAM_MAX_RETRIES,
+    TELEGRAM_RATE_LIMITER,
+)
+from src.bot.chat_data import ChatData
+from src.bot.convo_handlers.Admin import Admin
 from src.bot.convo_handlers.Base import BaseCommands
 from src.bot.convo_handlers.ManageBills import ManageBills
 from src.bot.convo_handlers.RegisterUsers import RegisterUsers
 from src.bot.convo_handlers.SetCurrency import SetCurrency
 from src.bot.convo_handlers.Settleup import Settleup
+from src.bot.convo_utils.instrumentation import (
+    TimedHTTPXRequest,
+    start_loop_watchdog,
+    stop_loop_watchdog,
+)
+from src.bot.convo_utils.profiling import schedule_profile_from_config
+from src.bot.convo_utils.session_sweeper import (
+    create_session_sweeper,
+    start_session_sweeper,
+    stop_session_sweeper,
+)
 
 
-def initialise_telebot():
-    app = ApplicationBuilder().token(TELEBOT_TOKEN).concurrent_updates(False).build()
+async def _post_init(application: Application) -> None:
+    await start_loop_watchdog(application)
+    await start_session_sweeper(application)
+
+
+async def _post_shutdown(application: Application) -> None:
+    await stop_session_sweeper(application)
+    await stop_loop_watchdog(application)
+
+
+def initialise_telebot(bot: Bot | None = None, with_updater: bool = True):
+    # A prebuilt bot (eg. one backed by a fake request, see benchmarks/load_test.py)
+    # replaces the token-based one
+    schedule_profile_from_config()
+    builder = ApplicationBuilder().context_types(ContextTypes(chat_data=ChatData))
+    if bot is None:
+        builder = builder.token(TELEBOT_TOKEN).request(
+            TimedHTTPXRequest(connection_pool_size=256)
+        )
+        if TELEGRAM_RATE_LIMITER:
+            # Delays calls to stay within the global and per-group flood limits
+            builder = builder.rate_limiter(
+                AIORateLimiter(max_retries=TELEGRAM_MAX_RETRIES)
+            )
+    else:
+        builder = builder.bot(bot)
+    if not with_updater:
+        # Sharded workers get updates from the webhook front (src/bot/sharding)
+        builder = builder.updater(None)
+    app = (
+        builder.concurrent_updates(False)
+        .post_init(_post_init)
+        .post_shutdown(_post_shutdown)
+        .build()
+    )
     conversations = [
         BaseCommands(),
+        Admin(),
         ManageBills(),
         RegisterUsers(),
         SetCurrency(),
         Settleup(),
     ]
+    sweeper = create_session_sweeper()
     for convo in conversations:
-        app.add_handler(convo.get_convo_handler())
+        handler = convo.get_convo_handler()
+        app.add_handler(handler)
+        if sweeper is not None:
+            sweeper.register(handler, convo.idle_ttl_sec or CONVERSATION_IDLE_TTL_SEC)
+    if sweeper is not None:
+        # Group -1 runs before the conversations, for every update
+        app.add_handler(TypeHandler(Update, sweeper.touch), group=-1)
+        app.bot_data["session_sweeper"] = sweeper
     return app
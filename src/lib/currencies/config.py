@@ -1,12 +1,17 @@
 import json
 import os
 from datetime import timedelta
+from functools import cache
 from pathlib import Path
 
 EXCHANGE_RATES_PUBLIC_ENDPOINT = "https://api.fxratesapi.com/latest"
 EXCHANGE_RATES_BASE = "SGD"
 EXCHANGE_RATES_FILE_PATH = Path(__file__).with_name("exchange_rates.json")
 EXCHANGE_RATES_MAX_AGE = timedelta(days=1)
+# Set to false to always use the cached rates file (offline runs, load tests)
+EXCHANGE_RATES_AUTO_REFRESH = (
+    os.environ.get("EXCHANGE_RATES_AUTO_REFRESH", "true").lower() == "true"
+)
 
 # Non-travel assets/instruments we do not treat as user-selectable fiat currencies.
 EXCLUDED_NON_FIAT_CODES = {
@@ -201,6 +206,7 @@ KNOWN_CURRENCY_SHORTHANDS = {
 }
 
 
+@cache
 def _read_all_exchange_rate_codes() -> list[str]:
     try:
         payload = json.loads(EXCHANGE_RATES_FILE_PATH.read_text(encoding="utf-8"))
@@ -224,20 +230,29 @@ def _read_all_exchange_rate_codes() -> list[str]:
     return sorted(result)
 
 
-ALL_RATE_CODES = _read_all_exchange_rate_codes()
+# Currency tables are built from the exchange rates cache on first use rather than
+# at import, to keep bot startup fast.
+@cache
+def get_all_currency_codes() -> dict[str, str]:
+    return {
+        code: KNOWN_CURRENCY_DESCRIPTIONS.get(code, code)
+        for code in _read_all_exchange_rate_codes()
+    }
 
-ALL_CURRENCY_CODES = {
-    code: KNOWN_CURRENCY_DESCRIPTIONS.get(code, code) for code in ALL_RATE_CODES
-}
 
-ALL_CURRENCY_SHORTHAND_MAPPING = {
-    code: KNOWN_CURRENCY_SHORTHANDS.get(code, code) for code in ALL_RATE_CODES
-}
+@cache
+def get_currency_shorthand_mapping() -> dict[str, str]:
+    return {
+        code: KNOWN_CURRENCY_SHORTHANDS.get(code, code)
+        for code in _read_all_exchange_rate_codes()
+    }
 
-COMMON_CURRENCY_CODES = {
-    code: ALL_CURRENCY_CODES[code]
-    for code in TELEGRAM_TOP_CURRENCY_CODES
-    if code in ALL_CURRENCY_CODES
-}
 
-CURRENCY_SHORTHAND_MAPPING = ALL_CURRENCY_SHORTHAND_MAPPING
+@cache
+def get_common_currency_codes() -> dict[str, str]:
+    all_currency_codes = get_all_currency_codes()
+    return {
+        code: all_currency_codes[code]
+        for code in TELEGRAM_TOP_CURRENCY_CODES
+        if code in all_currency_codes
+    }
@@ -4,6 +4,7 @@ from urllib.parse import urlencode
 from urllib.request import urlopen
 
 from src.lib.currencies.config import (
+    EXCHANGE_RATES_AUTO_REFRESH,
     EXCHANGE_RATES_BASE,
     EXCHANGE_RATES_FILE_PATH,
     EXCHANGE_RATES_PUBLIC_ENDPOINT,
@@ -11,10 +12,12 @@ from src.lib.currencies.config import (
 from src.lib.currencies.model import ExchangeRatesApiResponse
 from src.lib.currencies.utils import is_cache_stale, read_cached_exchange_rates
 from src.lib.logger import get_logger
+from src.lib.metrics import timed_phase
 
 logger = get_logger(__name__)
 
 
+@timed_phase("provider")
 def refresh_exchange_rates_if_stale() -> ExchangeRatesApiResponse | None:
     """
     Refresh exchange rates from API if cache is stale.
@@ -24,6 +27,8 @@ def refresh_exchange_rates_if_stale() -> ExchangeRatesApiResponse | None:
     cached_payload = read_cached_exchange_rates()
     if cached_payload is not None and not is_cache_stale(cached_payload):
         return cached_payload  # type: ignore[return-value]
+    if not EXCHANGE_RATES_AUTO_REFRESH:
+        return cached_payload  # type: ignore[return-value]
 
     params = {"base": EXCHANGE_RATES_BASE}
     url = f"{EXCHANGE_RATES_PUBLIC_ENDPOINT}?{urlencode(params)}"
@@ -0,0 +1,20 @@
+from src.lib.metrics.histogram import LogLinearHistogram
+from src.lib.metrics.profiler import StackSampler, write_collapsed
+from src.lib.metrics.registry import MetricsRegistry, metrics
+from src.lib.metrics.server import start_metrics_server
+from src.lib.metrics.timing import PHASES, collect_phases, phase, timed_phase
+from src.lib.metrics.watchdog import LoopWatchdog
+
+__all__ = [
+    "LogLinearHistogram",
+    "MetricsRegistry",
+    "metrics",
+    "start_metrics_server",
+    "PHASES",
+    "collect_phases",
+    "phase",
+    "timed_phase",
+    "LoopWatchdog",
+    "StackSampler",
+    "write_collapsed",
+]
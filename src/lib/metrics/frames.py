@@ -0,0 +1,17 @@
+from pathlib import Path
+from types import CodeType, FrameType
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+_PROJECT_PREFIX = str(PROJECT_ROOT)
+
+
+def relative_filename(code: CodeType) -> str:
+    filename = code.co_filename
+    if filename.startswith(_PROJECT_PREFIX):
+        return str(Path(filename).relative_to(PROJECT_ROOT))
+    return filename
+
+
+def is_project_frame(frame: FrameType) -> bool:
+    filename = frame.f_code.co_filename
+    return filename.startswith(_PROJECT_PREFIX) and "site-packages" not in filename
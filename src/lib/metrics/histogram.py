@@ -0,0 +1,99 @@
+import threading
+from collections.abc import Iterable
+
+# Prometheus bucket bounds (seconds) exported for every histogram.
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+
+class LogLinearHistogram:
+    """
+    HDR-style latency histogram over integer microseconds.
+
+    Values below 2 * SUB_BUCKETS are counted exactly; above that, every power-of-two
+    range is split into SUB_BUCKETS linear sub-buckets, so any recorded value is
+    known to within 1 / SUB_BUCKETS (~3%) regardless of magnitude. Only non-empty
+    buckets are stored.
+    """
+
+    SUB_BUCKET_BITS = 5
+    SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+    def __init__(self) -> None:
+        self._counts: dict[int, int] = {}
+        self._lock = threading.Lock()
+        self.count = 0
+        self.sum = 0.0
+
+    @classmethod
+    def _index(cls, value_us: int) -> int:
+        if value_us < 2 * cls.SUB_BUCKETS:
+            return value_us
+        shift = value_us.bit_length() - cls.SUB_BUCKET_BITS - 1
+        return shift * cls.SUB_BUCKETS + (value_us >> shift)
+
+    @classmethod
+    def _upper_bound_us(cls, index: int) -> int:
+        if index < 2 * cls.SUB_BUCKETS:
+            return index
+        shift = index // cls.SUB_BUCKETS - 1
+        sub_bucket = index - shift * cls.SUB_BUCKETS
+        return ((sub_bucket + 1) << shift) - 1
+
+    def record(self, seconds: float) -> None:
+        index = self._index(max(0, round(seconds * 1_000_000)))
+        with self._lock:
+            self._counts[index] = self._counts.get(index, 0) + 1
+            self.count += 1
+            self.sum += seconds
+
+    def _snapshot(self) -> tuple[list[tuple[int, int]], int, float]:
+        with self._lock:
+            return sorted(self._counts.items()), self.count, self.sum
+
+    def percentile(self, percent: float) -> float:
+        """Upper bound (seconds) of the bucket holding the given percentile."""
+        buckets, count, _ = self._snapshot()
+        if not count:
+            return 0.0
+        target = max(1, round(count * percent / 100))
+        seen = 0
+        for index, bucket_count in buckets:
+            seen += bucket_count
+            if seen >= target:
+                return self._upper_bound_us(index) / 1_000_000
+        return self._upper_bound_us(buckets[-1][0]) / 1_000_000
+
+    def cumulative_counts(
+        self, bounds: Iterable[float] = DEFAULT_BUCKETS
+    ) -> tuple[list[tuple[float, int]], int, float]:
+        """(bound, observations <= bound) pairs plus total count and sum."""
+        buckets, count, total = self._snapshot()
+        result = []
+        position = 0
+        seen = 0
+        for bound in bounds:
+            bound_us = bound * 1_000_000
+            while (
+                position < len(buckets)
+                and self._upper_bound_us(buckets[position][0]) <= bound_us
+            ):
+                seen += buckets[position][1]
+                position += 1
+            result.append((bound, seen))
+        return result, count, total
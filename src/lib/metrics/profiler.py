@@ -0,0 +1,58 @@
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+
+from src.lib.metrics.frames import relative_filename
+
+
+def _collapse(frame: FrameType) -> str:
+    labels = []
+    current: FrameType | None = frame
+    while current is not None:
+        code = current.f_code
+        labels.append(
+            f"{code.co_name} ({relative_filename(code)}:{code.co_firstlineno})"
+        )
+        current = current.f_back
+    return ";".join(reversed(labels))
+
+
+class StackSampler:
+    """
+    Samples one thread's Python stack every `interval` seconds from a background
+    thread, aggregating identical stacks. Nothing runs on the sampled thread, so
+    the overhead is one sys._current_frames() call per sample.
+    """
+
+    def __init__(self, thread_id: int, interval: float) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter[str] = Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> Counter[str]:
+        self._stopped.set()
+        self._thread.join()
+        return self.samples
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.samples[_collapse(frame)] += 1
+
+
+def write_collapsed(samples: Counter[str], path: Path) -> None:
+    """Write samples in the collapsed-stack format read by flamegraph.pl and speedscope."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as file:
+        for stack, count in samples.most_common():
+            file.write(f"{stack} {count}\n")
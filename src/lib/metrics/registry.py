@@ -0,0 +1,90 @@
+import threading
+
+from src.lib.metrics.histogram import LogLinearHistogram
+
+LabelSet = tuple[tuple[str, str], ...]
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: LabelSet, extra: tuple[str, str] | None = None) -> str:
+    pairs = [*labels, extra] if extra else list(labels)
+    if not pairs:
+        return ""
+    return (
+        "{"
+        + ",".join(f'{key}="{_escape_label_value(value)}"' for key, value in pairs)
+        + "}"
+    )
+
+
+def _format_bound(bound: float) -> str:
+    return f"{bound:g}"
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._histograms: dict[str, dict[LabelSet, LogLinearHistogram]] = {}
+        self._gauges: dict[str, dict[LabelSet, float]] = {}
+        self._help: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, help_text: str) -> None:
+        self._help[name] = help_text
+
+    def histogram(self, name: str, **labels: str) -> LogLinearHistogram:
+        label_set = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(label_set)
+            if histogram is None:
+                histogram = series[label_set] = LogLinearHistogram()
+        return histogram
+
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        self.histogram(name, **labels).record(seconds)
+
+    def set_gauge(self, name: str, value: float, **labels: str) -> None:
+        label_set = tuple(sorted(labels.items()))
+        with self._lock:
+            self._gauges.setdefault(name, {})[label_set] = value
+
+    def render_prometheus(self) -> str:
+        """Text exposition format (version 0.0.4) of every histogram and gauge."""
+        with self._lock:
+            snapshot = {
+                name: list(series.items()) for name, series in self._histograms.items()
+            }
+            gauges = {
+                name: list(series.items()) for name, series in self._gauges.items()
+            }
+
+        lines: list[str] = []
+        for name in sorted(snapshot):
+            if name in self._help:
+                lines.append(f"# HELP {name} {self._help[name]}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, histogram in sorted(snapshot[name]):
+                buckets, count, total = histogram.cumulative_counts()
+                for bound, seen in buckets:
+                    lines.append(
+                        f"{name}_bucket"
+                        f"{_format_labels(labels, ('le', _format_bound(bound)))} {seen}"
+                    )
+                lines.append(
+                    f"{name}_bucket{_format_labels(labels, ('le', '+Inf'))} {count}"
+                )
+                lines.append(f"{name}_sum{_format_labels(labels)} {total}")
+                lines.append(f"{name}_count{_format_labels(labels)} {count}")
+        for name in sorted(gauges):
+            if name in self._help:
+                lines.append(f"# HELP {name} {self._help[name]}")
+            lines.append(f"# TYPE {name} gauge")
+            for labels, value in sorted(gauges[name]):
+                lines.append(f"{name}{_format_labels(labels)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,42 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.lib.logger import get_logger
+from src.lib.metrics.registry import MetricsRegistry, metrics
+
+logger = get_logger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _make_handler(registry: MetricsRegistry) -> type[BaseHTTPRequestHandler]:
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args) -> None:
+            # Scrapes every few seconds would drown the bot logs
+            return
+
+    return MetricsHandler
+
+
+def start_metrics_server(
+    port: int, host: str = "0.0.0.0", registry: MetricsRegistry = metrics
+) -> ThreadingHTTPServer:
+    """Serve GET /metrics from a daemon thread, separate from the bot's event loop."""
+    server = ThreadingHTTPServer((host, port), _make_handler(registry))
+    thread = threading.Thread(
+        target=server.serve_forever, name="metrics-server", daemon=True
+    )
+    thread.start()
+    logger.info("Serving Prometheus metrics on port %d at /metrics", port)
+    return server
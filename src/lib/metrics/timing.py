@@ -0,0 +1,69 @@
+import inspect
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+from typing import Any, TypeVar
+
+# Where handler time goes; anything not covered by a phase is reported as "other".
+PHASES = ("db", "provider", "render", "telegram")
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_phase_totals: ContextVar[dict[str, float] | None] = ContextVar(
+    "splizy_phase_totals", default=None
+)
+_active_phase: ContextVar[str | None] = ContextVar("splizy_active_phase", default=None)
+
+
+@contextmanager
+def collect_phases() -> Iterator[dict[str, float]]:
+    """Accumulate phase timings of everything run inside the block into a dict."""
+    totals: dict[str, float] = {}
+    token = _phase_totals.set(totals)
+    try:
+        yield totals
+    finally:
+        _phase_totals.reset(token)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    totals = _phase_totals.get()
+    # Nested phases (eg. a repo method calling another) are owned by the outermost
+    # one, so no time is counted twice.
+    if totals is None or _active_phase.get() is not None:
+        yield
+        return
+
+    token = _active_phase.set(name)
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        totals[name] = totals.get(name, 0.0) + perf_counter() - start
+        _active_phase.reset(token)
+
+
+def timed_phase(name: str) -> Callable[[F], F]:
+    """Decorator form of `phase` for sync and async functions."""
+
+    def decorator(func: F) -> F:
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with phase(name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with phase(name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
@@ -0,0 +1,110 @@
+import asyncio
+import sys
+import threading
+import traceback
+from collections.abc import Callable
+from time import perf_counter
+from types import FrameType
+
+from src.lib.logger import get_logger
+from src.lib.metrics.frames import is_project_frame, relative_filename
+from src.lib.metrics.registry import metrics
+
+logger = get_logger(__name__)
+
+LOOP_LAG_SECONDS = "splizy_event_loop_lag_seconds"
+metrics.describe(LOOP_LAG_SECONDS, "How late the event loop ran a periodic heartbeat.")
+
+STACK_LIMIT = 20
+
+
+def _describe_frame(frame: FrameType) -> str:
+    return (
+        f"{relative_filename(frame.f_code)}:{frame.f_lineno} in {frame.f_code.co_name}"
+    )
+
+
+class LoopWatchdog:
+    """
+    Measures event-loop lag with a heartbeat coroutine, and from a separate thread
+    captures the loop thread's stack whenever a callback blocks it for longer than
+    `threshold` seconds. Each stall is logged once.
+
+    `describe_stack` can name what was running (eg. the bot handler) from the
+    blocked frames, innermost first.
+    """
+
+    def __init__(
+        self,
+        threshold: float,
+        interval: float,
+        describe_stack: Callable[[list[FrameType]], str | None] | None = None,
+    ) -> None:
+        self.threshold = threshold
+        self.interval = interval
+        self._describe_stack = describe_stack
+        self._last_beat = perf_counter()
+        self._loop_thread_id: int | None = None
+        self._task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        """Start monitoring the running event loop; call from within the loop."""
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = perf_counter()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._thread = threading.Thread(
+            target=self._watch, name="loop-watchdog", daemon=True
+        )
+        self._thread.start()
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _heartbeat(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            self._last_beat = perf_counter()
+            await asyncio.sleep(self.interval)
+            metrics.observe(LOOP_LAG_SECONDS, max(0.0, loop.time() - expected))
+
+    def _watch(self) -> None:
+        reported_beat = None
+        while not self._stopped.wait(self.interval / 2):
+            last_beat = self._last_beat
+            blocked = perf_counter() - last_beat - self.interval
+            if blocked < self.threshold or last_beat == reported_beat:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            reported_beat = last_beat
+            self._report(blocked, frame)
+
+    def _report(self, blocked: float, frame: FrameType) -> None:
+        frames: list[FrameType] = []
+        current: FrameType | None = frame
+        while current is not None:
+            frames.append(current)
+            current = current.f_back
+
+        culprit = next((f for f in frames if is_project_frame(f)), frames[0])
+        running = self._describe_stack(frames) if self._describe_stack else None
+        stack = "".join(traceback.format_stack(frame, limit=STACK_LIMIT))
+        logger.warning(
+            "Event loop blocked for %.0fms+ in %s at %s (innermost: %s)\n"
+            "Stack (most recent call last):\n%s",
+            blocked * 1000,
+            running or "unknown callback",
+            _describe_frame(culprit),
+            _describe_frame(frames[0]),
+            stack,
+        )
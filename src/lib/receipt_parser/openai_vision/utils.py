@@ -2,8 +2,6 @@ import base64
 import json
 from typing import Any, Dict
 
-from openai import OpenAI
-
 import config
 from src.lib.receipt_parser.model import RECEIPT_JSON_SCHEMA
 from src.lib.receipt_parser.utils import RECEIPT_PARSER_INSTRUCTION
@@ -15,6 +13,9 @@ def extract_receipt_payload_with_openai_vision(image_bytes: bytes) -> Dict[str,
             "OPENAI_API_KEY is not configured while USE_MOCK_RECEIPT_PARSER is false"
         )
 
+    # Deferred import, the openai SDK is slow to import and only used by this provider
+    from openai import OpenAI
+
     image_base64 = base64.b64encode(image_bytes).decode("ascii")
     client = OpenAI(
         api_key=config.OPENAI_API_KEY,
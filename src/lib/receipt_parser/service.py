@@ -1,4 +1,5 @@
 import config
+from src.lib.metrics import timed_phase
 from src.lib.receipt_parser.google_gemini.service import (
     parse_receipt as parse_receipt_with_gemini,
 )
@@ -9,6 +10,7 @@ from src.lib.receipt_parser.openai_vision.service import (
 )
 
 
+@timed_phase("provider")
 def parse_receipt(image_bytes: bytes) -> Receipt:
     if config.USE_MOCK_RECEIPT_PARSER:
         return mock_parsed_receipt
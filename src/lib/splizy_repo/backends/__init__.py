@@ -0,0 +1,23 @@
+import config
+from src.lib.splizy_repo.backends.base import RepoBackend
+
+
+def create_backend() -> RepoBackend:
+    # Implementations are imported lazily so e.g. the sqlite backend never needs
+    # Supabase credentials.
+    backend = config.REPO_BACKEND
+    if backend == "supabase":
+        from src.lib.splizy_repo.backends.supabase_backend import SupabaseBackend
+
+        return SupabaseBackend()
+    if backend == "sqlite":
+        from src.lib.splizy_repo.backends.sqlite_backend import SqliteBackend
+
+        return SqliteBackend(config.SQLITE_DB_PATH)
+
+    raise RuntimeError(
+        f"Unsupported repo backend '{backend}'. Supported backends: supabase, sqlite"
+    )
+
+
+__all__ = ["RepoBackend", "create_backend"]
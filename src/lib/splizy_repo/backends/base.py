@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Any, Sequence
+
+from src.lib.splizy_repo.model import (
+    ExpenseFilter,
+    ExpenseId,
+    ExpenseInsert,
+    ExpenseUpdate,
+    GroupId,
+    GroupUpdate,
+    GroupUpsert,
+    SplizyUserInsert,
+    TempReceiptId,
+    TempReceiptInsert,
+    TempReceiptUpdate,
+)
+from src.lib.splizy_repo.tracing import traced_query
+
+Row = dict[str, Any]
+
+# Table each backend method reads or writes, used to label query traces
+QUERY_TABLES: dict[str, str] = {
+    "upsert_group": "groups",
+    "get_group": "groups",
+    "update_group": "groups",
+    "list_group_users": "splizy_users",
+    "insert_group_users": "splizy_users",
+    "delete_group_users": "splizy_users",
+    "list_expenses": "expenses",
+    "list_expenses_page": "expenses",
+    "list_expenses_after": "expenses",
+    "get_expense": "expenses",
+    "insert_expense": "expenses",
+    "insert_expenses": "expenses",
+    "update_expense": "expenses",
+    "delete_expense": "expenses",
+    "aggregate_balances": "expenses",
+    "count_user_involvements": "expenses",
+    "expense_totals": "expenses",
+    "get_temp_receipt": "temp_receipts",
+    "get_latest_temp_receipt": "temp_receipts",
+    "insert_temp_receipt": "temp_receipts",
+    "update_temp_receipt": "temp_receipts",
+}
+
+
+class RepoBackend(ABC):
+    """
+    Storage behind SplizyRepo. Implementations return raw rows shaped like the
+    Supabase tables (JSON columns decoded), and SplizyRepo maps them onto DTOs.
+    A `columns` of None means every column.
+
+    Every query method an implementation defines is traced, see tracing.py.
+    """
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        for operation, table in QUERY_TABLES.items():
+            method = cls.__dict__.get(operation)
+            if method is not None:
+                setattr(cls, operation, traced_query(operation, table, method))
+
+    @abstractmethod
+    def upsert_group(self, payload: GroupUpsert) -> None: ...
+
+    @abstractmethod
+    def get_group(self, group_id: GroupId) -> Row | None: ...
+
+    @abstractmethod
+    def update_group(self, group_id: GroupId, payload: GroupUpdate) -> Row | None: ...
+
+    @abstractmethod
+    def list_group_users(self, group_id: GroupId) -> list[Row]: ...
+
+    @abstractmethod
+    def insert_group_users(self, payload: list[SplizyUserInsert]) -> list[Row]: ...
+
+    @abstractmethod
+    def delete_group_users(self, group_id: GroupId, usernames: list[str]) -> None: ...
+
+    @abstractmethod
+    def list_expenses(
+        self, group_id: GroupId, columns: Sequence[str] | None
+    ) -> list[Row]: ...
+
+    @abstractmethod
+    def list_expenses_page(
+        self,
+        group_id: GroupId,
+        columns: Sequence[str],
+        offset: int,
+        limit: int,
+        criteria: ExpenseFilter | None,
+    ) -> list[Row]: ...
+
+    @abstractmethod
+    def list_expenses_after(
+        self,
+        group_id: GroupId,
+        columns: Sequence[str],
+        after: tuple[str, ExpenseId] | None,
+        limit: int,
+    ) -> list[Row]:
+        """Oldest first, the `limit` expenses after (created_at, id) `after`."""
+
+    @abstractmethod
+    def get_expense(
+        self, expense_id: ExpenseId, columns: Sequence[str] | None
+    ) -> Row | None: ...
+
+    @abstractmethod
+    def insert_expense(self, payload: ExpenseInsert) -> Row | None: ...
+
+    @abstractmethod
+    def insert_expenses(self, payload: list[ExpenseInsert]) -> int:
+        """Insert all rows in one transaction, or none; returns the row count."""
+
+    @abstractmethod
+    def update_expense(self, expense_id: ExpenseId, payload: ExpenseUpdate) -> None: ...
+
+    @abstractmethod
+    def delete_expense(self, expense_id: ExpenseId) -> None: ...
+
+    @abstractmethod
+    def aggregate_balances(self, group_id: GroupId) -> list[Row]: ...
+
+    @abstractmethod
+    def count_user_involvements(
+        self, group_id: GroupId, usernames: list[str]
+    ) -> list[Row]: ...
+
+    @abstractmethod
+    def expense_totals(
+        self, group_id: GroupId, criteria: ExpenseFilter | None
+    ) -> list[Row]: ...
+
+    @abstractmethod
+    def get_temp_receipt(self, temp_receipt_id: TempReceiptId) -> Row | None: ...
+
+    @abstractmethod
+    def get_latest_temp_receipt(self, group_id: GroupId) -> Row | None: ...
+
+    @abstractmethod
+    def insert_temp_receipt(self, payload: TempReceiptInsert) -> Row | None: ...
+
+    @abstractmethod
+    def update_temp_receipt(
+        self, temp_receipt_id: TempReceiptId, payload: TempReceiptUpdate
+    ) -> None: ...
@@ -0,0 +1,558 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Mapping, Sequence
+
+from src.lib.splizy_repo.backends.base import RepoBackend, Row
+from src.lib.splizy_repo.model import (
+    ExpenseFilter,
+    ExpenseId,
+    ExpenseInsert,
+    ExpenseUpdate,
+    GroupId,
+    GroupUpdate,
+    GroupUpsert,
+    SplizyUserInsert,
+    TempReceiptId,
+    TempReceiptInsert,
+    TempReceiptUpdate,
+)
+
+_NOW_SQL = "strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now')"
+
+SCHEMA_SQL = f"""
+CREATE TABLE IF NOT EXISTS groups (
+    id INTEGER PRIMARY KEY,
+    expense_currency TEXT,
+    settleup_currency TEXT,
+    created_at TEXT NOT NULL DEFAULT ({_NOW_SQL})
+);
+
+CREATE TABLE IF NOT EXISTS splizy_users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    group_id INTEGER NOT NULL,
+    username TEXT NOT NULL,
+    created_at TEXT NOT NULL DEFAULT ({_NOW_SQL})
+);
+CREATE INDEX IF NOT EXISTS splizy_users_group_id_idx ON splizy_users (group_id);
+
+CREATE TABLE IF NOT EXISTS expenses (
+    id TEXT PRIMARY KEY,
+    group_id INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    amount REAL NOT NULL,
+    paid_by TEXT NOT NULL,
+    currency TEXT NOT NULL,
+    is_equal_split INTEGER NOT NULL,
+    payees TEXT NOT NULL CHECK (json_valid(payees)),
+    multiplier TEXT,
+    receipt TEXT CHECK (receipt IS NULL OR json_valid(receipt)),
+    receipt_allocation TEXT CHECK (
+        receipt_allocation IS NULL OR json_valid(receipt_allocation)
+    ),
+    created_at TEXT NOT NULL DEFAULT ({_NOW_SQL})
+);
+CREATE INDEX IF NOT EXISTS expenses_group_id_created_at_idx
+    ON expenses (group_id, created_at);
+CREATE INDEX IF NOT EXISTS expenses_group_id_paid_by_idx
+    ON expenses (group_id, paid_by);
+-- /view payer filters match usernames case-insensitively, as on Telegram
+CREATE INDEX IF NOT EXISTS expenses_group_id_paid_by_nocase_idx
+    ON expenses (group_id, paid_by COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS expenses_group_id_currency_idx
+    ON expenses (group_id, currency);
+CREATE INDEX IF NOT EXISTS expenses_group_id_amount_idx
+    ON expenses (group_id, amount);
+
+-- Trigram index over titles for /view title search, the counterpart of pg_trgm
+CREATE VIRTUAL TABLE IF NOT EXISTS expenses_title_fts USING fts5(
+    title, content='expenses', content_rowid='rowid', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS expenses_title_fts_insert AFTER INSERT ON expenses BEGIN
+    INSERT INTO expenses_title_fts (rowid, title) VALUES (new.rowid, new.title);
+END;
+CREATE TRIGGER IF NOT EXISTS expenses_title_fts_delete AFTER DELETE ON expenses BEGIN
+    INSERT INTO expenses_title_fts (expenses_title_fts, rowid, title)
+    VALUES ('delete', old.rowid, old.title);
+END;
+CREATE TRIGGER IF NOT EXISTS expenses_title_fts_update
+AFTER UPDATE OF title ON expenses BEGIN
+    INSERT INTO expenses_title_fts (expenses_title_fts, rowid, title)
+    VALUES ('delete', old.rowid, old.title);
+    INSERT INTO expenses_title_fts (rowid, title) VALUES (new.rowid, new.title);
+END;
+
+CREATE TABLE IF NOT EXISTS temp_receipts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    group_id INTEGER NOT NULL,
+    title TEXT,
+    paid_by TEXT,
+    expense_id TEXT,
+    last_receipt TEXT NOT NULL CHECK (json_valid(last_receipt)),
+    created_at TEXT NOT NULL DEFAULT ({_NOW_SQL})
+);
+CREATE INDEX IF NOT EXISTS temp_receipts_group_id_created_at_idx
+    ON temp_receipts (group_id, created_at);
+"""
+
+# Mirrors migrations/001_aggregate_balances.sql using SQLite's JSON1 functions.
+AGGREGATE_BALANCES_SQL = """
+SELECT username, currency, SUM(paid) AS paid, SUM(owed) AS owed
+FROM (
+    SELECT e.paid_by AS username, e.currency, e.amount AS paid, 0.0 AS owed
+    FROM expenses e
+    WHERE e.group_id = :group_id
+    UNION ALL
+    SELECT json_extract(p.value, '$.user') AS username, e.currency,
+           0.0 AS paid, json_extract(p.value, '$.amount') AS owed
+    FROM expenses e, json_each(e.payees) p
+    WHERE e.group_id = :group_id
+)
+GROUP BY username, currency
+"""
+
+# Mirrors migrations/002_user_involvements.sql; usernames are bound as a JSON array.
+COUNT_USER_INVOLVEMENTS_SQL = """
+SELECT u.value AS username, COUNT(e.id) AS expense_count
+FROM json_each(:usernames) u
+LEFT JOIN expenses e
+    ON e.group_id = :group_id
+    AND (
+        e.paid_by = u.value
+        OR EXISTS (
+            SELECT 1 FROM json_each(e.payees) p
+            WHERE json_extract(p.value, '$.user') = u.value
+        )
+    )
+GROUP BY u.value
+"""
+
+# Mirrors expense_totals in migrations/005_expense_search.sql; {filters} comes
+# from _filter_sql
+EXPENSE_TOTALS_SQL = """
+SELECT currency, paid_by, COUNT(*) AS expense_count, SUM(amount) AS total,
+       MAX(created_at) AS last_created_at
+FROM expenses
+WHERE group_id = :group_id{filters}
+GROUP BY currency, paid_by
+"""
+
+# Rows per multi-row INSERT, well within SQLite's bound parameter limit
+INSERT_BATCH_ROWS = 200
+
+# Shortest title query the trigram index can answer, shorter ones scan the group
+_TRIGRAM_MIN_CHARS = 3
+
+TABLE_COLUMNS: dict[str, frozenset[str]] = {
+    "groups": frozenset({"id", "expense_currency", "settleup_currency", "created_at"}),
+    "splizy_users": frozenset({"id", "group_id", "username", "created_at"}),
+    "expenses": frozenset(
+        {
+            "id",
+            "group_id",
+            "title",
+            "amount",
+            "paid_by",
+            "currency",
+            "is_equal_split",
+            "payees",
+            "multiplier",
+            "receipt",
+            "receipt_allocation",
+            "created_at",
+        }
+    ),
+    "temp_receipts": frozenset(
+        {
+            "id",
+            "group_id",
+            "title",
+            "paid_by",
+            "expense_id",
+            "last_receipt",
+            "created_at",
+        }
+    ),
+}
+JSON_COLUMNS = frozenset({"payees", "receipt", "receipt_allocation", "last_receipt"})
+BOOL_COLUMNS = frozenset({"is_equal_split"})
+
+
+def _checked_columns(table: str, columns: Sequence[str]) -> tuple[str, ...]:
+    unknown = [column for column in columns if column not in TABLE_COLUMNS[table]]
+    if unknown:
+        raise ValueError(f"Unknown columns for {table}: {', '.join(unknown)}")
+    return tuple(columns)
+
+
+# SQL text is built once per (table, columns) shape so sqlite3's statement cache
+# keeps reusing the same prepared statements.
+@lru_cache(maxsize=None)
+def _select_sql(table: str, columns: tuple[str, ...] | None, suffix: str) -> str:
+    column_sql = ", ".join(_checked_columns(table, columns)) if columns else "*"
+    return f"SELECT {column_sql} FROM {table} {suffix}"
+
+
+@lru_cache(maxsize=None)
+def _insert_sql(table: str, columns: tuple[str, ...], on_conflict: str = "") -> str:
+    placeholders = ", ".join("?" for _ in columns)
+    return (
+        f"INSERT INTO {table} ({', '.join(_checked_columns(table, columns))}) "
+        f"VALUES ({placeholders}) {on_conflict} RETURNING *"
+    )
+
+
+@lru_cache(maxsize=None)
+def _insert_many_sql(table: str, columns: tuple[str, ...], rows: int) -> str:
+    row_placeholders = f"({', '.join('?' for _ in columns)})"
+    return (
+        f"INSERT INTO {table} ({', '.join(_checked_columns(table, columns))}) "
+        f"VALUES {', '.join(row_placeholders for _ in range(rows))}"
+    )
+
+
+@lru_cache(maxsize=None)
+def _update_sql(table: str, columns: tuple[str, ...], returning: str = "") -> str:
+    assignments = ", ".join(
+        f"{column} = ?" for column in _checked_columns(table, columns)
+    )
+    return f"UPDATE {table} SET {assignments} WHERE id = ? {returning}"
+
+
+def _filter_sql(criteria: ExpenseFilter | None) -> tuple[str, dict[str, Any]]:
+    """
+    Conditions for criteria, to append to a WHERE clause on expenses, and their
+    named parameters. Only the criteria set appear, so each combination is one
+    cached statement. Usernames match case-insensitively.
+    """
+    if criteria is None:
+        return "", {}
+    clauses: list[str] = []
+    params: dict[str, Any] = {}
+    if criteria.paid_by is not None:
+        clauses.append("paid_by = :paid_by COLLATE NOCASE")
+        params["paid_by"] = criteria.paid_by
+    if criteria.participant is not None:
+        clauses.append(
+            "(paid_by = :participant COLLATE NOCASE OR EXISTS ("
+            "SELECT 1 FROM json_each(payees) p "
+            "WHERE json_extract(p.value, '$.user') = :participant COLLATE NOCASE "
+            "AND json_extract(p.value, '$.amount') > 0))"
+        )
+        params["participant"] = criteria.participant
+    if criteria.currency is not None:
+        clauses.append("currency = :currency")
+        params["currency"] = criteria.currency
+    if criteria.min_amount is not None:
+        clauses.append(f"amount {'>=' if criteria.min_inclusive else '>'} :min_amount")
+        params["min_amount"] = criteria.min_amount
+    if criteria.max_amount is not None:
+        clauses.append(f"amount {'<=' if criteria.max_inclusive else '<'} :max_amount")
+        params["max_amount"] = criteria.max_amount
+    if criteria.title:
+        if len(criteria.title) >= _TRIGRAM_MIN_CHARS:
+            # A quoted phrase of trigrams matches the title as a substring
+            clauses.append(
+                "rowid IN (SELECT rowid FROM expenses_title_fts "
+                "WHERE expenses_title_fts MATCH :title)"
+            )
+            params["title"] = '"' + criteria.title.replace('"', '""') + '"'
+        else:
+            clauses.append("instr(lower(title), lower(:title)) > 0")
+            params["title"] = criteria.title
+    return "".join(f" AND {clause}" for clause in clauses), params
+
+
+def _encode(column: str, value: Any) -> Any:
+    if column in JSON_COLUMNS and value is not None:
+        return json.dumps(value, separators=(",", ":"))
+    if column in BOOL_COLUMNS and value is not None:
+        return int(bool(value))
+    return value
+
+
+def _decode(row: sqlite3.Row | None) -> Row | None:
+    if row is None:
+        return None
+    decoded: Row = {}
+    for column in row.keys():
+        value = row[column]
+        if column in JSON_COLUMNS and value is not None:
+            value = json.loads(value)
+        elif column in BOOL_COLUMNS and value is not None:
+            value = bool(value)
+        decoded[column] = value
+    return decoded
+
+
+class SqliteBackend(RepoBackend):
+    """
+    Embedded backend with the same tables as Supabase, for single-host deployments
+    and offline runs. JSON columns are stored as JSON1 text.
+    """
+
+    def __init__(self, path: str):
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=256,
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        has_title_index = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'expenses_title_fts'"
+        ).fetchone()
+        self._conn.executescript(SCHEMA_SQL)
+        self._add_missing_columns()
+        if not has_title_index:
+            # Index titles saved before the trigram index existed
+            self._conn.execute(
+                "INSERT INTO expenses_title_fts (expenses_title_fts) VALUES ('rebuild')"
+            )
+
+    def _add_missing_columns(self) -> None:
+        # Columns added after a database file was created (see migrations/)
+        existing = {
+            row["name"] for row in self._conn.execute("PRAGMA table_info(expenses)")
+        }
+        if "receipt_allocation" not in existing:
+            self._conn.execute(
+                "ALTER TABLE expenses ADD COLUMN receipt_allocation TEXT "
+                "CHECK (receipt_allocation IS NULL OR json_valid(receipt_allocation))"
+            )
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _fetchone(
+        self, sql: str, params: Sequence[Any] | Mapping[str, Any]
+    ) -> Row | None:
+        with self._lock:
+            return _decode(self._conn.execute(sql, params).fetchone())
+
+    def _fetchall(
+        self, sql: str, params: Sequence[Any] | Mapping[str, Any]
+    ) -> list[Row]:
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [_decode(row) for row in rows]
+
+    def _execute(self, sql: str, params: Sequence[Any]) -> None:
+        with self._lock:
+            self._conn.execute(sql, params)
+
+    def _insert(
+        self, conn: sqlite3.Connection, table: str, payload: Mapping[str, Any]
+    ) -> Row | None:
+        columns = tuple(payload.keys())
+        params = [_encode(column, payload[column]) for column in columns]
+        return _decode(conn.execute(_insert_sql(table, columns), params).fetchone())
+
+    def _update(self, table: str, key: Any, payload: Mapping[str, Any]) -> None:
+        if not payload:
+            return
+        columns = tuple(payload.keys())
+        params = [_encode(column, payload[column]) for column in columns]
+        self._execute(_update_sql(table, columns), [*params, key])
+
+    def upsert_group(self, payload: GroupUpsert) -> None:
+        columns = tuple(payload.keys())
+        updates = [column for column in columns if column != "id"]
+        on_conflict = (
+            "ON CONFLICT (id) DO UPDATE SET "
+            + ", ".join(f"{column} = excluded.{column}" for column in updates)
+            if updates
+            else "ON CONFLICT (id) DO NOTHING"
+        )
+        params = [_encode(column, payload[column]) for column in columns]
+        self._execute(_insert_sql("groups", columns, on_conflict), params)
+
+    def get_group(self, group_id: GroupId) -> Row | None:
+        return self._fetchone(
+            _select_sql("groups", None, "WHERE id = ? LIMIT 1"), [group_id]
+        )
+
+    def update_group(self, group_id: GroupId, payload: GroupUpdate) -> Row | None:
+        if not payload:
+            return self.get_group(group_id)
+        columns = tuple(payload.keys())
+        params = [_encode(column, payload[column]) for column in columns]
+        return self._fetchone(
+            _update_sql("groups", columns, "RETURNING *"), [*params, group_id]
+        )
+
+    def list_group_users(self, group_id: GroupId) -> list[Row]:
+        return self._fetchall(
+            _select_sql("splizy_users", None, "WHERE group_id = ? ORDER BY id"),
+            [group_id],
+        )
+
+    def insert_group_users(self, payload: list[SplizyUserInsert]) -> list[Row]:
+        with self._transaction() as conn:
+            return [self._insert(conn, "splizy_users", user) for user in payload]
+
+    def delete_group_users(self, group_id: GroupId, usernames: list[str]) -> None:
+        # One statement for any number of usernames by binding them as a JSON array
+        self._execute(
+            "DELETE FROM splizy_users WHERE group_id = ? "
+            "AND username IN (SELECT value FROM json_each(?))",
+            [group_id, json.dumps(usernames)],
+        )
+
+    def list_expenses(
+        self, group_id: GroupId, columns: Sequence[str] | None
+    ) -> list[Row]:
+        return self._fetchall(
+            _select_sql(
+                "expenses",
+                tuple(columns) if columns else None,
+                "WHERE group_id = ? ORDER BY created_at DESC, rowid DESC",
+            ),
+            [group_id],
+        )
+
+    def list_expenses_page(
+        self,
+        group_id: GroupId,
+        columns: Sequence[str],
+        offset: int,
+        limit: int,
+        criteria: ExpenseFilter | None,
+    ) -> list[Row]:
+        filters, params = _filter_sql(criteria)
+        return self._fetchall(
+            _select_sql(
+                "expenses",
+                tuple(columns),
+                f"WHERE group_id = :group_id{filters} "
+                "ORDER BY created_at DESC, rowid DESC LIMIT :limit OFFSET :offset",
+            ),
+            {"group_id": group_id, "limit": limit, "offset": offset, **params},
+        )
+
+    def list_expenses_after(
+        self,
+        group_id: GroupId,
+        columns: Sequence[str],
+        after: tuple[str, ExpenseId] | None,
+        limit: int,
+    ) -> list[Row]:
+        keyset, params = "", {"group_id": group_id, "limit": limit}
+        if after is not None:
+            keyset = " AND (created_at, id) > (:after_created_at, :after_id)"
+            params.update(after_created_at=after[0], after_id=after[1])
+        return self._fetchall(
+            _select_sql(
+                "expenses",
+                tuple(columns),
+                f"WHERE group_id = :group_id{keyset} "
+                "ORDER BY created_at, id LIMIT :limit",
+            ),
+            params,
+        )
+
+    def get_expense(
+        self, expense_id: ExpenseId, columns: Sequence[str] | None
+    ) -> Row | None:
+        return self._fetchone(
+            _select_sql(
+                "expenses", tuple(columns) if columns else None, "WHERE id = ? LIMIT 1"
+            ),
+            [expense_id],
+        )
+
+    def insert_expense(self, payload: ExpenseInsert) -> Row | None:
+        row = {"id": str(uuid.uuid4()), **payload}
+        with self._transaction() as conn:
+            return self._insert(conn, "expenses", row)
+
+    def insert_expenses(self, payload: list[ExpenseInsert]) -> int:
+        if not payload:
+            return 0
+        # Rows share the first row's columns
+        columns = ("id", *payload[0].keys())
+        with self._transaction() as conn:
+            for start in range(0, len(payload), INSERT_BATCH_ROWS):
+                batch = payload[start : start + INSERT_BATCH_ROWS]
+                params: list[Any] = []
+                for expense in batch:
+                    row = {"id": str(uuid.uuid4()), **expense}
+                    params.extend(_encode(column, row[column]) for column in columns)
+                conn.execute(_insert_many_sql("expenses", columns, len(batch)), params)
+        return len(payload)
+
+    def update_expense(self, expense_id: ExpenseId, payload: ExpenseUpdate) -> None:
+        self._update("expenses", expense_id, payload)
+
+    def delete_expense(self, expense_id: ExpenseId) -> None:
+        self._execute("DELETE FROM expenses WHERE id = ?", [expense_id])
+
+    def aggregate_balances(self, group_id: GroupId) -> list[Row]:
+        return [
+            {
+                "username": row["username"],
+                "currency": row["currency"],
+                "paid": float(row["paid"] or 0),
+                "owed": float(row["owed"] or 0),
+            }
+            for row in self._fetchall(AGGREGATE_BALANCES_SQL, {"group_id": group_id})
+        ]
+
+    def count_user_involvements(
+        self, group_id: GroupId, usernames: list[str]
+    ) -> list[Row]:
+        return self._fetchall(
+            COUNT_USER_INVOLVEMENTS_SQL,
+            {"group_id": group_id, "usernames": json.dumps(usernames)},
+        )
+
+    def expense_totals(
+        self, group_id: GroupId, criteria: ExpenseFilter | None
+    ) -> list[Row]:
+        filters, params = _filter_sql(criteria)
+        return self._fetchall(
+            EXPENSE_TOTALS_SQL.format(filters=filters),
+            {"group_id": group_id, **params},
+        )
+
+    def get_temp_receipt(self, temp_receipt_id: TempReceiptId) -> Row | None:
+        return self._fetchone(
+            _select_sql("temp_receipts", None, "WHERE id = ? LIMIT 1"),
+            [temp_receipt_id],
+        )
+
+    def get_latest_temp_receipt(self, group_id: GroupId) -> Row | None:
+        return self._fetchone(
+            _select_sql(
+                "temp_receipts",
+                None,
+                "WHERE group_id = ? ORDER BY created_at DESC, id DESC LIMIT 1",
+            ),
+            [group_id],
+        )
+
+    def insert_temp_receipt(self, payload: TempReceiptInsert) -> Row | None:
+        with self._transaction() as conn:
+            return self._insert(conn, "temp_receipts", payload)
+
+    def update_temp_receipt(
+        self, temp_receipt_id: TempReceiptId, payload: TempReceiptUpdate
+    ) -> None:
+        self._update("temp_receipts", temp_receipt_id, payload)
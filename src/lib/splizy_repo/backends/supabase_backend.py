@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+from src.lib.splizy_repo.backends.base import RepoBackend, Row
+from src.lib.splizy_repo.db import get_supabase
+from src.lib.splizy_repo.model import (
+    ExpenseFilter,
+    ExpenseId,
+    ExpenseInsert,
+    ExpenseUpdate,
+    GroupId,
+    GroupUpdate,
+    GroupUpsert,
+    SplizyUserInsert,
+    TempReceiptId,
+    TempReceiptInsert,
+    TempReceiptUpdate,
+)
+
+
+def _first_or_none(rows: list[Row] | None) -> Row | None:
+    if not rows:
+        return None
+    return rows[0]
+
+
+def _select(columns: Sequence[str] | None) -> str:
+    return ",".join(columns) if columns else "*"
+
+
+def _filter_params(criteria: ExpenseFilter | None) -> dict:
+    """RPC arguments of the filtered functions in migrations/005_expense_search.sql."""
+    if criteria is None:
+        return {}
+    title = criteria.title
+    if title is not None:
+        # Matched with ilike, so wildcards typed by the user are literal
+        title = title.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return {
+        "p_paid_by": criteria.paid_by,
+        "p_participant": criteria.participant,
+        "p_currency": criteria.currency,
+        "p_min_amount": criteria.min_amount,
+        "p_max_amount": criteria.max_amount,
+        "p_min_inclusive": criteria.min_inclusive,
+        "p_max_inclusive": criteria.max_inclusive,
+        "p_title": title,
+    }
+
+
+class SupabaseBackend(RepoBackend):
+    def upsert_group(self, payload: GroupUpsert) -> None:
+        get_supabase().table("groups").upsert(payload).execute()
+
+    def get_group(self, group_id: GroupId) -> Row | None:
+        response = (
+            get_supabase()
+            .table("groups")
+            .select("*")
+            .eq("id", group_id)
+            .limit(1)
+            .execute()
+        )
+        return _first_or_none(response.data)
+
+    def update_group(self, group_id: GroupId, payload: GroupUpdate) -> Row | None:
+        # PostgREST returns the updated rows by default (return=representation)
+        response = (
+            get_supabase().table("groups").update(payload).eq("id", group_id).execute()
+        )
+        return response.data[0] if response.data else None
+
+    def list_group_users(self, group_id: GroupId) -> list[Row]:
+        response = (
+            get_supabase()
+            .table("splizy_users")
+            .select("*")
+            .eq("group_id", group_id)
+            .execute()
+        )
+        return response.data or []
+
+    def insert_group_users(self, payload: list[SplizyUserInsert]) -> list[Row]:
+        response = get_supabase().table("splizy_users").insert(payload).execute()
+        return response.data or []
+
+    def delete_group_users(self, group_id: GroupId, usernames: list[str]) -> None:
+        get_supabase().table("splizy_users").delete().eq("group_id", group_id).in_(
+            "username", usernames
+        ).execute()
+
+    def list_expenses(
+        self, group_id: GroupId, columns: Sequence[str] | None
+    ) -> list[Row]:
+        response = (
+            get_supabase()
+            .table("expenses")
+            .select(_select(columns))
+            .eq("group_id", group_id)
+            .order("created_at", desc=True)
+            .execute()
+        )
+        return response.data or []
+
+    def list_expenses_page(
+        self,
+        group_id: GroupId,
+        columns: Sequence[str],
+        offset: int,
+        limit: int,
+        criteria: ExpenseFilter | None,
+    ) -> list[Row]:
+        if criteria is not None:
+            # search_expenses returns the listing columns, see ExpenseListingRow
+            response = (
+                get_supabase()
+                .rpc(
+                    "search_expenses",
+                    {
+                        "p_group_id": group_id,
+                        "p_offset": offset,
+                        "p_limit": limit,
+                        **_filter_params(criteria),
+                    },
+                )
+                .execute()
+            )
+            return response.data or []
+        response = (
+            get_supabase()
+            .table("expenses")
+            .select(_select(columns))
+            .eq("group_id", group_id)
+            # id breaks created_at ties, so offset pages neither repeat nor skip
+            .order("created_at", desc=True)
+            .order("id", desc=True)
+            .range(offset, offset + limit - 1)
+            .execute()
+        )
+        return response.data or []
+
+    def list_expenses_after(
+        self,
+        group_id: GroupId,
+        columns: Sequence[str],
+        after: tuple[str, ExpenseId] | None,
+        limit: int,
+    ) -> list[Row]:
+        query = get_supabase().table("expenses").select(_select(columns))
+        query = query.eq("group_id", group_id)
+        if after is not None:
+            # Quoted, as timestamps hold PostgREST's reserved characters
+            created_at, expense_id = after
+            query = query.or_(
+                f'created_at.gt."{created_at}",'
+                f'and(created_at.eq."{created_at}",id.gt."{expense_id}")'
+            )
+        response = query.order("created_at").order("id").limit(limit).execute()
+        return response.data or []
+
+    def get_expense(
+        self, expense_id: ExpenseId, columns: Sequence[str] | None
+    ) -> Row | None:
+        response = (
+            get_supabase()
+            .table("expenses")
+            .select(_select(columns))
+            .eq("id", expense_id)
+            .limit(1)
+            .execute()
+        )
+        return _first_or_none(response.data)
+
+    def insert_expense(self, payload: ExpenseInsert) -> Row | None:
+        response = get_supabase().table("expenses").insert(payload).execute()
+        return _first_or_none(response.data)
+
+    def insert_expenses(self, payload: list[ExpenseInsert]) -> int:
+        from postgrest.types import ReturnMethod
+
+        if not payload:
+            return 0
+        # PostgREST inserts a JSON array with one multi-row statement, so the whole
+        # request commits or fails together
+        get_supabase().table("expenses").insert(
+            payload, returning=ReturnMethod.minimal
+        ).execute()
+        return len(payload)
+
+    def update_expense(self, expense_id: ExpenseId, payload: ExpenseUpdate) -> None:
+        get_supabase().table("expenses").update(payload).eq("id", expense_id).execute()
+
+    def delete_expense(self, expense_id: ExpenseId) -> None:
+        get_supabase().table("expenses").delete().eq("id", expense_id).execute()
+
+    def aggregate_balances(self, group_id: GroupId) -> list[Row]:
+        # See migrations/001_aggregate_balances.sql
+        response = (
+            get_supabase().rpc("aggregate_balances", {"p_group_id": group_id}).execute()
+        )
+        return response.data or []
+
+    def count_user_involvements(
+        self, group_id: GroupId, usernames: list[str]
+    ) -> list[Row]:
+        # See migrations/002_user_involvements.sql
+        response = (
+            get_supabase()
+            .rpc(
+                "count_user_involvements",
+                {"p_group_id": group_id, "p_usernames": usernames},
+            )
+            .execute()
+        )
+        return response.data or []
+
+    def expense_totals(
+        self, group_id: GroupId, criteria: ExpenseFilter | None
+    ) -> list[Row]:
+        # See migrations/005_expense_search.sql
+        response = (
+            get_supabase()
+            .rpc(
+                "expense_totals",
+                {"p_group_id": group_id, **_filter_params(criteria)},
+            )
+            .execute()
+        )
+        return response.data or []
+
+    def get_temp_receipt(self, temp_receipt_id: TempReceiptId) -> Row | None:
+        response = (
+            get_supabase()
+            .table("temp_receipts")
+            .select("*")
+            .eq("id", temp_receipt_id)
+            .limit(1)
+            .execute()
+        )
+        return _first_or_none(response.data)
+
+    def get_latest_temp_receipt(self, group_id: GroupId) -> Row | None:
+        response = (
+            get_supabase()
+            .table("temp_receipts")
+            .select("*")
+            .eq("group_id", group_id)
+            .order("created_at", desc=True)
+            .limit(1)
+            .execute()
+        )
+        return _first_or_none(response.data)
+
+    def insert_temp_receipt(self, payload: TempReceiptInsert) -> Row | None:
+        response = get_supabase().table("temp_receipts").insert(payload).execute()
+        return _first_or_none(response.data)
+
+    def update_temp_receipt(
+        self, temp_receipt_id: TempReceiptId, payload: TempReceiptUpdate
+    ) -> None:
+        get_supabase().table("temp_receipts").update(payload).eq(
+            "id", temp_receipt_id
+        ).execute()
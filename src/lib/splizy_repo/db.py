@@ -1,5 +1,15 @@
-from supabase import Client, create_client
+from functools import cache
+from typing import TYPE_CHECKING
 
 from config import SUPABASE_KEY, SUPABASE_URL
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+if TYPE_CHECKING:
+    from supabase import Client
+
+
+@cache
+def get_supabase() -> "Client":
+    # Imported and created on first query; the supabase SDK is slow to import.
+    from supabase import create_client
+
+    return create_client(SUPABASE_URL, SUPABASE_KEY)
@@ -0,0 +1,20 @@
+-- Per-user paid/owed totals of a group, grouped by expense currency.
+-- Backs SplizyRepo.aggregate_balances so settle-up never downloads expense rows.
+create or replace function aggregate_balances(p_group_id bigint)
+returns table (username text, currency text, paid double precision, owed double precision)
+language sql
+stable
+as $$
+  select username, currency, sum(paid) as paid, sum(owed) as owed
+  from (
+    select e.paid_by as username, e.currency, e.amount::double precision as paid, 0::double precision as owed
+    from expenses e
+    where e.group_id = p_group_id
+    union all
+    select p ->> 'user' as username, e.currency, 0::double precision as paid, (p ->> 'amount')::double precision as owed
+    from expenses e
+    cross join lateral jsonb_array_elements(e.payees) as p
+    where e.group_id = p_group_id
+  ) as entries
+  group by username, currency;
+$$;
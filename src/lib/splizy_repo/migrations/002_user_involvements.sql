@@ -0,0 +1,24 @@
+-- Number of expenses each username is involved in (as payer or payee) within a group.
+-- Backs SplizyRepo.count_user_involvements so the /register delete check is one
+-- indexed lookup per username instead of a download of the whole expense history.
+create index if not exists expenses_group_id_paid_by_idx
+  on expenses (group_id, paid_by);
+
+create index if not exists expenses_payees_gin_idx
+  on expenses using gin (payees jsonb_path_ops);
+
+create or replace function count_user_involvements(p_group_id bigint, p_usernames text[])
+returns table (username text, expense_count bigint)
+language sql
+stable
+as $$
+  select u.username, count(e.id) as expense_count
+  from unnest(p_usernames) as u(username)
+  left join expenses e
+    on e.group_id = p_group_id
+    and (
+      e.paid_by = u.username
+      or e.payees @> jsonb_build_array(jsonb_build_object('user', u.username))
+    )
+  group by u.username;
+$$;
@@ -0,0 +1,4 @@
+-- Per-user breakdown of receipt expenses, computed by the bot's receipt allocation
+-- engine (src/lib/splizy_repo/receipt_allocation.py). Keyed by a fingerprint of the
+-- receipt, so an edited receipt is recomputed on its next view.
+alter table expenses add column if not exists receipt_allocation jsonb;
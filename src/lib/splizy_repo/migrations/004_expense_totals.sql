@@ -0,0 +1,23 @@
+-- Expense count, total and latest created_at of a group per (currency, payer).
+-- Backs SplizyRepo.summarize_expenses, so the /view header needs one small result
+-- set instead of the expense history; rows are then paged in on demand.
+create index if not exists expenses_group_id_created_at_idx
+  on expenses (group_id, created_at desc);
+
+create or replace function expense_totals(p_group_id bigint)
+returns table (
+  currency text,
+  paid_by text,
+  expense_count bigint,
+  total double precision,
+  last_created_at timestamptz
+)
+language sql
+stable
+as $$
+  select e.currency, e.paid_by, count(*) as expense_count,
+         sum(e.amount)::double precision as total, max(e.created_at) as last_created_at
+  from expenses e
+  where e.group_id = p_group_id
+  group by e.currency, e.paid_by;
+$$;
@@ -0,0 +1,114 @@
+-- /view filters (payer, participant, currency, amount range, title), evaluated in
+-- the database by SplizyRepo.list_expenses_page and summarize_expenses.
+-- Usernames match case-insensitively, as on Telegram, so participants are found
+-- by scanning the payees of the group's expenses rather than by containment.
+create extension if not exists pg_trgm;
+
+create index if not exists expenses_title_trgm_idx
+  on expenses using gin (title gin_trgm_ops);
+
+create index if not exists expenses_group_id_currency_idx
+  on expenses (group_id, currency);
+
+create index if not exists expenses_group_id_amount_idx
+  on expenses (group_id, amount);
+
+create index if not exists expenses_group_id_lower_paid_by_idx
+  on expenses (group_id, lower(paid_by));
+
+-- Replaces 004's expense_totals(bigint) with a filtered version
+drop function if exists expense_totals(bigint);
+
+create or replace function expense_totals(
+  p_group_id bigint,
+  p_paid_by text default null,
+  p_participant text default null,
+  p_currency text default null,
+  p_min_amount double precision default null,
+  p_max_amount double precision default null,
+  p_min_inclusive boolean default true,
+  p_max_inclusive boolean default true,
+  p_title text default null
+)
+returns table (
+  currency text,
+  paid_by text,
+  expense_count bigint,
+  total double precision,
+  last_created_at timestamptz
+)
+language sql
+stable
+as $$
+  select e.currency, e.paid_by, count(*) as expense_count,
+         sum(e.amount)::double precision as total, max(e.created_at) as last_created_at
+  from expenses e
+  where e.group_id = p_group_id
+    and (p_paid_by is null or lower(e.paid_by) = lower(p_paid_by))
+    and (p_currency is null or e.currency = p_currency)
+    and (p_min_amount is null or e.amount > p_min_amount
+         or (p_min_inclusive and e.amount = p_min_amount))
+    and (p_max_amount is null or e.amount < p_max_amount
+         or (p_max_inclusive and e.amount = p_max_amount))
+    and (p_title is null or e.title ilike '%' || p_title || '%' escape '\')
+    and (
+      p_participant is null
+      or lower(e.paid_by) = lower(p_participant)
+      or exists (
+        select 1 from jsonb_array_elements(e.payees) p
+        where lower(p->>'user') = lower(p_participant)
+          and (p->>'amount')::double precision > 0
+      )
+    )
+  group by e.currency, e.paid_by;
+$$;
+
+-- One page of listing columns (see ExpenseListingRow), newest first
+create or replace function search_expenses(
+  p_group_id bigint,
+  p_offset integer,
+  p_limit integer,
+  p_paid_by text default null,
+  p_participant text default null,
+  p_currency text default null,
+  p_min_amount double precision default null,
+  p_max_amount double precision default null,
+  p_min_inclusive boolean default true,
+  p_max_inclusive boolean default true,
+  p_title text default null
+)
+returns table (
+  id uuid,
+  title text,
+  amount double precision,
+  paid_by text,
+  currency text,
+  created_at timestamptz
+)
+language sql
+stable
+as $$
+  select e.id, e.title, e.amount::double precision, e.paid_by, e.currency, e.created_at
+  from expenses e
+  where e.group_id = p_group_id
+    and (p_paid_by is null or lower(e.paid_by) = lower(p_paid_by))
+    and (p_currency is null or e.currency = p_currency)
+    and (p_min_amount is null or e.amount > p_min_amount
+         or (p_min_inclusive and e.amount = p_min_amount))
+    and (p_max_amount is null or e.amount < p_max_amount
+         or (p_max_inclusive and e.amount = p_max_amount))
+    and (p_title is null or e.title ilike '%' || p_title || '%' escape '\')
+    and (
+      p_participant is null
+      or lower(e.paid_by) = lower(p_participant)
+      or exists (
+        select 1 from jsonb_array_elements(e.payees) p
+        where lower(p->>'user') = lower(p_participant)
+          and (p->>'amount')::double precision > 0
+      )
+    )
+  -- id breaks created_at ties, so offset pages neither repeat nor skip
+  order by e.created_at desc, e.id desc
+  offset p_offset
+  limit p_limit;
+$$;
@@ -1,6 +1,16 @@
 from __future__ import annotations
 
-from typing import NotRequired, TypeAlias, TypedDict
+from dataclasses import dataclass
+from typing import (
+    Any,
+    ClassVar,
+    Literal,
+    Mapping,
+    NamedTuple,
+    NotRequired,
+    TypeAlias,
+    TypedDict,
+)
 
 # Db schema DTOs
 GroupId: TypeAlias = int
@@ -31,6 +41,25 @@ class ReceiptData(TypedDict):
     currency: CurrencyCode
 
 
+class ReceiptAllocationLine(TypedDict):
+    item: str
+    quantity: float
+    amount: float
+
+
+class ReceiptAllocationShare(TypedDict):
+    user: str
+    amount: float
+    lines: list[ReceiptAllocationLine]
+
+
+class ReceiptAllocationData(TypedDict):
+    """Per-user breakdown of a receipt, see receipt_allocation.allocate_receipt."""
+
+    fingerprint: str
+    shares: list[ReceiptAllocationShare]
+
+
 class PayeeData(TypedDict):
     user: str
     amount: float
@@ -47,6 +76,7 @@ class ExpenseRow(TypedDict):
     payees: list[PayeeData]
     multiplier: NotRequired[str | None]
     receipt: NotRequired[ReceiptData | None]
+    receipt_allocation: NotRequired[ReceiptAllocationData | None]
     created_at: str
 
 
@@ -79,6 +109,160 @@ class TempReceiptRow(TypedDict):
     created_at: NotRequired[str]
 
 
+# Lean expense projections, see SplizyRepo.list_expenses(fields=...)
+ExpenseFields: TypeAlias = Literal["full", "settleup", "listing"]
+
+
+class PayeeShare(NamedTuple):
+    user: str
+    amount: float
+
+
+@dataclass(slots=True, frozen=True)
+class ExpenseSettleupRow:
+    """Columns needed to compute balances and settle-up reports (no receipt)."""
+
+    COLUMNS: ClassVar[tuple[str, ...]] = (
+        "id",
+        "title",
+        "amount",
+        "paid_by",
+        "currency",
+        "payees",
+        "created_at",
+    )
+
+    id: ExpenseId
+    title: str
+    amount: float
+    paid_by: str
+    currency: CurrencyCode
+    payees: tuple[PayeeShare, ...]
+    created_at: str
+
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]) -> ExpenseSettleupRow:
+        return cls(
+            id=row["id"],
+            title=row["title"],
+            amount=float(row["amount"]),
+            paid_by=row["paid_by"],
+            currency=row["currency"],
+            payees=tuple(
+                PayeeShare(payee["user"], float(payee["amount"]))
+                for payee in row.get("payees") or []
+            ),
+            created_at=row.get("created_at") or "",
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class ExpenseListingRow:
+    """Columns needed to render an expense as a /view list entry."""
+
+    COLUMNS: ClassVar[tuple[str, ...]] = (
+        "id",
+        "title",
+        "amount",
+        "paid_by",
+        "currency",
+        "created_at",
+    )
+
+    id: ExpenseId
+    title: str
+    amount: float
+    paid_by: str
+    currency: CurrencyCode
+    created_at: str
+
+    @classmethod
+    def from_row(cls, row: Mapping[str, Any]) -> ExpenseListingRow:
+        return cls(
+            id=row["id"],
+            title=row["title"],
+            amount=float(row["amount"]),
+            paid_by=row["paid_by"],
+            currency=row["currency"],
+            created_at=row.get("created_at") or "",
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class ExpenseFilter:
+    """
+    /view search criteria, all of which must hold; None matches anything. See
+    SplizyRepo.list_expenses_page and migrations/005_expense_search.sql.
+    """
+
+    paid_by: str | None = None
+    # Paid the expense or has a non-zero share of it
+    participant: str | None = None
+    currency: CurrencyCode | None = None
+    min_amount: float | None = None
+    max_amount: float | None = None
+    min_inclusive: bool = True
+    max_inclusive: bool = True
+    # Case-insensitive substring of the title
+    title: str | None = None
+
+
+# Aggregate query DTOs
+class BalanceRow(TypedDict):
+    username: str
+    currency: CurrencyCode
+    paid: float
+    owed: float
+
+
+class ExpenseTotalsRow(TypedDict):
+    currency: CurrencyCode
+    paid_by: str
+    expense_count: int
+    total: float
+    last_created_at: str
+
+
+class CurrencyTotal(NamedTuple):
+    currency: CurrencyCode
+    total: float
+    # (username, amount paid) by amount, highest first
+    payers: tuple[tuple[str, float], ...]
+
+
+@dataclass(slots=True, frozen=True)
+class ExpenseSummary:
+    """Group totals for the /view header, see SplizyRepo.summarize_expenses."""
+
+    expense_count: int
+    # By total, highest first
+    currencies: tuple[CurrencyTotal, ...]
+    last_created_at: str
+
+    @classmethod
+    def from_rows(cls, rows: list[ExpenseTotalsRow]) -> ExpenseSummary:
+        payers: dict[CurrencyCode, list[tuple[str, float]]] = {}
+        for row in rows:
+            payers.setdefault(row["currency"], []).append(
+                (row["paid_by"], float(row["total"] or 0))
+            )
+        currencies = [
+            CurrencyTotal(
+                currency,
+                sum(amount for _, amount in currency_payers),
+                tuple(sorted(currency_payers, key=lambda payer: -payer[1])),
+            )
+            for currency, currency_payers in payers.items()
+        ]
+        return cls(
+            expense_count=sum(int(row["expense_count"] or 0) for row in rows),
+            currencies=tuple(sorted(currencies, key=lambda item: -item.total)),
+            last_created_at=max(
+                (row["last_created_at"] or "" for row in rows), default=""
+            ),
+        )
+
+
 # Payload schema DTOs
 class GroupUpsert(TypedDict):
     id: GroupId
@@ -106,6 +290,8 @@ class ExpenseInsert(TypedDict):
     payees: list[PayeeData]
     multiplier: NotRequired[str | None]
     receipt: NotRequired[ReceiptData | None]
+    # Set by imports, defaults to now
+    created_at: NotRequired[str]
 
 
 class ExpenseUpdate(TypedDict, total=False):
@@ -117,6 +303,7 @@ class ExpenseUpdate(TypedDict, total=False):
     payees: list[PayeeData]
     multiplier: str | None
     receipt: ReceiptData | None
+    receipt_allocation: ReceiptAllocationData | None
 
 
 class TempReceiptInsert(TypedDict):
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Sequence
+from fractions import Fraction
+from math import floor
+from typing import Any
+
+from src.lib.splizy_repo.model import (
+    ReceiptAllocationData,
+    ReceiptAllocationLine,
+    ReceiptAllocationShare,
+    ReceiptData,
+)
+
+# Bump when allocation rules change, so stored breakdowns are recomputed
+ALLOCATION_VERSION = 1
+
+
+def _fraction(value: Any) -> Fraction:
+    # Via str, so 0.1 is 1/10 rather than the nearest binary float
+    return Fraction(str(value))
+
+
+def _to_cents(amount: Fraction) -> int:
+    return floor(amount * 100 + Fraction(1, 2))
+
+
+def _largest_remainder(amounts: Sequence[Fraction], total_cents: int) -> list[int]:
+    """
+    Round amounts to cents so they sum to `total_cents`: floor each, then give
+    the leftover cents to the largest remainders (earliest first on ties).
+    """
+    scaled = [amount * 100 for amount in amounts]
+    cents = [floor(value) for value in scaled]
+    leftover = total_cents - sum(cents)
+    by_remainder = sorted(
+        range(len(scaled)), key=lambda index: (cents[index] - scaled[index], index)
+    )
+    for index in by_remainder[: max(0, leftover)]:
+        cents[index] += 1
+    return cents
+
+
+def receipt_fingerprint(receipt: ReceiptData, participants: Sequence[str]) -> str:
+    """Hash of everything the allocation depends on."""
+    canonical = json.dumps(
+        {
+            "version": ALLOCATION_VERSION,
+            "items": receipt["items"],
+            "subtotal": receipt["subtotal"],
+            "total": receipt["total"],
+            "participants": list(participants),
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+
+def allocate_receipt(
+    receipt: ReceiptData, participants: Sequence[str]
+) -> ReceiptAllocationData:
+    """
+    Split a receipt's total among users by the items they took.
+
+    Builds an item x user quantity matrix (individual quantities, plus the
+    remaining quantity split evenly when an item is shared by 2+ users), prices
+    it at each item's unit price scaled by total / subtotal (service charge and
+    GST), and computes everything in exact fractions. Only the final amounts are
+    rounded, with largest-remainder rounding, so user shares add up to the
+    allocated total and each user's lines add up to their share.
+    """
+    subtotal = _fraction(receipt["subtotal"])
+    total = _fraction(receipt["total"])
+    factor = total / subtotal if subtotal else Fraction(1)
+
+    users = list(participants)
+    columns = {username: index for index, username in enumerate(users)}
+
+    def column(username: str) -> int:
+        if username not in columns:
+            columns[username] = len(users)
+            users.append(username)
+        return columns[username]
+
+    # Sparse rows of the quantity matrix, one per item: {user column: quantity}
+    item_names: list[str] = []
+    unit_prices: list[Fraction] = []
+    matrix: list[dict[int, Fraction]] = []
+    for item in receipt["items"]:
+        quantity = _fraction(item["quantity"])
+        if quantity <= 0:
+            continue
+        row: dict[int, Fraction] = {}
+        indiv_qty = Fraction(0)
+        for entry in item["indiv"]:
+            entry_qty = _fraction(entry["quantity"])
+            if entry_qty <= 0:
+                continue
+            indiv_qty += entry_qty
+            index = column(entry["username"])
+            row[index] = row.get(index, Fraction(0)) + entry_qty
+
+        shared_qty = quantity - indiv_qty
+        shared_users = item["shared"]
+        if shared_qty > 0 and len(shared_users) >= 2:
+            qty_per_user = shared_qty / len(shared_users)
+            for username in shared_users:
+                index = column(username)
+                row[index] = row.get(index, Fraction(0)) + qty_per_user
+
+        item_names.append(item["name"])
+        unit_prices.append(_fraction(item["subtotal"]) / quantity * factor)
+        matrix.append(row)
+
+    # Transpose to per-user lines: (item index, quantity, exact amount)
+    user_lines: list[list[tuple[int, Fraction, Fraction]]] = [[] for _ in users]
+    for item_index, row in enumerate(matrix):
+        for index, quantity in row.items():
+            user_lines[index].append(
+                (item_index, quantity, quantity * unit_prices[item_index])
+            )
+
+    user_totals = [
+        sum((line[2] for line in lines), Fraction(0)) for lines in user_lines
+    ]
+    user_cents = _largest_remainder(user_totals, _to_cents(sum(user_totals)))
+
+    shares: list[ReceiptAllocationShare] = []
+    for username, lines, cents in zip(users, user_lines, user_cents):
+        lines.sort(key=lambda line: line[0])
+        line_cents = _largest_remainder([line[2] for line in lines], cents)
+        allocation_lines: list[ReceiptAllocationLine] = [
+            {
+                "item": item_names[item_index],
+                "quantity": float(quantity),
+                "amount": line_cent / 100,
+            }
+            for (item_index, quantity, _), line_cent in zip(lines, line_cents)
+        ]
+        shares.append(
+            {"user": username, "amount": cents / 100, "lines": allocation_lines}
+        )
+
+    return {
+        "fingerprint": receipt_fingerprint(receipt, participants),
+        "shares": shares,
+    }
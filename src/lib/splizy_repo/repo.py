@@ -1,17 +1,27 @@
 from __future__ import annotations
 
-from typing import cast
+from collections.abc import Iterator
+from typing import Literal, cast, overload
 
-from src.lib.splizy_repo.db import supabase
+from src.lib.metrics import timed_phase
+from src.lib.splizy_repo.backends import RepoBackend, create_backend
 from src.lib.splizy_repo.model import (
+    BalanceRow,
+    ExpenseFields,
+    ExpenseFilter,
     ExpenseId,
     ExpenseInsert,
+    ExpenseListingRow,
     ExpenseRow,
+    ExpenseSettleupRow,
+    ExpenseSummary,
+    ExpenseTotalsRow,
     ExpenseUpdate,
     GroupId,
     GroupRow,
     GroupUpdate,
     GroupUpsert,
+    ReceiptAllocationData,
     SplizyUserInsert,
     SplizyUserRow,
     TempReceiptId,
@@ -20,125 +30,232 @@ from src.lib.splizy_repo.model import (
     TempReceiptUpdate,
 )
 
+# Rows per round trip when iterating a group's whole history
+EXPENSE_PAGE_ROWS = 500
 
-def _first_or_none(rows: list[object] | None) -> object | None:
-    if not rows:
-        return None
-    return rows[0]
+_EXPENSE_SHAPES: dict[ExpenseFields, type[ExpenseSettleupRow | ExpenseListingRow]] = {
+    "settleup": ExpenseSettleupRow,
+    "listing": ExpenseListingRow,
+}
+
+
+def _expense_columns(fields: ExpenseFields) -> tuple[str, ...] | None:
+    shape = _EXPENSE_SHAPES.get(fields)
+    return shape.COLUMNS if shape else None
+
+
+def _to_expense_shape(fields: ExpenseFields, row: dict) -> object:
+    shape = _EXPENSE_SHAPES.get(fields)
+    return shape.from_row(row) if shape else row
 
 
 class SplizyRepo:
+    def __init__(self, backend: RepoBackend | None = None):
+        self._backend_instance = backend
+
+    @property
+    def _backend(self) -> RepoBackend:
+        # Resolved on first query so importing the repo stays cheap
+        if self._backend_instance is None:
+            self._backend_instance = create_backend()
+        return self._backend_instance
+
+    @timed_phase("db")
     def ensure_group_exists(self, payload: GroupUpsert) -> None:
-        supabase.table("groups").upsert(payload).execute()
+        self._backend.upsert_group(payload)
 
+    @timed_phase("db")
     def get_group(self, group_id: GroupId) -> GroupRow | None:
-        response = (
-            supabase.table("groups").select("*").eq("id", group_id).limit(1).execute()
-        )
-        return cast(GroupRow | None, _first_or_none(response.data))
+        return cast(GroupRow | None, self._backend.get_group(group_id))
 
+    @timed_phase("db")
     def update_group(self, group_id: GroupId, payload: GroupUpdate) -> GroupRow | None:
-        supabase.table("groups").update(payload).eq("id", group_id).execute()
-        return self.get_group(group_id)
+        # The updated row comes back from the same statement
+        return cast(GroupRow | None, self._backend.update_group(group_id, payload))
 
+    @timed_phase("db")
     def list_group_users(self, group_id: GroupId) -> list[SplizyUserRow]:
-        response = (
-            supabase.table("splizy_users")
-            .select("*")
-            .eq("group_id", group_id)
-            .execute()
-        )
-        return cast(list[SplizyUserRow], response.data or [])
+        return cast(list[SplizyUserRow], self._backend.list_group_users(group_id))
 
+    @timed_phase("db")
     def insert_group_users(
         self, payload: list[SplizyUserInsert]
     ) -> list[SplizyUserRow]:
         if not payload:
             return []
-        response = supabase.table("splizy_users").insert(payload).execute()
-        return cast(list[SplizyUserRow], response.data or [])
+        return cast(list[SplizyUserRow], self._backend.insert_group_users(payload))
 
+    @timed_phase("db")
     def delete_group_users(self, group_id: GroupId, usernames: list[str]) -> None:
         if not usernames:
             return
-        supabase.table("splizy_users").delete().eq("group_id", group_id).in_(
-            "username", usernames
-        ).execute()
+        self._backend.delete_group_users(group_id, usernames)
 
-    def list_expenses(self, group_id: GroupId) -> list[ExpenseRow]:
+    @overload
+    def list_expenses(
+        self, group_id: GroupId, fields: Literal["full"] = ...
+    ) -> list[ExpenseRow]: ...
+    @overload
+    def list_expenses(
+        self, group_id: GroupId, fields: Literal["settleup"]
+    ) -> list[ExpenseSettleupRow]: ...
+    @overload
+    def list_expenses(
+        self, group_id: GroupId, fields: Literal["listing"]
+    ) -> list[ExpenseListingRow]: ...
+    @timed_phase("db")
+    def list_expenses(self, group_id: GroupId, fields: ExpenseFields = "full") -> list:
         # Return earliest first, hence sort by created_at desc
-        response = (
-            supabase.table("expenses")
-            .select("*")
-            .eq("group_id", group_id)
-            .order("created_at", desc=True)
-            .execute()
+        rows = self._backend.list_expenses(group_id, _expense_columns(fields))
+        return [_to_expense_shape(fields, row) for row in rows]
+
+    @timed_phase("db")
+    def list_expenses_page(
+        self,
+        group_id: GroupId,
+        offset: int,
+        limit: int,
+        criteria: ExpenseFilter | None = None,
+    ) -> list[ExpenseListingRow]:
+        # Same order as list_expenses, one /view page of listing rows, filtered in
+        # the database (see migrations/005_expense_search.sql)
+        rows = self._backend.list_expenses_page(
+            group_id, ExpenseListingRow.COLUMNS, offset, limit, criteria
         )
-        return cast(list[ExpenseRow], response.data or [])
-
-    def get_expense(self, expense_id: ExpenseId) -> ExpenseRow | None:
-        response = (
-            supabase.table("expenses")
-            .select("*")
-            .eq("id", expense_id)
-            .limit(1)
-            .execute()
+        return [ExpenseListingRow.from_row(row) for row in rows]
+
+    def iter_expenses(
+        self, group_id: GroupId, page_size: int = EXPENSE_PAGE_ROWS
+    ) -> Iterator[ExpenseSettleupRow]:
+        """
+        Settle-up rows of every expense, oldest first, fetched `page_size` at a
+        time so exports never hold the whole history.
+        """
+        after: tuple[str, ExpenseId] | None = None
+        while True:
+            page = self._list_expenses_after(group_id, after, page_size)
+            yield from page
+            if len(page) < page_size:
+                return
+            after = (page[-1].created_at, page[-1].id)
+
+    @timed_phase("db")
+    def _list_expenses_after(
+        self, group_id: GroupId, after: tuple[str, ExpenseId] | None, limit: int
+    ) -> list[ExpenseSettleupRow]:
+        # Keyset paging on (created_at, id): each page is an index seek, where an
+        # OFFSET would rescan every row before it
+        rows = self._backend.list_expenses_after(
+            group_id, ExpenseSettleupRow.COLUMNS, after, limit
         )
-        return cast(ExpenseRow | None, _first_or_none(response.data))
+        return [ExpenseSettleupRow.from_row(row) for row in rows]
 
+    @timed_phase("db")
+    def summarize_expenses(
+        self, group_id: GroupId, criteria: ExpenseFilter | None = None
+    ) -> ExpenseSummary:
+        # Totals per currency and payer of the expenses matching criteria
+        rows = cast(
+            list[ExpenseTotalsRow], self._backend.expense_totals(group_id, criteria)
+        )
+        return ExpenseSummary.from_rows(rows)
+
+    @timed_phase("db")
+    def aggregate_balances(self, group_id: GroupId) -> list[BalanceRow]:
+        # Per-user paid/owed totals by currency, see migrations/001_aggregate_balances.sql
+        return cast(list[BalanceRow], self._backend.aggregate_balances(group_id))
+
+    @timed_phase("db")
+    def count_user_involvements(
+        self, group_id: GroupId, usernames: list[str]
+    ) -> dict[str, int]:
+        # Expenses each username pays for or is a payee of (including zero-amount
+        # shares), see migrations/002_user_involvements.sql
+        if not usernames:
+            return {}
+        counts = {username: 0 for username in usernames}
+        for row in self._backend.count_user_involvements(group_id, list(counts)):
+            counts[row["username"]] = int(row["expense_count"] or 0)
+        return counts
+
+    @overload
+    def get_expense(
+        self, expense_id: ExpenseId, fields: Literal["full"] = ...
+    ) -> ExpenseRow | None: ...
+    @overload
+    def get_expense(
+        self, expense_id: ExpenseId, fields: Literal["settleup"]
+    ) -> ExpenseSettleupRow | None: ...
+    @overload
+    def get_expense(
+        self, expense_id: ExpenseId, fields: Literal["listing"]
+    ) -> ExpenseListingRow | None: ...
+    @timed_phase("db")
+    def get_expense(self, expense_id: ExpenseId, fields: ExpenseFields = "full"):
+        row = self._backend.get_expense(expense_id, _expense_columns(fields))
+        return None if row is None else _to_expense_shape(fields, row)
+
+    @timed_phase("db")
     def create_expense(self, payload: ExpenseInsert) -> ExpenseRow:
-        response = supabase.table("expenses").insert(payload).execute()
-        created = cast(ExpenseRow | None, _first_or_none(response.data))
+        created = cast(ExpenseRow | None, self._backend.insert_expense(payload))
         if created is None:
             raise ValueError("Failed to create expense")
         return created
 
+    @timed_phase("db")
+    def create_expenses(self, payload: list[ExpenseInsert]) -> int:
+        # Bulk insert for imports: all rows or none, without reading them back
+        if not payload:
+            return 0
+        return self._backend.insert_expenses(payload)
+
+    @timed_phase("db")
     def update_expense(
         self, expense_id: ExpenseId, payload: ExpenseUpdate
     ) -> ExpenseRow | None:
         safe_payload: ExpenseUpdate = {
             key: value for key, value in payload.items() if key != "group_id"
         }
-        supabase.table("expenses").update(safe_payload).eq("id", expense_id).execute()
+        self._backend.update_expense(expense_id, safe_payload)
         return self.get_expense(expense_id)
 
+    @timed_phase("db")
+    def set_receipt_allocation(
+        self, expense_id: ExpenseId, allocation: ReceiptAllocationData
+    ) -> None:
+        # No read back, unlike update_expense; the caller already has the row
+        self._backend.update_expense(expense_id, {"receipt_allocation": allocation})
+
+    @timed_phase("db")
     def delete_expense(self, expense_id: ExpenseId) -> None:
-        supabase.table("expenses").delete().eq("id", expense_id).execute()
+        self._backend.delete_expense(expense_id)
 
+    @timed_phase("db")
     def get_temp_receipt(self, temp_receipt_id: TempReceiptId) -> TempReceiptRow | None:
-        response = (
-            supabase.table("temp_receipts")
-            .select("*")
-            .eq("id", temp_receipt_id)
-            .limit(1)
-            .execute()
+        return cast(
+            TempReceiptRow | None, self._backend.get_temp_receipt(temp_receipt_id)
         )
-        return cast(TempReceiptRow | None, _first_or_none(response.data))
 
+    @timed_phase("db")
     def get_latest_temp_receipt(self, group_id: GroupId) -> TempReceiptRow | None:
-        response = (
-            supabase.table("temp_receipts")
-            .select("*")
-            .eq("group_id", group_id)
-            .order("created_at", desc=True)
-            .limit(1)
-            .execute()
+        return cast(
+            TempReceiptRow | None, self._backend.get_latest_temp_receipt(group_id)
         )
-        return cast(TempReceiptRow | None, _first_or_none(response.data))
 
+    @timed_phase("db")
     def create_temp_receipt(self, payload: TempReceiptInsert) -> TempReceiptRow:
-        response = supabase.table("temp_receipts").insert(payload).execute()
-        created = cast(TempReceiptRow | None, _first_or_none(response.data))
+        created = cast(
+            TempReceiptRow | None, self._backend.insert_temp_receipt(payload)
+        )
         if created is None:
             raise ValueError("Failed to create temp receipt")
         return created
 
+    @timed_phase("db")
     def update_temp_receipt(
         self, temp_receipt_id: TempReceiptId, payload: TempReceiptUpdate
     ) -> TempReceiptRow | None:
-        supabase.table("temp_receipts").update(payload).eq(
-            "id", temp_receipt_id
-        ).execute()
+        self._backend.update_temp_receipt(temp_receipt_id, payload)
         return self.get_temp_receipt(temp_receipt_id)
 
 
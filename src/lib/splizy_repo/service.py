@@ -3,14 +3,17 @@ from __future__ import annotations
 from typing import Any, Mapping, Sequence
 
 from src.lib.splizy_repo.model import (
+    ExpenseId,
     ExpenseRow,
     ExpenseUpdate,
     GroupId,
     PayeeData,
+    ReceiptAllocationData,
     ReceiptData,
     TempReceiptRow,
     TempReceiptUpdate,
 )
+from src.lib.splizy_repo.receipt_allocation import allocate_receipt, receipt_fingerprint
 from src.lib.splizy_repo.repo import repo
 from src.lib.splizy_repo.utils import (
     build_expense_payload,
@@ -72,3 +75,21 @@ def get_latest_temp_receipt_with_expense(
         return temp_receipt, None
 
     return temp_receipt, repo.get_expense(expense_id)
+
+
+def get_receipt_allocation(
+    expense_id: ExpenseId | None,
+    receipt: ReceiptData,
+    participants: Sequence[str],
+    stored: ReceiptAllocationData | None,
+) -> ReceiptAllocationData:
+    """
+    The stored per-user breakdown of a receipt expense, or a fresh one (saved to
+    the expense) when it is missing or was computed for a different receipt.
+    """
+    if stored and stored["fingerprint"] == receipt_fingerprint(receipt, participants):
+        return stored
+    allocation = allocate_receipt(receipt, participants)
+    if expense_id:
+        repo.set_receipt_allocation(expense_id, allocation)
+    return allocation
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import inspect
+import json
+import logging
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import wraps
+from time import perf_counter
+from typing import Any
+
+import config
+from src.lib.logger import get_logger
+from src.lib.metrics import metrics
+
+logger = get_logger(__name__)
+
+QUERY_SECONDS = "splizy_repo_query_seconds"
+metrics.describe(QUERY_SECONDS, "Latency of a single repo backend round trip.")
+
+# Arguments that carry data rather than identify the rows being queried
+_NON_FILTER_ARGS = frozenset({"self", "payload", "columns"})
+_WRITE_OPERATIONS = ("upsert_", "update_", "insert_", "delete_")
+
+
+@dataclass(slots=True, frozen=True)
+class QueryTrace:
+    operation: str
+    table: str
+    filters: str
+    rows: int
+    duration_ms: float
+
+    @property
+    def is_write(self) -> bool:
+        return self.operation.startswith(_WRITE_OPERATIONS)
+
+
+_update_traces: ContextVar[list[QueryTrace] | None] = ContextVar(
+    "splizy_update_traces", default=None
+)
+
+
+def _count_rows(result: Any) -> int:
+    if result is None:
+        return 0
+    if isinstance(result, list):
+        return len(result)
+    return 1
+
+
+def _response_bytes(result: Any) -> int:
+    return len(json.dumps(result, default=str, separators=(",", ":")))
+
+
+def traced_query(
+    operation: str, table: str, func: Callable[..., Any]
+) -> Callable[..., Any]:
+    """
+    Wrap a backend method so each call records table, filter, row count and latency.
+    Response size is only serialised for calls that get logged.
+    """
+    signature = inspect.signature(func)
+
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = perf_counter()
+        result = func(*args, **kwargs)
+        elapsed = perf_counter() - start
+
+        bound = signature.bind(*args, **kwargs)
+        filters = ",".join(
+            f"{name}={value}"
+            for name, value in bound.arguments.items()
+            if name not in _NON_FILTER_ARGS
+        )
+        trace = QueryTrace(
+            operation=operation,
+            table=table,
+            filters=filters,
+            rows=_count_rows(result),
+            duration_ms=elapsed * 1000,
+        )
+        metrics.observe(QUERY_SECONDS, elapsed, operation=operation, table=table)
+
+        traces = _update_traces.get()
+        if traces is not None:
+            traces.append(trace)
+
+        is_slow = trace.duration_ms >= config.REPO_SLOW_QUERY_MS
+        if is_slow or config.REPO_TRACE_QUERIES:
+            logger.log(
+                logging.WARNING if is_slow else logging.INFO,
+                "%s: %s table=%s filter=(%s) rows=%s bytes=%d latency=%.1fms",
+                "Slow query" if is_slow else "Query",
+                operation,
+                table,
+                filters,
+                trace.rows,
+                _response_bytes(result),
+                trace.duration_ms,
+            )
+        return result
+
+    return wrapper
+
+
+def _find_round_trip_patterns(traces: list[QueryTrace]) -> list[str]:
+    findings: list[str] = []
+
+    # A read of rows that an earlier write in the same update already touched
+    written: set[tuple[str, str]] = set()
+    for trace in traces:
+        key = (trace.table, trace.filters)
+        if trace.is_write:
+            written.add(key)
+        elif key in written:
+            findings.append(
+                f"read-after-write: {trace.operation}({trace.filters}) on {trace.table}"
+            )
+
+    # The same query issued more than once
+    for (operation, filters), count in Counter(
+        (trace.operation, trace.filters) for trace in traces
+    ).items():
+        if count > 1:
+            findings.append(f"repeated {count}x: {operation}({filters})")
+
+    # One query per item instead of one query for the batch
+    for operation, count in Counter(trace.operation for trace in traces).items():
+        if count >= config.REPO_N_PLUS_ONE_THRESHOLD:
+            findings.append(f"N+1: {operation} called {count}x")
+
+    return findings
+
+
+@contextmanager
+def trace_queries(label: str) -> Iterator[list[QueryTrace]]:
+    """
+    Collect the repo round trips made while handling one update, and log those that
+    look like avoidable ones (read-after-write, repeats, N+1).
+    """
+    traces: list[QueryTrace] = []
+    token = _update_traces.set(traces)
+    try:
+        yield traces
+    finally:
+        _update_traces.reset(token)
+        findings = _find_round_trip_patterns(traces)
+        if findings:
+            total_ms = sum(trace.duration_ms for trace in traces)
+            logger.warning(
+                "%s: %d queries in %.1fms; %s",
+                label,
+                len(traces),
+                total_ms,
+                "; ".join(findings),
+            )